@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from analytics.models import MerchantDailyMetrics
+
+
+@admin.register(MerchantDailyMetrics)
+class MerchantDailyMetricsAdmin(admin.ModelAdmin):
+    """Admin interface for MerchantDailyMetrics model."""
+    list_display = ('id', 'merchant', 'day', 'installment_count', 'paid_count', 'paid_amount', 'late_count')
+    list_filter = ('day',)
+    search_fields = ('merchant__email',)
+    readonly_fields = ('created_at', 'updated_at')
@@ -0,0 +1,62 @@
+"""Constants for the analytics app."""
+
+# Name of the MetricsRollupState row used by the merchant daily metrics rollup
+MERCHANT_METRICS_ROLLUP_NAME = 'merchant_daily_metrics'
+
+# Lease of the rollup lock in seconds; a crashed run frees it after this delay
+MERCHANT_METRICS_ROLLUP_LOCK_TIMEOUT = 60 * 60
+
+# Number of due dates rebuilt per rollup transaction
+MERCHANT_METRICS_ROLLUP_DAYS_PER_BATCH = 31
+
+# Seconds subtracted from the previous run's start when looking for changed
+# installments, so a payment committed just after that run started is not missed
+MERCHANT_METRICS_ROLLUP_WATERMARK_OVERLAP = 60 * 5
+
+# Age in seconds after which a cached dashboard is recomputed even without a bump
+MERCHANT_DASHBOARD_CACHE_MAX_AGE = 60 * 15
+
+# Lifetime in seconds of a cached dashboard, served as stale while it is recomputed
+MERCHANT_DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds after which an unfinished background refresh can be claimed again
+MERCHANT_DASHBOARD_REFRESH_TIMEOUT = 60
+
+# Periods a merchant time series can be grouped by, as database date_trunc kinds
+TIME_SERIES_GRANULARITIES = ('day', 'week', 'month')
+
+# Default number of days of a time series requested without a start date
+TIME_SERIES_DEFAULT_DAYS = 30
+
+# Longest date range of a time series, in days
+TIME_SERIES_MAX_DAYS = 366 * 3
+
+# Ranges longer than this many days read rolled up days from MerchantDailyMetrics;
+# shorter ones are aggregated live, so they reflect payments immediately
+TIME_SERIES_LIVE_MAX_DAYS = 31
+
+# Aging buckets of outstanding installments: label, then the first and last
+# number of days past the due date (None for no upper bound)
+AGING_BUCKETS = (
+    ('0-30', 0, 30),
+    ('31-60', 31, 60),
+    ('61-90', 61, 90),
+    ('90+', 91, None),
+)
+
+# Lifetime in seconds of a cached aging report; reports are also keyed by day
+AGING_REPORT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Merchants aggregated by one worker task of the portfolio aging report
+AGING_PORTFOLIO_MERCHANTS_PER_TASK = 500
+
+# Default and longest forecast horizon of the cash-flow forecast, in days from today
+CASH_FLOW_FORECAST_DEFAULT_DAYS = 90
+CASH_FLOW_FORECAST_MAX_DAYS = 366
+
+# Days of past due dates whose collection rate adjusts the cash-flow forecast
+CASH_FLOW_COLLECTION_RATE_LOOKBACK_DAYS = 180
+
+# Lifetime in seconds of a cached cash-flow forecast; payments, overdue runs
+# and enrollments of the merchant invalidate it earlier
+CASH_FLOW_FORECAST_CACHE_TIMEOUT = 60 * 60
@@ -0,0 +1,26 @@
+"""Report the hit rate of the merchant dashboard cache.
+
+Counters are kept in the cache itself, so they cover every worker since they
+were created, and are lost when the cache is flushed.
+
+Usage:
+    python manage.py dashboard_cache_stats
+"""
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.services.dashboard_cache import dashboard_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit, stale and miss counts of the merchant dashboard cache."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stats = dashboard_cache_stats()
+        if not stats:
+            raise CommandError("The merchant dashboard cache is disabled; set MERCHANT_DASHBOARD_CACHE.")
+        self.stdout.write(
+            f"hits={stats['hit']} stale={stats['stale']} misses={stats['miss']} "
+            f"hit_rate={stats['hit_rate']:.1%} served_rate={stats['served_rate']:.1%}"
+        )
@@ -0,0 +1,43 @@
+"""Rebuild the merchant daily metrics rollup.
+
+Without options this runs the same incremental rollup as the periodic task.
+`--full` rebuilds every due date up to yesterday, which backfills the rollup
+after deployment and repairs rows left stale by changes the incremental runs
+cannot see (deleted installments, raw SQL updates without `updated_at`).
+
+Usage:
+    python manage.py rebuild_merchant_metrics
+    python manage.py rebuild_merchant_metrics --full
+"""
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from analytics.constants import MERCHANT_METRICS_ROLLUP_DAYS_PER_BATCH
+from analytics.services.daily_metrics import refresh_merchant_daily_metrics
+
+
+class Command(BaseCommand):
+    help = "Roll up merchant daily metrics through yesterday, or rebuild all of them with --full."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Rebuild every past due date instead of only the changed ones.",
+        )
+        parser.add_argument(
+            '--days-per-batch', type=int, default=MERCHANT_METRICS_ROLLUP_DAYS_PER_BATCH,
+            help="Due dates rebuilt per transaction.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        result = refresh_merchant_daily_metrics(
+            full_rebuild=options['full'],
+            days_per_batch=options['days_per_batch'],
+        )
+        if result is None:
+            raise CommandError("Another rollup is running; try again once it finishes.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {result.days_rebuilt} days ({result.rows_written} rows) "
+            f"through {result.rolled_up_through} in {result.duration_seconds:.1f}s."
+        ))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-17 03:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricsRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Timestamp when this record was created.', verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when this record was last updated.', verbose_name='updated at')),
+                ('name', models.CharField(help_text='Identifier of the rollup this state belongs to.', max_length=64, unique=True, verbose_name='name')),
+                ('rolled_up_through', models.DateField(blank=True, help_text='Latest due date covered by the rollup rows.', null=True, verbose_name='rolled up through')),
+                ('last_started_at', models.DateTimeField(blank=True, help_text='Start time of the last successful run.', null=True, verbose_name='last started at')),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Lease expiry of the run in progress, if any.', null=True, verbose_name='locked until')),
+            ],
+            options={
+                'verbose_name': 'metrics rollup state',
+                'verbose_name_plural': 'metrics rollup states',
+            },
+        ),
+        migrations.CreateModel(
+            name='MerchantDailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Timestamp when this record was created.', verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when this record was last updated.', verbose_name='updated at')),
+                ('day', models.DateField(help_text='Due date of the aggregated installments.', verbose_name='day')),
+                ('installment_count', models.PositiveIntegerField(default=0, help_text='Number of installments due on this day.', verbose_name='installment count')),
+                ('paid_count', models.PositiveIntegerField(default=0, help_text='Number of those installments that are paid.', verbose_name='paid count')),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, help_text='Sum of the paid installment amounts.', max_digits=14, verbose_name='paid amount')),
+                ('late_count', models.PositiveIntegerField(default=0, help_text='Number of those installments that are late.', verbose_name='late count')),
+                ('merchant', models.ForeignKey(help_text='Merchant owning the plans of the installments.', on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to=settings.AUTH_USER_MODEL, verbose_name='merchant')),
+            ],
+            options={
+                'verbose_name': 'merchant daily metrics',
+                'verbose_name_plural': 'merchant daily metrics',
+                'constraints': [models.UniqueConstraint(fields=('merchant', 'day'), name='unique_merchant_daily_metrics')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-17 11:07
+
+from django.db import migrations, models
+
+
+def reset_rollup_state(apps, schema_editor):
+    """Make the next rollup run rebuild every row, filling the new columns.
+
+    The dashboard aggregates live until then, as before the first rollup.
+    """
+    MetricsRollupState = apps.get_model('analytics', 'MetricsRollupState')
+    MetricsRollupState.objects.update(rolled_up_through=None, last_started_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_merchant_daily_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='merchantdailymetrics',
+            name='due_amount',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Sum of the amounts of the installments due on this day.', max_digits=14, verbose_name='due amount'),
+        ),
+        migrations.AddField(
+            model_name='merchantdailymetrics',
+            name='received_amount',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Sum of the amounts of the installments paid on this day, whatever their due date.', max_digits=14, verbose_name='received amount'),
+        ),
+        migrations.RunPython(reset_rollup_state, migrations.RunPython.noop),
+    ]
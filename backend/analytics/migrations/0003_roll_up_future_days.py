@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:30
+
+from django.db import migrations
+
+
+def reset_rollup_state(apps, schema_editor):
+    """Make the next rollup run rebuild every row, adding the rows of future due dates.
+
+    The dashboard aggregates live until then, as before the first rollup.
+    """
+    MetricsRollupState = apps.get_model('analytics', 'MetricsRollupState')
+    MetricsRollupState.objects.update(rolled_up_through=None, last_started_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_daily_metrics_amounts'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_rollup_state, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,119 @@
+from django.conf import settings
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from core.models import AbstractTimestampedModel
+
+
+class MerchantDailyMetrics(AbstractTimestampedModel):
+    """Installment totals of one merchant for one day.
+
+    Rows are rebuilt by analytics.services.daily_metrics, so the dashboard and
+    time series can sum a merchant's history from one row per day instead of
+    aggregating every installment. All columns describe the installments due
+    on `day`, except `received_amount`, which sums the installments paid on it.
+    """
+
+    merchant = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        verbose_name=_('merchant'),
+        on_delete=models.CASCADE,
+        related_name='daily_metrics',
+        help_text=_('Merchant owning the plans of the installments.'),
+    )
+    day = models.DateField(
+        _('day'),
+        help_text=_('Due date of the aggregated installments.'),
+    )
+    installment_count = models.PositiveIntegerField(
+        _('installment count'),
+        default=0,
+        help_text=_('Number of installments due on this day.'),
+    )
+    due_amount = models.DecimalField(
+        _('due amount'),
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_('Sum of the amounts of the installments due on this day.'),
+    )
+    paid_count = models.PositiveIntegerField(
+        _('paid count'),
+        default=0,
+        help_text=_('Number of those installments that are paid.'),
+    )
+    paid_amount = models.DecimalField(
+        _('paid amount'),
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_('Sum of the paid installment amounts.'),
+    )
+    late_count = models.PositiveIntegerField(
+        _('late count'),
+        default=0,
+        help_text=_('Number of those installments that are late.'),
+    )
+    received_amount = models.DecimalField(
+        _('received amount'),
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_('Sum of the amounts of the installments paid on this day, whatever their due date.'),
+    )
+
+    def __str__(self) -> str:
+        """Return a readable identifier for the rollup row."""
+        return f"Metrics of merchant {self.merchant_id} on {self.day}"
+
+    class Meta:
+        verbose_name = _('merchant daily metrics')
+        verbose_name_plural = _('merchant daily metrics')
+        constraints = [
+            models.UniqueConstraint(fields=['merchant', 'day'], name='unique_merchant_daily_metrics'),
+        ]
+
+
+class MetricsRollupState(AbstractTimestampedModel):
+    """Watermarks and lock of the merchant daily metrics rollup.
+
+    `rolled_up_through` is the latest closed due date whose rollup rows are
+    complete; rows of future due dates are kept up to date as well, so the
+    dashboard only aggregates the due dates in between live. `last_started_at`
+    is the start of the last successful run: installments updated since then
+    mark their due dates as needing a rebuild. `locked_until` is a lease taken
+    by the running rollup.
+    """
+
+    name = models.CharField(
+        _('name'),
+        max_length=64,
+        unique=True,
+        help_text=_('Identifier of the rollup this state belongs to.'),
+    )
+    rolled_up_through = models.DateField(
+        _('rolled up through'),
+        null=True,
+        blank=True,
+        help_text=_('Latest due date covered by the rollup rows.'),
+    )
+    last_started_at = models.DateTimeField(
+        _('last started at'),
+        null=True,
+        blank=True,
+        help_text=_('Start time of the last successful run.'),
+    )
+    locked_until = models.DateTimeField(
+        _('locked until'),
+        null=True,
+        blank=True,
+        help_text=_('Lease expiry of the run in progress, if any.'),
+    )
+
+    def __str__(self) -> str:
+        """Return a readable identifier for the rollup state."""
+        return f"Metrics rollup '{self.name}'"
+
+    class Meta:
+        verbose_name = _('metrics rollup state')
+        verbose_name_plural = _('metrics rollup states')
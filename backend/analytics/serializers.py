@@ -1,5 +1,17 @@
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from analytics.constants import (
+    CASH_FLOW_FORECAST_DEFAULT_DAYS,
+    CASH_FLOW_FORECAST_MAX_DAYS,
+    TIME_SERIES_DEFAULT_DAYS,
+    TIME_SERIES_GRANULARITIES,
+    TIME_SERIES_MAX_DAYS,
+)
+
 
 class MerchantDashboardMetricsSerializer(serializers.Serializer):
     total_revenue = serializers.DecimalField(
@@ -8,3 +20,118 @@ class MerchantDashboardMetricsSerializer(serializers.Serializer):
     success_rate = serializers.FloatField()
     overdue_count = serializers.IntegerField()
     active_plans = serializers.IntegerField()
+
+
+class MerchantTimeSeriesQuerySerializer(serializers.Serializer):
+    """Serializer for validating time series query parameters."""
+
+    start_date = serializers.DateField(
+        required=False,
+        help_text=_("First day of the range; defaults to %(days)s days before the end date")
+        % {'days': TIME_SERIES_DEFAULT_DAYS - 1},
+    )
+    end_date = serializers.DateField(
+        required=False,
+        help_text=_("Last day of the range, included; defaults to today"),
+    )
+    granularity = serializers.ChoiceField(
+        choices=TIME_SERIES_GRANULARITIES,
+        default='day',
+        help_text=_("Length of each period: day, week or month"),
+    )
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the default range and check its bounds."""
+        attrs.setdefault('end_date', date.today())
+        attrs.setdefault('start_date', attrs['end_date'] - timedelta(days=TIME_SERIES_DEFAULT_DAYS - 1))
+        if attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError(_("start_date must not be after end_date."))
+        if (attrs['end_date'] - attrs['start_date']).days + 1 > TIME_SERIES_MAX_DAYS:
+            raise serializers.ValidationError(
+                _("The date range cannot exceed %(days)s days.") % {'days': TIME_SERIES_MAX_DAYS}
+            )
+        return attrs
+
+
+class MerchantTimeSeriesPointSerializer(serializers.Serializer):
+    period = serializers.DateField()
+    paid_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    due_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    late_count = serializers.IntegerField()
+    collection_rate = serializers.FloatField()
+
+
+class MerchantTimeSeriesSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    granularity = serializers.CharField()
+    series = MerchantTimeSeriesPointSerializer(many=True)
+
+
+class AgingBucketSerializer(serializers.Serializer):
+    bucket = serializers.CharField()
+    min_days = serializers.IntegerField()
+    max_days = serializers.IntegerField(allow_null=True)
+    amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    count = serializers.IntegerField()
+
+
+class AgingReportSerializer(serializers.Serializer):
+    as_of = serializers.DateField()
+    current_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    current_count = serializers.IntegerField()
+    buckets = AgingBucketSerializer(many=True)
+    total_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    total_count = serializers.IntegerField()
+
+
+class CashFlowForecastQuerySerializer(serializers.Serializer):
+    """Serializer for validating cash-flow forecast query parameters."""
+
+    days = serializers.IntegerField(
+        min_value=1,
+        max_value=CASH_FLOW_FORECAST_MAX_DAYS,
+        default=CASH_FLOW_FORECAST_DEFAULT_DAYS,
+        help_text=_("Number of days ahead to forecast"),
+    )
+    adjust = serializers.BooleanField(
+        default=False,
+        help_text=_("Scale the expected amounts by the merchant's historical collection rate"),
+    )
+
+
+class CashFlowForecastDateSerializer(serializers.Serializer):
+    due_date = serializers.DateField()
+    pending_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    late_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    installment_count = serializers.IntegerField()
+    expected_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+
+
+class CashFlowForecastSerializer(serializers.Serializer):
+    as_of = serializers.DateField()
+    days = serializers.IntegerField()
+    collection_rate = serializers.FloatField(allow_null=True)
+    scheduled_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    expected_amount = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False
+    )
+    dates = CashFlowForecastDateSerializer(many=True)
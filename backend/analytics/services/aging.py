@@ -0,0 +1,212 @@
+"""Aging report of outstanding installment amounts.
+
+Unpaid installments are grouped by the number of days since their due date
+into the AGING_BUCKETS (0-30, 31-60, 61-90 and 90+ days); installments not
+due yet are reported as current. Every bucket of a scope (one merchant, a
+range of merchants, or the whole portfolio) is computed by a single query
+with one conditional aggregate per bucket.
+
+Reports are cached per scope and day in the ``AGING_REPORT_CACHE`` alias.
+Merchant reports are versioned per merchant and invalidated by
+invalidate_merchant_analytics(), like the dashboard and the forecast, so
+payments and overdue runs show up immediately. The portfolio report is
+precomputed nightly by the analytics.tasks.compute_portfolio_aging_report
+task, which splits the merchants into id ranges aggregated by different
+workers and merges their partial totals; it is not invalidated and reflects
+the installments as of its computation.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db.models import Count, DecimalField, Q, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce
+
+from account.models import User
+from analytics.constants import AGING_BUCKETS, AGING_PORTFOLIO_MERCHANTS_PER_TASK, AGING_REPORT_CACHE_TIMEOUT
+from core.utils.versioned_cache import VersionedCache
+from installment.models import Installment
+
+# Pseudo-bucket of outstanding installments not due yet
+CURRENT_BUCKET = 'current'
+
+merchant_aging_cache = VersionedCache(
+    namespace='aging-report:merchant',
+    alias_setting='AGING_REPORT_CACHE',
+    timeout=AGING_REPORT_CACHE_TIMEOUT,
+)
+
+
+def compute_aging_totals(installments: QuerySet, today: date) -> Dict[str, Any]:
+    """Aggregate the outstanding installments of a queryset into aging buckets, in one query.
+
+    Args:
+        installments: Installments of the scope, paid or not.
+        today: Reference date the ages are counted from.
+
+    Returns:
+        Dict[str, Any]: `<bucket>_amount` and `<bucket>_count` of every bucket,
+            including the current one. Totals of disjoint scopes can be merged
+            with merge_aging_totals().
+    """
+    aggregates = {}
+    for key, filter_ in _bucket_filters(today):
+        aggregates[f'{key}_amount'] = Coalesce(
+            Sum('amount', filter=filter_),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+        aggregates[f'{key}_count'] = Count('id', filter=filter_)
+    return installments.exclude(status=Installment.Status.PAID).aggregate(**aggregates)
+
+
+def merge_aging_totals(partials: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add up the aging totals of disjoint scopes.
+
+    Amounts may be given as strings, as returned by Celery tasks.
+    """
+    merged = {}
+    for key in [CURRENT_BUCKET, *(_bucket_key(label) for label, _, _ in AGING_BUCKETS)]:
+        merged[f'{key}_amount'] = Decimal('0.00')
+        merged[f'{key}_count'] = 0
+    for partial in partials:
+        for key, value in partial.items():
+            merged[key] += Decimal(value) if key.endswith('_amount') else value
+    return merged
+
+
+def aging_report(totals: Dict[str, Any], today: date) -> Dict[str, Any]:
+    """Shape aging totals into a report.
+
+    Args:
+        totals: Totals from compute_aging_totals() or merge_aging_totals().
+        today: Reference date of the totals.
+
+    Returns:
+        Dict[str, Any]: The reference date, the current (not yet due) amount and
+            count, one entry per aging bucket, and the outstanding total.
+    """
+    buckets = [
+        {
+            'bucket': label,
+            'min_days': min_days,
+            'max_days': max_days,
+            'amount': totals[f'{_bucket_key(label)}_amount'],
+            'count': totals[f'{_bucket_key(label)}_count'],
+        }
+        for label, min_days, max_days in AGING_BUCKETS
+    ]
+    return {
+        'as_of': today,
+        'current_amount': totals[f'{CURRENT_BUCKET}_amount'],
+        'current_count': totals[f'{CURRENT_BUCKET}_count'],
+        'buckets': buckets,
+        'total_amount': totals[f'{CURRENT_BUCKET}_amount'] + sum(bucket['amount'] for bucket in buckets),
+        'total_count': totals[f'{CURRENT_BUCKET}_count'] + sum(bucket['count'] for bucket in buckets),
+    }
+
+
+def get_merchant_aging_report(merchant: User, today: Optional[date] = None) -> Dict[str, Any]:
+    """Return the aging report of a merchant's outstanding installments, cached for the day.
+
+    The cached report is dropped whenever the merchant's installments change.
+
+    Args:
+        merchant: The merchant whose installments are aged.
+        today: Reference date. Defaults to today.
+
+    Returns:
+        Dict[str, Any]: The report built by aging_report().
+    """
+    today = today or date.today()
+    version = merchant_aging_cache.version(merchant.pk)
+    totals = merchant_aging_cache.get(merchant.pk, today.isoformat(), version=version)
+    if totals is None:
+        totals = compute_aging_totals(
+            Installment.objects.filter(installment_plan__plan__merchant=merchant),
+            today,
+        )
+        merchant_aging_cache.set(merchant.pk, today.isoformat(), value=totals, version=version)
+    return aging_report(totals, today)
+
+
+def get_portfolio_aging_report(today: Optional[date] = None) -> Dict[str, Any]:
+    """Return the aging report of every merchant's outstanding installments, cached for the day.
+
+    The report is normally precomputed by the nightly task; before it has
+    stored the day's report, all installments are aggregated in one query.
+
+    Args:
+        today: Reference date. Defaults to today.
+
+    Returns:
+        Dict[str, Any]: The report built by aging_report().
+    """
+    today = today or date.today()
+    cache = _cache()
+    key = _cache_key('portfolio', today)
+    totals = cache.get(key)
+    if totals is None:
+        totals = compute_aging_totals(Installment.objects.all(), today)
+        cache.set(key, totals, AGING_REPORT_CACHE_TIMEOUT)
+    return aging_report(totals, today)
+
+
+def store_portfolio_aging_totals(totals: Dict[str, Any], today: date) -> None:
+    """Cache the portfolio totals of a day, as merged from the per-range tasks."""
+    _cache().set(_cache_key('portfolio', today), totals, AGING_REPORT_CACHE_TIMEOUT)
+
+
+def compute_merchant_range_aging_totals(first_merchant_id: int, last_merchant_id: int, today: date) -> Dict[str, Any]:
+    """Aging totals of the installments of the merchants whose ids are in a range, bounds included."""
+    installments = Installment.objects.filter(
+        installment_plan__plan__merchant__gte=first_merchant_id,
+        installment_plan__plan__merchant__lte=last_merchant_id,
+    )
+    return compute_aging_totals(installments, today)
+
+
+def merchant_id_ranges(size: int = AGING_PORTFOLIO_MERCHANTS_PER_TASK) -> List[Tuple[int, int]]:
+    """Split the merchants into consecutive id ranges of at most `size` merchants.
+
+    Returns:
+        List[Tuple[int, int]]: First and last merchant id of each range.
+    """
+    ids = (
+        User.objects
+        .filter(user_type=User.UserType.MERCHANT)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+        .iterator(chunk_size=size)
+    )
+    ranges = []
+    while chunk := list(islice(ids, size)):
+        ranges.append((chunk[0], chunk[-1]))
+    return ranges
+
+
+def _bucket_filters(today: date) -> List[Tuple[str, Q]]:
+    """Due date filter of the current pseudo-bucket and of every aging bucket."""
+    filters = [(CURRENT_BUCKET, Q(due_date__gt=today))]
+    for label, min_days, max_days in AGING_BUCKETS:
+        filter_ = Q(due_date__lte=today - timedelta(days=min_days))
+        if max_days is not None:
+            filter_ &= Q(due_date__gte=today - timedelta(days=max_days))
+        filters.append((_bucket_key(label), filter_))
+    return filters
+
+
+def _bucket_key(label: str) -> str:
+    """Prefix of the totals of a bucket, e.g. `days_31_60` for '31-60'."""
+    return 'days_' + label.replace('-', '_').replace('+', '_plus')
+
+
+def _cache() -> BaseCache:
+    return caches[settings.AGING_REPORT_CACHE]
+
+
+def _cache_key(scope: str, today: date) -> str:
+    return f'aging-report:{scope}:{today.isoformat()}'
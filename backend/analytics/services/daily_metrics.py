@@ -0,0 +1,256 @@
+"""Daily rollup of merchant installment metrics.
+
+MerchantDailyMetrics holds, per merchant and day, the number and amount of
+installments due that day, how many of them are paid and late, and the
+amount received that day. Rows are kept for every due date but today:
+days up to the rollup state's `rolled_up_through` date and every future
+day. The dashboard only aggregates the days after `rolled_up_through`
+through today live, normally today alone; the time series reads the rows up
+to `rolled_up_through`.
+
+Each run rebuilds only the days that need it: the days closed since the
+previous run, and the due or payment dates of installments updated since it
+started (late payments, overdue marking, enrollments). A day is rebuilt for
+every merchant at once by deleting its rows and inserting fresh grouped
+aggregates, in one transaction per batch of days.
+"""
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from analytics.constants import (
+    MERCHANT_METRICS_ROLLUP_DAYS_PER_BATCH,
+    MERCHANT_METRICS_ROLLUP_LOCK_TIMEOUT,
+    MERCHANT_METRICS_ROLLUP_NAME,
+    MERCHANT_METRICS_ROLLUP_WATERMARK_OVERLAP,
+)
+from analytics.models import MerchantDailyMetrics, MetricsRollupState
+from core.logging.logger import get_logger
+from installment.models import Installment
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MetricsRollupResult:
+    """Counts and timings of one rollup run.
+
+    Attributes:
+        full_rebuild: Whether every past due date was rebuilt.
+        rolled_up_through: Latest due date covered by the rollup after the run.
+        days_rebuilt: Number of due dates rebuilt.
+        rows_written: Number of MerchantDailyMetrics rows inserted.
+        duration_seconds: Wall-clock duration of the whole run.
+    """
+
+    full_rebuild: bool = False
+    rolled_up_through: Optional[date] = None
+    days_rebuilt: int = 0
+    rows_written: int = 0
+    duration_seconds: float = 0.0
+
+
+def installment_metrics_aggregates() -> Dict[str, Any]:
+    """Aggregates of installments by due date, matching the MerchantDailyMetrics columns.
+
+    Returns:
+        Dict[str, Any]: Aggregate expressions keyed by MerchantDailyMetrics field name.
+    """
+    paid = Q(status=Installment.Status.PAID)
+    return {
+        'installment_count': Count('id'),
+        'due_amount': _amount_sum(),
+        'paid_count': Count('id', filter=paid),
+        'paid_amount': _amount_sum(filter=paid),
+        'late_count': Count('id', filter=Q(status=Installment.Status.LATE)),
+    }
+
+
+def day_bounds(first_day: date, last_day: date) -> Dict[str, datetime]:
+    """Lookups restricting `paid_at` to the days from `first_day` to `last_day`, in the current time zone.
+
+    Comparing the column itself, rather than its date, lets the query use the paid_at index.
+    """
+    return {
+        'paid_at__gte': timezone.make_aware(datetime.combine(first_day, datetime.min.time())),
+        'paid_at__lt': timezone.make_aware(datetime.combine(last_day + timedelta(days=1), datetime.min.time())),
+    }
+
+
+def rebuild_daily_metrics(days: Sequence[date]) -> int:
+    """Replace the rollup rows of `days` with aggregates of their installments.
+
+    Runs in the caller's transaction, so readers see either the old or the new
+    rows of these days, never a partial rebuild. The cached dashboards of the
+    merchants with rows on these days are invalidated.
+
+    Args:
+        days: Due dates to rebuild, for every merchant.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    # Imported here because the dashboard cache imports the dashboard service, which imports this module
+    from analytics.services.dashboard_cache import invalidate_merchant_dashboards
+
+    previous = MerchantDailyMetrics.objects.filter(day__in=days)
+    merchant_ids = set(previous.values_list('merchant_id', flat=True).distinct())
+    previous.delete()
+
+    metrics: Dict[tuple, MerchantDailyMetrics] = {}
+    due = (
+        Installment.objects
+        .filter(due_date__in=days)
+        .values('installment_plan__plan__merchant_id', 'due_date')
+        .annotate(**installment_metrics_aggregates())
+        .order_by()
+    )
+    for row in due:
+        merchant_id, day = row.pop('installment_plan__plan__merchant_id'), row.pop('due_date')
+        metrics[merchant_id, day] = MerchantDailyMetrics(merchant_id=merchant_id, day=day, **row)
+
+    received = (
+        Installment.objects
+        .filter(status=Installment.Status.PAID, **day_bounds(min(days), max(days)))
+        .annotate(day=TruncDate('paid_at'))
+        .filter(day__in=days)
+        .values('installment_plan__plan__merchant_id', 'day')
+        .annotate(received_amount=Sum('amount'))
+        .order_by()
+    )
+    for row in received:
+        key = row['installment_plan__plan__merchant_id'], row['day']
+        metrics.setdefault(key, MerchantDailyMetrics(merchant_id=key[0], day=key[1]))
+        metrics[key].received_amount = row['received_amount']
+
+    created = MerchantDailyMetrics.objects.bulk_create(metrics.values())
+    invalidate_merchant_dashboards(merchant_ids | {metrics.merchant_id for metrics in created})
+    return len(created)
+
+
+def refresh_merchant_daily_metrics(
+    today: Optional[date] = None,
+    full_rebuild: bool = False,
+    days_per_batch: int = MERCHANT_METRICS_ROLLUP_DAYS_PER_BATCH,
+) -> Optional[MetricsRollupResult]:
+    """Bring the merchant daily metrics up to date through yesterday and for every future day.
+
+    The rollup state row holds the watermarks and a lease-based lock, as for
+    the overdue scan, so overlapping runs are skipped. Without a previous
+    successful run, or with `full_rebuild`, every due date but today is
+    rebuilt. The watermarks only move forward when the run succeeds.
+
+    Args:
+        today: Reference date; every other due date is rolled up. Defaults to today.
+        full_rebuild: Ignore the watermarks and rebuild every due date.
+        days_per_batch: Maximum number of due dates rebuilt per transaction.
+
+    Returns:
+        Optional[MetricsRollupResult]: The run result, or None if another run holds the lock.
+    """
+    today = today or date.today()
+    through = today - timedelta(days=1)
+
+    state, _ = MetricsRollupState.objects.get_or_create(name=MERCHANT_METRICS_ROLLUP_NAME)
+    now = timezone.now()
+    # Conditional UPDATE acts as the lock: only one worker can take an expired lease
+    acquired = MetricsRollupState.objects.filter(pk=state.pk).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    ).update(locked_until=now + timedelta(seconds=MERCHANT_METRICS_ROLLUP_LOCK_TIMEOUT))
+    if not acquired:
+        logger.info("merchant_metrics_rollup_skipped", operation="refresh_merchant_daily_metrics", reason="locked")
+        return None
+
+    try:
+        state.refresh_from_db(fields=['rolled_up_through', 'last_started_at'])
+        started_at = timezone.now()
+        started = time.monotonic()
+        full_rebuild = full_rebuild or state.rolled_up_through is None or state.last_started_at is None
+        days = _all_days(today) if full_rebuild else _dirty_days(state, today)
+
+        result = MetricsRollupResult(full_rebuild=full_rebuild, rolled_up_through=through)
+        for batch in _batches(days, days_per_batch):
+            with transaction.atomic():
+                result.rows_written += rebuild_daily_metrics(batch)
+            result.days_rebuilt += len(batch)
+
+        MetricsRollupState.objects.filter(pk=state.pk).update(
+            rolled_up_through=through,
+            last_started_at=started_at,
+            updated_at=timezone.now(),
+        )
+        result.duration_seconds = time.monotonic() - started
+    finally:
+        MetricsRollupState.objects.filter(pk=state.pk).update(locked_until=None)
+
+    logger.info(
+        "merchant_metrics_rolled_up",
+        operation="refresh_merchant_daily_metrics",
+        full_rebuild=result.full_rebuild,
+        rolled_up_through=through,
+        days_rebuilt=result.days_rebuilt,
+        rows_written=result.rows_written,
+        duration_seconds=round(result.duration_seconds, 3),
+    )
+    return result
+
+
+def _dirty_days(state: MetricsRollupState, today: date) -> List[date]:
+    """Days but today with installments due or paid that changed, or that closed, since the previous run."""
+    through = today - timedelta(days=1)
+    changed_since = state.last_started_at - timedelta(seconds=MERCHANT_METRICS_ROLLUP_WATERMARK_OVERLAP)
+    changed = Installment.objects.filter(updated_at__gte=changed_since)
+    days = set(changed.exclude(due_date=today).values_list('due_date', flat=True).distinct())
+    days.update(
+        changed
+        .filter(status=Installment.Status.PAID)
+        .annotate(day=TruncDate('paid_at'))
+        .filter(day__lte=through)
+        .values_list('day', flat=True)
+        .distinct()
+    )
+    # Days served live until now, whether or not they have installments
+    day = state.rolled_up_through + timedelta(days=1)
+    while day <= through:
+        days.add(day)
+        day += timedelta(days=1)
+    return sorted(days)
+
+
+def _all_days(today: date) -> List[date]:
+    """Every day but today from the first to the last due date, payment or rollup row."""
+    first_paid_at = Installment.objects.filter(status=Installment.Status.PAID).aggregate(first=Min('paid_at'))['first']
+    due_dates = Installment.objects.aggregate(first=Min('due_date'), last=Max('due_date'))
+    rows = MerchantDailyMetrics.objects.aggregate(first=Min('day'), last=Max('day'))
+    first_days = [
+        due_dates['first'],
+        timezone.localdate(first_paid_at) if first_paid_at else None,
+        rows['first'],
+    ]
+    first_days = [day for day in first_days if day is not None]
+    if not first_days:
+        return []
+    first = min(first_days)
+    last = max(day for day in (due_dates['last'], rows['last'], today - timedelta(days=1)) if day is not None)
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    return [day for day in days if day != today]
+
+
+def _batches(days: List[date], size: int) -> Iterator[List[date]]:
+    for start in range(0, len(days), size):
+        yield days[start:start + size]
+
+
+def _amount_sum(**kwargs: Any) -> Coalesce:
+    return Coalesce(
+        Sum('amount', **kwargs),
+        Value(Decimal('0.00')),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
@@ -0,0 +1,103 @@
+"""Per-merchant cache of the dashboard metrics.
+
+Merchants keep the dashboard open with auto-refresh, while its metrics only
+change on payments, overdue runs, enrollments and metrics rollups. Those bump
+the merchant's version. A request finding a fresh entry is answered from the
+cache. After a bump, or once the entry is older than the max age, it becomes
+stale: requests keep receiving it while a single background task recomputes
+it. Only a merchant without any entry waits for the computation.
+
+The cache is enabled by pointing ``MERCHANT_DASHBOARD_CACHE`` at a cache alias
+shared by every worker.
+"""
+from typing import Any, Dict, Iterable
+
+from django.contrib.auth import get_user_model
+
+from analytics.constants import (
+    MERCHANT_DASHBOARD_CACHE_MAX_AGE,
+    MERCHANT_DASHBOARD_CACHE_TIMEOUT,
+    MERCHANT_DASHBOARD_REFRESH_TIMEOUT,
+)
+from analytics.services.merchant_dashboard_service import MerchantDashboardService
+from core.logging.logger import get_logger
+from core.utils.versioned_cache import StaleWhileRevalidateCache
+
+User = get_user_model()
+logger = get_logger(__name__)
+
+merchant_dashboard_cache = StaleWhileRevalidateCache(
+    namespace='merchant-dashboard',
+    alias_setting='MERCHANT_DASHBOARD_CACHE',
+    timeout=MERCHANT_DASHBOARD_CACHE_TIMEOUT,
+    max_age=MERCHANT_DASHBOARD_CACHE_MAX_AGE,
+    refresh_timeout=MERCHANT_DASHBOARD_REFRESH_TIMEOUT,
+)
+
+
+def get_dashboard_metrics(merchant: User) -> Dict[str, str]:
+    """Return the dashboard metrics of a merchant, from the cache when possible.
+
+    Args:
+        merchant: The merchant whose dashboard is requested.
+
+    Returns:
+        Dict[str, str]: The formatted metrics of MerchantDashboardService.get_metrics().
+    """
+    lookup = merchant_dashboard_cache.lookup(merchant.pk)
+    if lookup.fresh:
+        return lookup.value
+
+    if lookup.value is not None:
+        if merchant_dashboard_cache.claim_refresh(merchant.pk):
+            _dispatch_refresh(merchant.pk)
+        return lookup.value
+
+    metrics = MerchantDashboardService(merchant).get_metrics()
+    merchant_dashboard_cache.store(merchant.pk, value=metrics, version=lookup.version)
+    return metrics
+
+
+def refresh_dashboard_metrics(merchant_id: int) -> None:
+    """Recompute and store the dashboard metrics of a merchant, then release its refresh claim.
+
+    Args:
+        merchant_id: Id of the merchant whose cached metrics are stale.
+    """
+    try:
+        # Read before computing, so a bump during the computation leaves the result stale
+        version = merchant_dashboard_cache.version(merchant_id)
+        merchant = User.objects.filter(pk=merchant_id).first()
+        if merchant is not None:
+            metrics = MerchantDashboardService(merchant).get_metrics()
+            merchant_dashboard_cache.store(merchant_id, value=metrics, version=version)
+    finally:
+        merchant_dashboard_cache.release_refresh(merchant_id)
+
+
+def invalidate_merchant_dashboards(merchant_ids: Iterable[int]) -> None:
+    """Mark the cached dashboards of the given merchants as stale.
+
+    The versions are bumped when the current transaction commits.
+
+    Args:
+        merchant_ids: Ids of the merchants whose metrics changed.
+    """
+    merchant_dashboard_cache.bump(merchant_ids)
+
+
+def dashboard_cache_stats() -> Dict[str, Any]:
+    """Hit, stale and miss counts of the dashboard cache, with its hit rates."""
+    return merchant_dashboard_cache.stats()
+
+
+def _dispatch_refresh(merchant_id: int) -> None:
+    """Queue the background refresh of a merchant's stale dashboard."""
+    # Imported here because analytics.tasks imports this module
+    from analytics.tasks import refresh_merchant_dashboard
+
+    try:
+        refresh_merchant_dashboard.delay(merchant_id)
+    except Exception:
+        # The stale value is still served; the next request after the claim expires retries
+        logger.exception("dashboard_refresh_dispatch_failed", merchant_id=merchant_id)
@@ -0,0 +1,24 @@
+"""Invalidation of the per-merchant analytics caches.
+
+Write paths that change a merchant's installments (payments, overdue runs,
+enrollments) call invalidate_merchant_analytics(), which marks the cached
+dashboard as stale and makes the cached cash-flow forecasts and aging
+reports unreachable.
+"""
+from typing import Iterable
+
+from analytics.services.aging import merchant_aging_cache
+from analytics.services.cash_flow_forecast import cash_flow_forecast_cache
+from analytics.services.dashboard_cache import invalidate_merchant_dashboards
+
+
+def invalidate_merchant_analytics(merchant_ids: Iterable[int]) -> None:
+    """Invalidate the cached analytics of the given merchants once the current transaction commits.
+
+    Args:
+        merchant_ids: Ids of the merchants whose installments changed.
+    """
+    merchant_ids = set(merchant_ids)
+    invalidate_merchant_dashboards(merchant_ids)
+    cash_flow_forecast_cache.bump(merchant_ids)
+    merchant_aging_cache.bump(merchant_ids)
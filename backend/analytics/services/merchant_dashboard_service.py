@@ -1,7 +1,11 @@
+from datetime import date
 from decimal import Decimal
-from django.db.models import Sum, Count, Q
+from django.db.models import Q, Sum
 from typing import Dict
 
+from analytics.constants import MERCHANT_METRICS_ROLLUP_NAME
+from analytics.models import MerchantDailyMetrics, MetricsRollupState
+from analytics.services.daily_metrics import installment_metrics_aggregates
 from installment.models import Installment, InstallmentPlan
 from plan.models import Plan
 from account.models import User
@@ -75,37 +79,58 @@ class MerchantDashboardService:
     def get_metrics(self) -> Dict[str, Decimal]:
         """Retrieve all the key metrics for the merchant dashboard.
 
+        Installments due up to the rollup's `rolled_up_through` date or after
+        today are summed from MerchantDailyMetrics, one row per day, and only
+        the installments due in between, normally today's, are aggregated
+        live, so the cost grows neither with the merchant's history nor with
+        its open plans. Before the first rollup every installment is
+        aggregated live.
+
         Returns:
             Dict[str, float]: A dictionary containing total revenue, success rate,
             overdue count, and active plans.
         """
-        # Aggregate multiple metrics in one database hit
-        agg = self.installments.aggregate(
-            total_revenue=Sum('amount', filter=Q(status=Installment.Status.PAID)),
-            total_count=Count('id'),
-            paid_count=Count('id', filter=Q(status=Installment.Status.PAID)),
-            overdue_count=Count('id', filter=Q(status=Installment.Status.LATE)),
-            active_plans=Count(
-                'installment_plan',
-                filter=Q(
-                    installment_plan__plan__merchant=self.merchant,
-                    installment_plan__status=InstallmentPlan.Status.ACTIVE
-                ),
-                distinct=True
-            )
-        )
+        rolled_up_through = MetricsRollupState.objects.filter(
+            name=MERCHANT_METRICS_ROLLUP_NAME,
+        ).values_list('rolled_up_through', flat=True).first()
+
+        live = self.installments
+        totals = {
+            'installment_count': 0,
+            'due_amount': Decimal('0.00'),
+            'paid_count': 0,
+            'paid_amount': Decimal('0.00'),
+            'late_count': 0,
+        }
+        if rolled_up_through is not None:
+            today = date.today()
+            live = live.filter(due_date__gt=rolled_up_through, due_date__lte=today)
+            rolled_up = MerchantDailyMetrics.objects.filter(
+                Q(day__lte=rolled_up_through) | Q(day__gt=today),
+                merchant=self.merchant,
+            ).aggregate(**{field: Sum(field) for field in totals})
+            totals = {field: value or totals[field] for field, value in rolled_up.items()}
+
+        # Aggregate the days not rolled up in one database hit
+        for field, value in live.aggregate(**installment_metrics_aggregates()).items():
+            totals[field] += value or 0
+
+        active_plans = InstallmentPlan.objects.filter(
+            plan__merchant=self.merchant,
+            status=InstallmentPlan.Status.ACTIVE,
+        ).count()
 
-        total = agg.get('total_count') or 0
-        paid = agg.get('paid_count') or 0
+        total = totals['installment_count']
+        paid = totals['paid_count']
 
         success_rate = (paid / total * 100) if total else 0.0
 
         # Format numerical values to two decimal places for display
         formatted_metrics = {
-            'total_revenue': f"{(agg.get('total_revenue') or Decimal('0.00')):.2f}",
+            'total_revenue': f"{totals['paid_amount']:.2f}",
             'success_rate': f"{success_rate:.2f}",
-            'overdue_count': str(agg.get('overdue_count') or 0),
-            'active_plans': str(agg.get('active_plans') or 0),
+            'overdue_count': str(totals['late_count']),
+            'active_plans': str(active_plans),
         }
 
         return formatted_metrics
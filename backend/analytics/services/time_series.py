@@ -0,0 +1,176 @@
+"""Time series of a merchant's revenue and collection.
+
+Every figure is grouped per day, week or month by the database with
+date_trunc: amounts due and late counts by the installments' due dates,
+received amounts by their payment dates, in the current time zone.
+
+Ranges longer than TIME_SERIES_LIVE_MAX_DAYS read the days already rolled up
+into MerchantDailyMetrics, one row per merchant and day, and only aggregate
+the installments of the later days live.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List
+
+from django.db.models import Count, DateField, Q, QuerySet, Sum
+from django.db.models.functions import Trunc
+
+from analytics.constants import MERCHANT_METRICS_ROLLUP_NAME, TIME_SERIES_LIVE_MAX_DAYS
+from analytics.models import MerchantDailyMetrics, MetricsRollupState
+from analytics.services.daily_metrics import day_bounds
+from account.models import User
+from installment.models import Installment
+
+# Figures summed per period before the collection rate is derived, with their zero
+EMPTY_PERIOD = {
+    'paid_amount': Decimal('0.00'),
+    'due_amount': Decimal('0.00'),
+    'collected_amount': Decimal('0.00'),
+    'late_count': 0,
+}
+
+
+class MerchantTimeSeriesService:
+    """Service class computing a merchant's metrics per period over a date range."""
+
+    def __init__(self, merchant: User, start_date: date, end_date: date, granularity: str) -> None:
+        """
+        Args:
+            merchant: The merchant whose installments are aggregated.
+            start_date: First day of the range.
+            end_date: Last day of the range, included.
+            granularity: Period length, one of TIME_SERIES_GRANULARITIES.
+        """
+        self.merchant = merchant
+        self.start_date = start_date
+        self.end_date = end_date
+        self.granularity = granularity
+        self.installments = Installment.objects.filter(installment_plan__plan__merchant=merchant)
+
+    def get_series(self) -> List[Dict[str, Any]]:
+        """Return one point per period of the range, including periods without installments.
+
+        Each point holds the period's first day, the amount received (paid in the
+        period), the amount due, the number of late installments due in the period,
+        and the collection rate: the share, in percent, of the amount due in the
+        period that is paid.
+
+        Returns:
+            List[Dict[str, Any]]: The points, oldest period first.
+        """
+        periods = {period: dict(EMPTY_PERIOD) for period in self._periods()}
+
+        live_start = self.start_date
+        if (self.end_date - self.start_date).days + 1 > TIME_SERIES_LIVE_MAX_DAYS:
+            rolled_up_through = MetricsRollupState.objects.filter(
+                name=MERCHANT_METRICS_ROLLUP_NAME,
+            ).values_list('rolled_up_through', flat=True).first()
+            if rolled_up_through is not None and rolled_up_through >= self.start_date:
+                rolled_up_end = min(self.end_date, rolled_up_through)
+                self._add(periods, self._rolled_up(rolled_up_end))
+                live_start = rolled_up_end + timedelta(days=1)
+
+        if live_start <= self.end_date:
+            self._add(periods, self._live_due(live_start))
+            self._add(periods, self._live_received(live_start))
+
+        return [
+            {
+                'period': period,
+                'paid_amount': figures['paid_amount'],
+                'due_amount': figures['due_amount'],
+                'late_count': figures['late_count'],
+                'collection_rate': (
+                    float(figures['collected_amount'] / figures['due_amount'] * 100)
+                    if figures['due_amount'] else 0.0
+                ),
+            }
+            for period, figures in periods.items()
+        ]
+
+    def _rolled_up(self, end_date: date) -> Iterator[Dict[str, Any]]:
+        """Per-period sums of the merchant's rollup rows from the start date to `end_date`."""
+        rows = (
+            MerchantDailyMetrics.objects
+            .filter(merchant=self.merchant, day__range=(self.start_date, end_date))
+            .annotate(period=self._trunc('day'))
+            .values('period')
+            # Aliased, since annotations cannot take the names of the summed columns
+            .annotate(
+                received_sum=Sum('received_amount'),
+                due_sum=Sum('due_amount'),
+                collected_sum=Sum('paid_amount'),
+                late_sum=Sum('late_count'),
+            )
+            .order_by()
+        )
+        for row in rows:
+            yield {
+                'period': row['period'],
+                'paid_amount': row['received_sum'],
+                'due_amount': row['due_sum'],
+                'collected_amount': row['collected_sum'],
+                'late_count': row['late_sum'],
+            }
+
+    def _live_due(self, start_date: date) -> QuerySet:
+        """Per-period figures of the installments due from `start_date` to the end date."""
+        paid = Q(status=Installment.Status.PAID)
+        return (
+            self.installments
+            .filter(due_date__range=(start_date, self.end_date))
+            .annotate(period=self._trunc('due_date'))
+            .values('period')
+            .annotate(
+                due_amount=Sum('amount'),
+                collected_amount=Sum('amount', filter=paid),
+                late_count=Count('id', filter=Q(status=Installment.Status.LATE)),
+            )
+            .order_by()
+        )
+
+    def _live_received(self, start_date: date) -> QuerySet:
+        """Per-period amounts of the installments paid from `start_date` to the end date."""
+        return (
+            self.installments
+            .filter(status=Installment.Status.PAID, **day_bounds(start_date, self.end_date))
+            .annotate(period=self._trunc('paid_at'))
+            .values('period')
+            .annotate(paid_amount=Sum('amount'))
+            .order_by()
+        )
+
+    def _trunc(self, field: str) -> Trunc:
+        return Trunc(field, self.granularity, output_field=DateField())
+
+    @staticmethod
+    def _add(periods: Dict[date, Dict[str, Any]], rows: Iterable[Dict[str, Any]]) -> None:
+        """Add per-period rows from the database to the running totals."""
+        for row in rows:
+            figures = periods[row.pop('period')]
+            for field, value in row.items():
+                figures[field] += value or 0
+
+    def _periods(self) -> List[date]:
+        """First days of the periods overlapping the range, as returned by date_trunc."""
+        periods = []
+        period = self._period_start(self.start_date)
+        while period <= self.end_date:
+            periods.append(period)
+            period = self._next_period(period)
+        return periods
+
+    def _period_start(self, day: date) -> date:
+        if self.granularity == 'week':
+            # date_trunc weeks start on Monday
+            return day - timedelta(days=day.weekday())
+        if self.granularity == 'month':
+            return day.replace(day=1)
+        return day
+
+    def _next_period(self, period: date) -> date:
+        if self.granularity == 'week':
+            return period + timedelta(weeks=1)
+        if self.granularity == 'month':
+            return (period + timedelta(days=32)).replace(day=1)
+        return period + timedelta(days=1)
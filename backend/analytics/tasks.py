@@ -0,0 +1,96 @@
+from dataclasses import asdict
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from celery import chord, group, shared_task
+
+from analytics.services.aging import (
+    compute_merchant_range_aging_totals,
+    merchant_id_ranges,
+    merge_aging_totals,
+    store_portfolio_aging_totals,
+)
+from analytics.services.daily_metrics import refresh_merchant_daily_metrics
+from analytics.services.dashboard_cache import refresh_dashboard_metrics
+
+
+@shared_task
+def refresh_merchant_metrics_rollup(full_rebuild: bool = False) -> Optional[Dict[str, Any]]:
+    """Roll up the merchant daily metrics through yesterday.
+
+    Scheduled every few minutes, so the first run after midnight closes the
+    previous day and late payments of past installments reach the dashboard
+    quickly. Each run only rebuilds the due dates that changed since the
+    previous one.
+
+    Args:
+        full_rebuild (bool): Ignore the watermarks and rebuild every past due date.
+
+    Returns:
+        Optional[Dict[str, Any]]: Counts and timings of the run, stored as the task
+            result, or None if another run holds the lock.
+    """
+    result = refresh_merchant_daily_metrics(full_rebuild=full_rebuild)
+    return asdict(result) if result else None
+
+
+@shared_task
+def refresh_merchant_dashboard(merchant_id: int) -> None:
+    """Recompute the cached dashboard metrics of a merchant in the background.
+
+    Queued by the first dashboard request that finds the merchant's cached
+    metrics stale; concurrent requests keep receiving the stale metrics
+    until this task stores the new ones.
+
+    Args:
+        merchant_id (int): Id of the merchant whose metrics are recomputed.
+    """
+    refresh_dashboard_metrics(merchant_id)
+
+
+@shared_task
+def compute_portfolio_aging_report() -> Dict[str, Any]:
+    """Precompute today's portfolio aging report across all workers.
+
+    The merchants are split into id ranges of AGING_PORTFOLIO_MERCHANTS_PER_TASK
+    merchants. Each range is aggregated by `compute_merchant_range_aging` in
+    one query, and `store_portfolio_aging_report` merges the partial totals
+    and caches the report for the day.
+
+    Returns:
+        Dict[str, Any]: The number of dispatched ranges, stored as the task result.
+    """
+    today = date.today().isoformat()
+    ranges = merchant_id_ranges()
+    chord(
+        group(compute_merchant_range_aging.s(first, last, today) for first, last in ranges),
+        store_portfolio_aging_report.s(today),
+    ).apply_async()
+    return {'ranges': len(ranges)}
+
+
+@shared_task
+def compute_merchant_range_aging(first_merchant_id: int, last_merchant_id: int, today: str) -> Dict[str, Any]:
+    """Aggregate the aging totals of one range of merchants for `compute_portfolio_aging_report`.
+
+    Args:
+        first_merchant_id (int): First merchant id of the range.
+        last_merchant_id (int): Last merchant id of the range, included.
+        today (str): ISO reference date of the report.
+
+    Returns:
+        Dict[str, Any]: The partial totals, with amounts as strings.
+    """
+    totals = compute_merchant_range_aging_totals(first_merchant_id, last_merchant_id, date.fromisoformat(today))
+    return {key: str(value) if key.endswith('_amount') else value for key, value in totals.items()}
+
+
+@shared_task
+def store_portfolio_aging_report(partials: List[Dict[str, Any]], today: str) -> None:
+    """Merge the partial totals of every merchant range and cache the portfolio report.
+
+    Args:
+        partials (List[Dict[str, Any]]): Results of `compute_merchant_range_aging`.
+        today (str): ISO reference date of the report.
+    """
+    store_portfolio_aging_totals(merge_aging_totals(partials), date.fromisoformat(today))
@@ -0,0 +1,139 @@
+"""Tests for the receivables aging reports."""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.services.aging import (
+    get_merchant_aging_report,
+    get_portfolio_aging_report,
+    merchant_id_ranges,
+)
+from analytics.tasks import (
+    compute_merchant_range_aging,
+    compute_portfolio_aging_report,
+    store_portfolio_aging_report,
+)
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment
+from installment.services.payment import process_installment_payment
+from installment.tests.factories import create_standalone_installment
+from merchant.tests.factories import MerchantUserFactory
+from plan.tests.factories import PlanFactory
+
+
+class AgingReportTest(APITestCase):
+    """Test suite for the merchant and portfolio aging reports."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.today = date(2026, 6, 30)
+        self.merchant = MerchantUserFactory()
+        self.other_merchant = MerchantUserFactory()
+        self.customer = CustomerUserFactory()
+        self.plan = PlanFactory(merchant=self.merchant)
+        for days_past_due, amount in ((-5, '10.00'), (0, '20.00'), (30, '30.00'), (31, '40.00'),
+                                      (90, '50.00'), (91, '60.00'), (400, '70.00')):
+            self._installment(days_past_due, Installment.Status.LATE, amount)
+        self._installment(45, Installment.Status.PAID, '1000.00')
+        self._installment(45, Installment.Status.PENDING, '5.00', plan=PlanFactory(merchant=self.other_merchant))
+
+    def _installment(self, days_past_due: int, installment_status: str, amount: str, plan=None) -> Installment:
+        return create_standalone_installment(
+            plan or self.plan,
+            self.customer,
+            due_date=self.today - timedelta(days=days_past_due),
+            status=installment_status,
+            amount=Decimal(amount),
+        )
+
+    @staticmethod
+    def _amounts(report: dict) -> dict:
+        return {bucket['bucket']: bucket['amount'] for bucket in report['buckets']}
+
+    def test_merchant_report_buckets_outstanding_amounts(self) -> None:
+        """Unpaid installments land in the bucket of their days past due, in one query."""
+        with self.assertNumQueries(1):
+            report = get_merchant_aging_report(self.merchant, today=self.today)
+
+        self.assertEqual(self._amounts(report), {
+            '0-30': Decimal('50.00'),
+            '31-60': Decimal('40.00'),
+            '61-90': Decimal('50.00'),
+            '90+': Decimal('130.00'),
+        })
+        self.assertEqual(report['buckets'][3]['count'], 2)
+        self.assertEqual(report['current_amount'], Decimal('10.00'))
+        self.assertEqual(report['total_amount'], Decimal('280.00'))
+        self.assertEqual(report['total_count'], 7)
+
+    def test_report_is_cached_per_day(self) -> None:
+        """The same day is served from the cache, the next day is recomputed."""
+        get_merchant_aging_report(self.merchant, today=self.today)
+
+        with self.assertNumQueries(0):
+            get_merchant_aging_report(self.merchant, today=self.today)
+        with self.assertNumQueries(1):
+            next_day = get_merchant_aging_report(self.merchant, today=self.today + timedelta(days=1))
+        # The installment 30 days past due moved to the next bucket
+        self.assertEqual(self._amounts(next_day)['0-30'], Decimal('20.00'))
+        self.assertEqual(self._amounts(next_day)['31-60'], Decimal('70.00'))
+
+    def test_payment_invalidates_merchant_report(self) -> None:
+        """A paid installment leaves the cached report of the day."""
+        get_merchant_aging_report(self.merchant, today=self.today)
+        installment = Installment.objects.get(
+            installment_plan__plan=self.plan, due_date=self.today - timedelta(days=31),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            process_installment_payment(installment)
+
+        with self.assertNumQueries(1):
+            report = get_merchant_aging_report(self.merchant, today=self.today)
+        self.assertEqual(self._amounts(report)['31-60'], Decimal('0.00'))
+        self.assertEqual(report['total_amount'], Decimal('240.00'))
+
+    def test_portfolio_report_merges_merchant_ranges(self) -> None:
+        """Totals computed per merchant range add up to the single-query portfolio report."""
+        single_query = get_portfolio_aging_report(today=self.today)
+        cache.clear()
+
+        partials = [
+            compute_merchant_range_aging(first, last, self.today.isoformat())
+            for first, last in merchant_id_ranges(size=1)
+        ]
+        store_portfolio_aging_report(partials, self.today.isoformat())
+
+        with self.assertNumQueries(0):
+            merged = get_portfolio_aging_report(today=self.today)
+        self.assertEqual(merged, single_query)
+        self.assertEqual(self._amounts(merged)['31-60'], Decimal('45.00'))
+
+    def test_portfolio_task_dispatches_one_task_per_range(self) -> None:
+        """The nightly task fans the merchant ranges out as a chord."""
+        with mock.patch("analytics.tasks.chord") as chord_mock:
+            result = compute_portfolio_aging_report()
+
+        self.assertEqual(result, {'ranges': 1})
+        signatures = list(chord_mock.call_args.args[0].tasks)
+        self.assertEqual([signature.args[:2] for signature in signatures], [tuple(merchant_id_ranges()[0])])
+
+    def test_endpoints_enforce_scope(self) -> None:
+        """Merchants read their own report; only staff users read the portfolio."""
+        self.client.force_authenticate(user=self.merchant)
+        response = self.client.get(reverse('merchant_aging_report_api'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['buckets']), 4)
+        self.assertEqual(
+            self.client.get(reverse('portfolio_aging_report_api')).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        self.merchant.is_staff = True
+        self.merchant.save(update_fields=['is_staff'])
+        self.assertEqual(self.client.get(reverse('portfolio_aging_report_api')).status_code, status.HTTP_200_OK)
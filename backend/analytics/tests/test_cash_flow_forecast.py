@@ -0,0 +1,154 @@
+"""Tests for the merchant cash-flow forecast."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.services.cash_flow_forecast import get_cash_flow_forecast
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment, InstallmentPlan
+from installment.services.payment import process_installment_payment
+from installment.services.status import mark_overdue_installments
+from installment.tests.factories import InstallmentPlanFactory, create_standalone_installment
+from installment.utils.bulk_create import bulk_create_installments
+from installment.utils.schedule import schedule_cache
+from installment.utils.signal_control import disable_installment_creation_signal
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import Plan
+from plan.tests.factories import PlanFactory
+
+
+class CashFlowForecastTest(APITestCase):
+    """Test suite for get_cash_flow_forecast() and GET /api/analytics/forecast/."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.today = date.today()
+        self.merchant = MerchantUserFactory()
+        self.customer = CustomerUserFactory()
+        self.plan = PlanFactory(merchant=self.merchant)
+        self._installment(5, Installment.Status.PENDING, '100.00')
+        self._installment(5, Installment.Status.PENDING, '50.00')
+        self._installment(-3, Installment.Status.LATE, '30.00')
+        self._installment(-20, Installment.Status.PAID, '90.00')
+        self._installment(10, Installment.Status.PAID, '70.00')
+        self._installment(200, Installment.Status.PENDING, '999.00')
+        self._installment(5, Installment.Status.PENDING, '5.00', plan=PlanFactory(merchant=MerchantUserFactory()))
+        self.url = reverse('merchant_cash_flow_forecast_api')
+
+    def _installment(self, days_ahead: int, installment_status: str, amount: str, plan=None) -> Installment:
+        return create_standalone_installment(
+            plan or self.plan,
+            self.customer,
+            due_date=self.today + timedelta(days=days_ahead),
+            status=installment_status,
+            amount=Decimal(amount),
+        )
+
+    def test_unpaid_amounts_are_grouped_by_due_date(self) -> None:
+        """Pending and late amounts within the horizon are summed per due date, in one query."""
+        with self.assertNumQueries(1):
+            forecast = get_cash_flow_forecast(self.merchant, days=90)
+
+        self.assertEqual([entry['due_date'] for entry in forecast['dates']],
+                         [self.today - timedelta(days=3), self.today + timedelta(days=5)])
+        late, pending = forecast['dates']
+        self.assertEqual((late['late_amount'], late['pending_amount']), (Decimal('30.00'), Decimal('0.00')))
+        self.assertEqual((pending['pending_amount'], pending['installment_count']), (Decimal('150.00'), 2))
+        self.assertEqual(pending['expected_amount'], Decimal('150.00'))
+        self.assertEqual(forecast['scheduled_amount'], Decimal('180.00'))
+        self.assertIsNone(forecast['collection_rate'])
+
+    def test_adjustment_applies_historical_collection_rate(self) -> None:
+        """Expected amounts are scaled by the paid share of the recently due amounts."""
+        forecast = get_cash_flow_forecast(self.merchant, days=90, adjust=True)
+
+        # 90.00 paid out of 120.00 due over the lookback window
+        self.assertEqual(forecast['collection_rate'], 75.0)
+        self.assertEqual([entry['expected_amount'] for entry in forecast['dates']],
+                         [Decimal('22.50'), Decimal('112.50')])
+        self.assertEqual(forecast['expected_amount'], Decimal('135.00'))
+
+    @override_settings(CASH_FLOW_FORECAST_CACHE='default')
+    def test_repeated_forecast_is_served_from_cache(self) -> None:
+        """The same forecast runs no query the second time; other horizons are computed."""
+        first = get_cash_flow_forecast(self.merchant, days=90)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cash_flow_forecast(self.merchant, days=90), first)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_cash_flow_forecast(self.merchant, days=365)['scheduled_amount'], Decimal('1179.00'))
+
+    def test_endpoint_returns_forecast(self) -> None:
+        """Merchants read their forecast; invalid parameters are rejected."""
+        self.client.force_authenticate(user=self.merchant)
+
+        response = self.client.get(self.url, {'days': 30, 'adjust': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['days'], 30)
+        self.assertEqual(data['collection_rate'], 75.0)
+        self.assertEqual(len(data['dates']), 2)
+        for params in ({'days': 0}, {'days': 1000}, {'adjust': 'maybe'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_customer_cannot_access_forecast(self) -> None:
+        """Only merchants can read their forecast."""
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(CASH_FLOW_FORECAST_CACHE='default')
+class CashFlowForecastInvalidationTest(APITestCase):
+    """Test suite for the invalidation of cached forecasts by installment changes."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        cache.clear()
+        self.merchant = MerchantUserFactory()
+        self.plan = PlanFactory(merchant=self.merchant, installment_count=3, status=Plan.Status.ACTIVE)
+        self.installment_plan = InstallmentPlanFactory(
+            plan=self.plan,
+            customer=CustomerUserFactory(),
+            start_date=date.today() - timedelta(days=1),
+        )
+
+    def test_payment_invalidates_forecast(self) -> None:
+        """A paid installment leaves the next forecast."""
+        before = get_cash_flow_forecast(self.merchant, days=90)
+        installment = self.installment_plan.installments.get(sequence_number=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            process_installment_payment(installment)
+
+        after = get_cash_flow_forecast(self.merchant, days=90)
+        self.assertEqual(after['scheduled_amount'], before['scheduled_amount'] - installment.amount)
+
+    def test_overdue_run_invalidates_forecast(self) -> None:
+        """Installments marked late move from the pending to the late amount."""
+        before = get_cash_flow_forecast(self.merchant, days=90)
+        self.assertEqual(before['dates'][0]['late_amount'], Decimal('0.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue_installments()
+
+        after = get_cash_flow_forecast(self.merchant, days=90)
+        self.assertEqual(after['dates'][0]['late_amount'], before['dates'][0]['pending_amount'])
+
+    def test_enrollment_invalidates_forecast(self) -> None:
+        """Installments generated for a new plan are included in the next forecast."""
+        before = get_cash_flow_forecast(self.merchant, days=365)
+
+        with disable_installment_creation_signal():
+            installment_plan = InstallmentPlan.objects.create(plan=self.plan, customer=CustomerUserFactory())
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_create_installments([installment_plan])
+
+        after = get_cash_flow_forecast(self.merchant, days=365)
+        self.assertEqual(after['scheduled_amount'], before['scheduled_amount'] + self.plan.total_amount)
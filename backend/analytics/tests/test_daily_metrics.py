@@ -0,0 +1,150 @@
+"""Tests for the merchant daily metrics rollup and the dashboard reading it."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from analytics.constants import MERCHANT_METRICS_ROLLUP_NAME
+from analytics.models import MerchantDailyMetrics, MetricsRollupState
+from analytics.services.daily_metrics import refresh_merchant_daily_metrics
+from analytics.services.merchant_dashboard_service import MerchantDashboardService
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment
+from installment.tests.factories import create_standalone_installment
+from merchant.tests.factories import MerchantUserFactory
+from plan.tests.factories import PlanFactory
+
+
+class MerchantDailyMetricsTest(TestCase):
+    """Test suite for refresh_merchant_daily_metrics() and the rolled up dashboard."""
+
+    def setUp(self) -> None:
+        self.today = date.today()
+        self.merchant = MerchantUserFactory()
+        self.other_merchant = MerchantUserFactory()
+        self.plan = PlanFactory(merchant=self.merchant)
+        self.customer = CustomerUserFactory()
+        self.late = self._installment(-10, Installment.Status.LATE, '50.00')
+        self._installment(-10, Installment.Status.PAID, '100.00')
+        self._installment(-2, Installment.Status.PAID, '60.00')
+        self._installment(0, Installment.Status.PENDING, '80.00')
+        self._installment(30, Installment.Status.PENDING, '90.00')
+        self._installment(-10, Installment.Status.PAID, '500.00', plan=PlanFactory(merchant=self.other_merchant))
+
+    def _installment(self, days: int, installment_status: str, amount: str, plan=None) -> Installment:
+        return create_standalone_installment(
+            plan or self.plan,
+            self.customer,
+            due_date=self.today + timedelta(days=days),
+            status=installment_status,
+            amount=Decimal(amount),
+        )
+
+    def _metrics(self) -> dict:
+        return MerchantDashboardService(self.merchant).get_metrics()
+
+    def _settle_history(self) -> None:
+        """Pretend every installment was last changed well before the previous run."""
+        Installment.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+    def test_rolled_up_metrics_match_live_aggregate(self) -> None:
+        """The dashboard returns the same metrics before and after the first rollup."""
+        live = self._metrics()
+
+        result = refresh_merchant_daily_metrics(today=self.today)
+
+        self.assertTrue(result.full_rebuild)
+        self.assertEqual(result.rolled_up_through, self.today - timedelta(days=1))
+        self.assertEqual(self._metrics(), live)
+        self.assertEqual(live, {
+            'total_revenue': '160.00',
+            'success_rate': '40.00',
+            'overdue_count': '1',
+            'active_plans': '3',
+        })
+        ten_days_ago = MerchantDailyMetrics.objects.get(merchant=self.merchant, day=self.today - timedelta(days=10))
+        self.assertEqual(
+            (ten_days_ago.installment_count, ten_days_ago.paid_count, ten_days_ago.late_count),
+            (2, 1, 1),
+        )
+        self.assertEqual(ten_days_ago.paid_amount, Decimal('100.00'))
+        # Today stays live, future due dates are rolled up
+        self.assertFalse(MerchantDailyMetrics.objects.filter(day=self.today).exists())
+        self.assertTrue(MerchantDailyMetrics.objects.filter(merchant=self.merchant, day__gt=self.today).exists())
+
+    def test_dashboard_queries_do_not_depend_on_history(self) -> None:
+        """Past installments are read from one rollup row per day."""
+        for _ in range(20):
+            self._installment(-10, Installment.Status.PAID, '10.00')
+        refresh_merchant_daily_metrics(today=self.today)
+
+        # Rollup state, rollup sum, live aggregate and active plan count
+        with self.assertNumQueries(4):
+            metrics = self._metrics()
+        self.assertEqual(metrics['total_revenue'], '360.00')
+
+    def test_future_installments_are_read_from_the_rollup(self) -> None:
+        """Installments due after today are summed from their rollup rows; only today is aggregated live."""
+        for days in range(1, 21):
+            self._installment(days, Installment.Status.PAID, '10.00')
+        refresh_merchant_daily_metrics(today=self.today)
+        self.assertEqual(MerchantDailyMetrics.objects.filter(merchant=self.merchant, day__gt=self.today).count(), 21)
+
+        # Changed behind the rollup's back: the dashboard keeps serving the rolled up figures
+        Installment.objects.filter(due_date__gt=self.today).update(status=Installment.Status.PENDING)
+        with self.assertNumQueries(4):
+            metrics = self._metrics()
+
+        self.assertEqual(metrics['total_revenue'], '360.00')
+        self.assertEqual(metrics['success_rate'], "88.00")
+
+    def test_incremental_run_rebuilds_changed_days(self) -> None:
+        """A late payment of a past installment reaches the dashboard on the next run."""
+        refresh_merchant_daily_metrics(today=self.today)
+        self._settle_history()
+
+        Installment.objects.filter(pk=self.late.pk).update(
+            status=Installment.Status.PAID,
+            paid_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        self.assertEqual(self._metrics()['total_revenue'], '160.00')
+
+        result = refresh_merchant_daily_metrics(today=self.today)
+
+        self.assertFalse(result.full_rebuild)
+        self.assertEqual(result.days_rebuilt, 1)
+        self.assertEqual(self._metrics()['total_revenue'], '210.00')
+        self.assertEqual(self._metrics()['overdue_count'], '0')
+
+    def test_next_day_closes_today(self) -> None:
+        """The first run of a new day rolls up the day that just ended."""
+        refresh_merchant_daily_metrics(today=self.today)
+        self._settle_history()
+        before = self._metrics()
+
+        result = refresh_merchant_daily_metrics(today=self.today + timedelta(days=1))
+
+        self.assertEqual(result.days_rebuilt, 1)
+        self.assertTrue(MerchantDailyMetrics.objects.filter(merchant=self.merchant, day=self.today).exists())
+        self.assertEqual(self._metrics(), before)
+
+    def test_full_rebuild_drops_rows_of_deleted_installments(self) -> None:
+        """Deletions are invisible to incremental runs but repaired by a full rebuild."""
+        refresh_merchant_daily_metrics(today=self.today)
+        Installment.objects.filter(installment_plan__plan__merchant=self.other_merchant).delete()
+
+        refresh_merchant_daily_metrics(today=self.today, full_rebuild=True)
+
+        self.assertFalse(MerchantDailyMetrics.objects.filter(merchant=self.other_merchant).exists())
+
+    def test_locked_rollup_is_skipped(self) -> None:
+        """A run is skipped while another one holds the lease."""
+        MetricsRollupState.objects.create(
+            name=MERCHANT_METRICS_ROLLUP_NAME,
+            locked_until=timezone.now() + timedelta(minutes=5),
+        )
+
+        self.assertIsNone(refresh_merchant_daily_metrics(today=self.today))
+        self.assertFalse(MerchantDailyMetrics.objects.exists())
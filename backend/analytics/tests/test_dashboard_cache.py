@@ -0,0 +1,135 @@
+"""Tests for the stale-while-revalidate cache of the merchant dashboard."""
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.services.dashboard_cache import (
+    dashboard_cache_stats,
+    get_dashboard_metrics,
+    merchant_dashboard_cache,
+    refresh_dashboard_metrics,
+)
+from customer.tests.factories import CustomerUserFactory
+from installment.models import InstallmentPlan
+from installment.services.payment import process_installment_payment
+from installment.services.status import mark_overdue_installments
+from installment.tests.factories import InstallmentPlanFactory
+from installment.utils.bulk_create import bulk_create_installments
+from installment.utils.schedule import schedule_cache
+from installment.utils.signal_control import disable_installment_creation_signal
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import Plan
+from plan.tests.factories import PlanFactory
+
+
+@override_settings(MERCHANT_DASHBOARD_CACHE='default')
+class MerchantDashboardCacheTest(APITestCase):
+    """Test suite for caching, invalidation and background refresh of dashboard metrics."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        cache.clear()
+        self.merchant = MerchantUserFactory()
+        self.plan = PlanFactory(merchant=self.merchant, installment_count=3, status=Plan.Status.ACTIVE)
+        self.customer = CustomerUserFactory()
+        self.installment_plan = InstallmentPlanFactory(
+            plan=self.plan,
+            customer=self.customer,
+            start_date=date.today() - timedelta(days=1),
+        )
+
+    def _assert_stale(self) -> None:
+        self.assertFalse(merchant_dashboard_cache.lookup(self.merchant.pk).fresh)
+
+    def test_repeated_request_is_served_from_cache(self) -> None:
+        """The second dashboard request runs no query."""
+        self.client.force_authenticate(user=self.merchant)
+        url = reverse('merchant_dashboard_api')
+        first = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+    def test_payment_serves_stale_metrics_until_refreshed(self) -> None:
+        """After a payment the previous metrics are served while one refresh is queued."""
+        before = get_dashboard_metrics(self.merchant)
+        with self.captureOnCommitCallbacks(execute=True):
+            process_installment_payment(self.installment_plan.installments.get(sequence_number=1))
+
+        with mock.patch("analytics.tasks.refresh_merchant_dashboard.delay") as delay_mock:
+            self.assertEqual(get_dashboard_metrics(self.merchant), before)
+            self.assertEqual(get_dashboard_metrics(self.merchant), before)
+        delay_mock.assert_called_once_with(self.merchant.pk)
+
+        refresh_dashboard_metrics(self.merchant.pk)
+
+        with self.assertNumQueries(0):
+            after = get_dashboard_metrics(self.merchant)
+        self.assertNotEqual(after['total_revenue'], before['total_revenue'])
+
+    def test_refresh_claim_is_released(self) -> None:
+        """A finished refresh lets the next stale lookup queue another one."""
+        get_dashboard_metrics(self.merchant)
+        self.assertTrue(merchant_dashboard_cache.claim_refresh(self.merchant.pk))
+        self.assertFalse(merchant_dashboard_cache.claim_refresh(self.merchant.pk))
+
+        refresh_dashboard_metrics(self.merchant.pk)
+
+        self.assertTrue(merchant_dashboard_cache.claim_refresh(self.merchant.pk))
+
+    def test_overdue_run_invalidates_merchant_dashboard(self) -> None:
+        """Marking installments late makes the cached metrics stale."""
+        get_dashboard_metrics(self.merchant)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue_installments()
+
+        self._assert_stale()
+
+    def test_enrollment_invalidates_merchant_dashboard(self) -> None:
+        """Installments generated for a new plan make the cached metrics stale."""
+        get_dashboard_metrics(self.merchant)
+
+        with disable_installment_creation_signal():
+            installment_plan = InstallmentPlan.objects.create(plan=self.plan, customer=CustomerUserFactory())
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_create_installments([installment_plan])
+
+        self._assert_stale()
+
+    def test_other_merchants_keep_their_entries(self) -> None:
+        """A bump only affects the merchant whose installments changed."""
+        other = MerchantUserFactory()
+        get_dashboard_metrics(other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue_installments()
+
+        self.assertTrue(merchant_dashboard_cache.lookup(other.pk).fresh)
+
+    def test_stats_report_hit_rate(self) -> None:
+        """Lookups are counted by outcome."""
+        get_dashboard_metrics(self.merchant)
+        get_dashboard_metrics(self.merchant)
+        get_dashboard_metrics(self.merchant)
+
+        stats = dashboard_cache_stats()
+
+        self.assertEqual((stats['hit'], stats['stale'], stats['miss']), (2, 0, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    @override_settings(MERCHANT_DASHBOARD_CACHE=None)
+    def test_disabled_cache_computes_every_time(self) -> None:
+        """Without a configured alias the metrics are computed on each call."""
+        get_dashboard_metrics(self.merchant)
+
+        with self.assertNumQueries(3):
+            get_dashboard_metrics(self.merchant)
+        self.assertEqual(dashboard_cache_stats(), {})
@@ -0,0 +1,138 @@
+"""Tests for the merchant time series."""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from typing import Optional
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.services.daily_metrics import refresh_merchant_daily_metrics
+from analytics.services.time_series import MerchantTimeSeriesService
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment
+from installment.tests.factories import create_standalone_installment
+from merchant.tests.factories import MerchantUserFactory
+from plan.tests.factories import PlanFactory
+
+
+class MerchantTimeSeriesTest(APITestCase):
+    """Test suite for MerchantTimeSeriesService and GET /api/analytics/time-series/."""
+
+    def setUp(self) -> None:
+        self.merchant = MerchantUserFactory()
+        self.plan = PlanFactory(merchant=self.merchant)
+        self.customer = CustomerUserFactory()
+        # 2026-03-02 is a Monday
+        self._installment(date(2026, 3, 2), Installment.Status.PAID, '100.00', paid_on=date(2026, 3, 1))
+        self._installment(date(2026, 3, 2), Installment.Status.LATE, '200.00')
+        self._installment(date(2026, 3, 10), Installment.Status.PAID, '300.00', paid_on=date(2026, 3, 12))
+        self._installment(date(2026, 4, 15), Installment.Status.PENDING, '400.00')
+        self._installment(
+            date(2026, 3, 2), Installment.Status.PAID, '999.00',
+            paid_on=date(2026, 3, 2), plan=PlanFactory(merchant=MerchantUserFactory()),
+        )
+        self.url = reverse('merchant_time_series_api')
+
+    def _installment(
+        self,
+        due_date: date,
+        installment_status: str,
+        amount: str,
+        paid_on: Optional[date] = None,
+        plan=None,
+    ) -> Installment:
+        return create_standalone_installment(
+            plan or self.plan,
+            self.customer,
+            due_date=due_date,
+            status=installment_status,
+            amount=Decimal(amount),
+            paid_at=datetime.combine(paid_on, datetime.min.time(), dt_timezone.utc) + timedelta(hours=10)
+            if paid_on else None,
+        )
+
+    def _series(self, start_date: date, end_date: date, granularity: str) -> list:
+        return MerchantTimeSeriesService(self.merchant, start_date, end_date, granularity).get_series()
+
+    def test_daily_series_groups_by_due_and_payment_dates(self) -> None:
+        """Received amounts follow paid_at, due amounts and late counts follow due_date."""
+        series = {point['period']: point for point in self._series(date(2026, 3, 1), date(2026, 3, 12), 'day')}
+
+        self.assertEqual(len(series), 12)
+        self.assertEqual(series[date(2026, 3, 1)]['paid_amount'], Decimal('100.00'))
+        self.assertEqual(series[date(2026, 3, 1)]['due_amount'], Decimal('0.00'))
+        self.assertEqual(series[date(2026, 3, 2)]['due_amount'], Decimal('300.00'))
+        self.assertEqual(series[date(2026, 3, 2)]['late_count'], 1)
+        self.assertAlmostEqual(series[date(2026, 3, 2)]['collection_rate'], 100 / 3)
+        self.assertEqual(series[date(2026, 3, 10)]['collection_rate'], 100.0)
+        self.assertEqual(series[date(2026, 3, 12)]['paid_amount'], Decimal('300.00'))
+        self.assertEqual(series[date(2026, 3, 5)]['collection_rate'], 0.0)
+
+    def test_weekly_and_monthly_periods_start_like_date_trunc(self) -> None:
+        """Weeks start on Monday and months on their first day."""
+        weekly = self._series(date(2026, 3, 4), date(2026, 3, 16), 'week')
+        self.assertEqual([point['period'] for point in weekly], [date(2026, 3, 2), date(2026, 3, 9), date(2026, 3, 16)])
+        # 2026-03-02 is before the range, but its week overlaps it
+        self.assertEqual(weekly[1]['due_amount'], Decimal('300.00'))
+
+        monthly = self._series(date(2026, 3, 1), date(2026, 4, 30), 'month')
+        self.assertEqual([point['period'] for point in monthly], [date(2026, 3, 1), date(2026, 4, 1)])
+        self.assertEqual(monthly[0]['paid_amount'], Decimal('400.00'))
+        self.assertEqual(monthly[0]['due_amount'], Decimal('600.00'))
+        self.assertAlmostEqual(monthly[0]['collection_rate'], 200 / 3)
+        self.assertEqual(monthly[1]['due_amount'], Decimal('400.00'))
+
+    def test_large_range_reads_rollups(self) -> None:
+        """Long ranges combine rolled up days with live days, matching a fully live series."""
+        live = self._series(date(2026, 2, 1), date(2026, 4, 30), 'week')
+        refresh_merchant_daily_metrics(today=date(2026, 3, 11))
+
+        self.assertEqual(self._series(date(2026, 2, 1), date(2026, 4, 30), 'week'), live)
+
+        # A change made without updating the rollup is only visible to short, live ranges
+        Installment.objects.filter(due_date=date(2026, 3, 2), status=Installment.Status.LATE).delete()
+        rolled_up = self._series(date(2026, 2, 1), date(2026, 4, 30), 'month')
+        self.assertEqual(rolled_up[1]['late_count'], 1)
+        self.assertEqual(self._series(date(2026, 3, 1), date(2026, 3, 31), 'month')[0]['late_count'], 0)
+
+    def test_endpoint_returns_series(self) -> None:
+        """The endpoint returns one point per period of the requested range."""
+        self.client.force_authenticate(user=self.merchant)
+
+        response = self.client.get(self.url, {
+            'start_date': '2026-03-01', 'end_date': '2026-04-30', 'granularity': 'month',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['granularity'], 'month')
+        self.assertEqual([point['period'] for point in data['series']], ['2026-03-01', '2026-04-01'])
+        self.assertEqual(data['series'][0]['paid_amount'], Decimal('400.00'))
+
+    def test_endpoint_defaults_to_last_thirty_days(self) -> None:
+        """Without parameters the daily series of the last 30 days is returned."""
+        self.client.force_authenticate(user=self.merchant)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['series']), 30)
+        self.assertEqual(response.data['data']['end_date'], date.today().isoformat())
+
+    def test_endpoint_rejects_invalid_parameters(self) -> None:
+        """Reversed or too long ranges and unknown granularities are rejected."""
+        self.client.force_authenticate(user=self.merchant)
+
+        for params in (
+            {'start_date': '2026-03-10', 'end_date': '2026-03-01'},
+            {'start_date': '2020-01-01', 'end_date': '2026-03-01'},
+            {'granularity': 'hour'},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_customer_cannot_access_time_series(self) -> None:
+        """Only merchants can read their time series."""
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
@@ -1,6 +1,16 @@
 from django.urls import path
-from analytics.views import MerchantDashboardAPIView
+from analytics.views import (
+    MerchantCashFlowForecastAPIView,
+    MerchantAgingReportAPIView,
+    MerchantDashboardAPIView,
+    MerchantTimeSeriesAPIView,
+    PortfolioAgingReportAPIView,
+)
 
 urlpatterns = [
     path('dashboard/', MerchantDashboardAPIView.as_view(), name='merchant_dashboard_api'),
+    path('time-series/', MerchantTimeSeriesAPIView.as_view(), name='merchant_time_series_api'),
+    path('aging/', MerchantAgingReportAPIView.as_view(), name='merchant_aging_report_api'),
+    path('aging/portfolio/', PortfolioAgingReportAPIView.as_view(), name='portfolio_aging_report_api'),
+    path('forecast/', MerchantCashFlowForecastAPIView.as_view(), name='merchant_cash_flow_forecast_api'),
 ]
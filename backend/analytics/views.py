@@ -6,8 +6,19 @@ from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from analytics.serializers import MerchantDashboardMetricsSerializer
-from analytics.services.merchant_dashboard_service import MerchantDashboardService
+from analytics.constants import CASH_FLOW_FORECAST_MAX_DAYS, TIME_SERIES_GRANULARITIES
+from analytics.serializers import (
+    AgingReportSerializer,
+    CashFlowForecastQuerySerializer,
+    CashFlowForecastSerializer,
+    MerchantDashboardMetricsSerializer,
+    MerchantTimeSeriesQuerySerializer,
+    MerchantTimeSeriesSerializer,
+)
+from analytics.services.aging import get_merchant_aging_report, get_portfolio_aging_report
+from analytics.services.cash_flow_forecast import get_cash_flow_forecast
+from analytics.services.dashboard_cache import get_dashboard_metrics
+from analytics.services.time_series import MerchantTimeSeriesService
 from core.exceptions import BusinessException
 from core.permissions import IsMerchant
 from core.utils.standard_api_response_mixin import StandardApiResponseMixin
@@ -58,8 +69,7 @@ class MerchantDashboardAPIView(StandardApiResponseMixin, generics.GenericAPIView
             Response: A Response object containing the dashboard metrics or error message.
         """
 
-        service = MerchantDashboardService(request.user)
-        data = service.get_metrics()
+        data = get_dashboard_metrics(request.user)
         serializer = self.get_serializer(data=data)
 
         if not serializer.is_valid():
@@ -78,3 +88,242 @@ class MerchantDashboardAPIView(StandardApiResponseMixin, generics.GenericAPIView
             message=str(_("Merchant dashboard metrics retrieved successfully")),
             data=serializer.data
         )
+
+
+class MerchantTimeSeriesAPIView(StandardApiResponseMixin, generics.GenericAPIView):
+    """Retrieve revenue and collection figures of the authenticated merchant per period."""
+
+    serializer_class = MerchantTimeSeriesSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchant]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        tags=["Analytics"],
+        operation_description=str(_(
+            "Get the amount received, amount due, late installments and collection rate "
+            "of the merchant per day, week or month"
+        )),
+        manual_parameters=[
+            openapi.Parameter(
+                name="start_date",
+                in_=openapi.IN_QUERY,
+                description=str(_("First day of the range (YYYY-MM-DD)")),
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                required=False,
+            ),
+            openapi.Parameter(
+                name="end_date",
+                in_=openapi.IN_QUERY,
+                description=str(_("Last day of the range, included (YYYY-MM-DD); defaults to today")),
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE,
+                required=False,
+            ),
+            openapi.Parameter(
+                name="granularity",
+                in_=openapi.IN_QUERY,
+                description=str(_("Length of each period")),
+                type=openapi.TYPE_STRING,
+                enum=list(TIME_SERIES_GRANULARITIES),
+                required=False,
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description=str(_("Merchant time series retrieved successfully")),
+                schema=build_success_response_schema(
+                    serializer_class=MerchantTimeSeriesSerializer
+                ),
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Response(
+                description=str(_("Validation error")),
+                schema=api_error_schema,
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("Permission denied")),
+                schema=api_error_schema
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        """Handle GET request to retrieve the merchant time series.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response: A Response object containing one point per period of the range.
+
+        Raises:
+            ValidationError: If the query parameters are invalid.
+        """
+        query_serializer = MerchantTimeSeriesQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        params = query_serializer.validated_data
+
+        series = MerchantTimeSeriesService(request.user, **params).get_series()
+        serializer = self.get_serializer({**params, 'series': series})
+
+        return self.success_response(
+            message=str(_("Merchant time series retrieved successfully")),
+            data=serializer.data
+        )
+
+
+class MerchantAgingReportAPIView(StandardApiResponseMixin, generics.GenericAPIView):
+    """Retrieve the aging of the authenticated merchant's outstanding installments."""
+
+    serializer_class = AgingReportSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchant]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        tags=["Analytics"],
+        operation_description=str(_(
+            "Get the merchant's outstanding installment amounts by days past due "
+            "(0-30, 31-60, 61-90, 90+), as of today"
+        )),
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description=str(_("Aging report retrieved successfully")),
+                schema=build_success_response_schema(serializer_class=AgingReportSerializer),
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("Permission denied")),
+                schema=api_error_schema
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        """Handle GET request to retrieve the merchant aging report.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response: A Response object containing the aging report.
+        """
+        serializer = self.get_serializer(get_merchant_aging_report(request.user))
+        return self.success_response(
+            message=str(_("Aging report retrieved successfully")),
+            data=serializer.data
+        )
+
+
+class PortfolioAgingReportAPIView(StandardApiResponseMixin, generics.GenericAPIView):
+    """Retrieve the aging of all merchants' outstanding installments, for staff users."""
+
+    serializer_class = AgingReportSerializer
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        tags=["Analytics"],
+        operation_description=str(_(
+            "Get the outstanding installment amounts of every merchant by days past due "
+            "(0-30, 31-60, 61-90, 90+), as of today"
+        )),
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description=str(_("Aging report retrieved successfully")),
+                schema=build_success_response_schema(serializer_class=AgingReportSerializer),
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("Permission denied")),
+                schema=api_error_schema
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        """Handle GET request to retrieve the portfolio aging report.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response: A Response object containing the aging report.
+        """
+        serializer = self.get_serializer(get_portfolio_aging_report())
+        return self.success_response(
+            message=str(_("Aging report retrieved successfully")),
+            data=serializer.data
+        )
+
+
+class MerchantCashFlowForecastAPIView(StandardApiResponseMixin, generics.GenericAPIView):
+    """Retrieve the amounts the authenticated merchant expects to receive per due date."""
+
+    serializer_class = CashFlowForecastSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchant]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        tags=["Analytics"],
+        operation_description=str(_(
+            "Get the pending and late installment amounts of the merchant grouped by due date, "
+            "up to the given number of days ahead, optionally scaled by the historical collection rate"
+        )),
+        manual_parameters=[
+            openapi.Parameter(
+                name="days",
+                in_=openapi.IN_QUERY,
+                description=str(_("Number of days ahead to forecast")),
+                type=openapi.TYPE_INTEGER,
+                minimum=1,
+                maximum=CASH_FLOW_FORECAST_MAX_DAYS,
+                required=False,
+            ),
+            openapi.Parameter(
+                name="adjust",
+                in_=openapi.IN_QUERY,
+                description=str(_("Scale the expected amounts by the historical collection rate")),
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description=str(_("Cash-flow forecast retrieved successfully")),
+                schema=build_success_response_schema(serializer_class=CashFlowForecastSerializer),
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Response(
+                description=str(_("Validation error")),
+                schema=api_error_schema,
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("Permission denied")),
+                schema=api_error_schema
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        """Handle GET request to retrieve the merchant cash-flow forecast.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Response: A Response object containing the expected amounts per due date.
+
+        Raises:
+            ValidationError: If the query parameters are invalid.
+        """
+        query_serializer = CashFlowForecastQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        forecast = get_cash_flow_forecast(request.user, **query_serializer.validated_data)
+        serializer = self.get_serializer(forecast)
+
+        return self.success_response(
+            message=str(_("Cash-flow forecast retrieved successfully")),
+            data=serializer.data
+        )
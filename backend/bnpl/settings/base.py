@@ -67,16 +67,60 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'installment.tasks.check_overdue_installments',
         'schedule': crontab(hour=0, minute=0),  # Daily at midnight
     },
+    'compute-portfolio-aging-report': {
+        'task': 'analytics.tasks.compute_portfolio_aging_report',
+        'schedule': crontab(hour=0, minute=15),  # Daily after the overdue scan
+    },
+    'reconcile-installment-plan-progress': {
+        'task': 'installment.tasks.reconcile_installment_plan_progress',
+        'schedule': crontab(hour=3, minute=0),  # Daily at 3 AM
+    },
+    'refresh-merchant-metrics-rollup': {
+        'task': 'analytics.tasks.refresh_merchant_metrics_rollup',
+        'schedule': crontab(minute='*/15'),  # Closes the previous day and picks up late payments
+    },
     'send-payment-reminders': {
         'task': 'notification.tasks.send_payment_reminders',
         'schedule': crontab(hour=9, minute=0),  # Daily at 9 AM
+        'kwargs': {'fan_out': True},  # Spread the emails over all workers
     },
-    'update-overdue-status': {
-        'task': 'installment.tasks.check_overdue_installments',
-        'schedule': crontab(hour=0, minute=0),  # Daily at midnight
-    }
 }
 
+# Installment schedules
+# Optional cache alias (e.g. 'default') used to share computed schedules across workers
+INSTALLMENT_SCHEDULE_SHARED_CACHE = config('INSTALLMENT_SCHEDULE_SHARED_CACHE', default=None)
+# Load multi-customer enrollments with COPY FROM STDIN on PostgreSQL (other databases use bulk_create)
+INSTALLMENT_BULK_LOAD_USE_COPY = config('INSTALLMENT_BULK_LOAD_USE_COPY', default=True, cast=bool)
+
+# Versioned caches of installment lists, dashboards and forecasts
+# Each alias must be shared by every worker (e.g. Redis), since invalidation bumps a version stored in it.
+
+# Installment list cache
+# Optional cache alias (e.g. 'default') holding serialized installment list pages per customer.
+INSTALLMENT_LIST_CACHE = config('INSTALLMENT_LIST_CACHE', default=None)
+
+# Merchant dashboard cache
+# Optional cache alias (e.g. 'default') holding computed dashboard metrics per merchant.
+MERCHANT_DASHBOARD_CACHE = config('MERCHANT_DASHBOARD_CACHE', default=None)
+
+# Merchant cash-flow forecast cache
+# Optional cache alias (e.g. 'default') holding computed forecasts per merchant.
+CASH_FLOW_FORECAST_CACHE = config('CASH_FLOW_FORECAST_CACHE', default=None)
+
+# Receivables aging reports
+# Cache alias holding the daily aging reports; it should be shared by every worker in production
+AGING_REPORT_CACHE = config('AGING_REPORT_CACHE', default='default')
+
+# Idempotency-Key support of payment and plan creation endpoints
+# Cache alias holding the first response of each key; it must be shared by every worker in production
+IDEMPOTENCY_CACHE = config('IDEMPOTENCY_CACHE', default='default')
+# Seconds during which a retried Idempotency-Key replays the first response
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=60 * 60 * 24, cast=int)
+
+# Payment reminders
+# Days before the due date when reminders are sent; negative values are days after it
+REMINDER_OFFSETS = config('REMINDER_OFFSETS', default='7,3,1,0,-1,-3', cast=Csv(cast=int))
+
 # DRF Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -0,0 +1,25 @@
+"""Migration operations shared by the apps."""
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrentlyIfSupported(AddIndexConcurrently):
+    """Build an index with ``CREATE INDEX CONCURRENTLY`` on PostgreSQL.
+
+    Writes to the table are not blocked while the index is built. Other
+    databases (e.g. SQLite in local test runs) get a plain ``CREATE INDEX``.
+    Migrations using it must set ``atomic = False``, because PostgreSQL does
+    not allow concurrent index builds inside a transaction.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
@@ -1,5 +1,24 @@
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Model, Q, QuerySet
+from django.db.models.fields import Field
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Query parameter and value that switch a list endpoint to cursor pagination
+PAGINATION_MODE_QUERY_PARAM = 'pagination'
+CURSOR_PAGINATION_MODE = 'cursor'
 
 
 class DrfPagination(PageNumberPagination):
@@ -9,3 +28,249 @@ class DrfPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
 
     max_page_size = settings.REST_FRAMEWORK.get('MAX_PAGE_SIZE')
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder of cursor values that keeps datetimes and times to the microsecond.
+
+    DjangoJSONEncoder truncates them to milliseconds, which would make the
+    keyset filter skip rows sharing the millisecond of the cursor row.
+    """
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+@dataclass(frozen=True)
+class KeysetColumn:
+    """One column of a keyset ordering.
+
+    Attributes:
+        lookup: Field lookup as used in order_by(), without the '-' prefix.
+        field: The model field the lookup resolves to.
+        descending: Whether rows are ordered by descending values.
+        nulls_first: Whether NULL values are ordered before every other value.
+    """
+
+    lookup: str
+    field: Field
+    descending: bool
+    nulls_first: bool
+
+    def reversed(self) -> 'KeysetColumn':
+        """The same column walked in the opposite direction."""
+        return KeysetColumn(self.lookup, self.field, not self.descending, not self.nulls_first)
+
+    def order_by(self):
+        """Ordering expression; NULL placement is explicit so it is identical on every database."""
+        # Only nullable columns get it, so plain indexes still serve the other orderings
+        nulls = {}
+        if self.field.null:
+            nulls = {'nulls_first': True} if self.nulls_first else {'nulls_last': True}
+        expression = F(self.lookup)
+        return expression.desc(**nulls) if self.descending else expression.asc(**nulls)
+
+    def after(self, value: Any) -> Q:
+        """Condition matching the rows ordered strictly after `value` in this column."""
+        if value is None:
+            # Non-NULL values follow the NULLs only when NULLs come first
+            return Q(**{f'{self.lookup}__isnull': False}) if self.nulls_first else Q(pk__in=[])
+        condition = Q(**{f"{self.lookup}__{'lt' if self.descending else 'gt'}": value})
+        if self.field.null and not self.nulls_first:
+            condition |= Q(**{f'{self.lookup}__isnull': True})
+        return condition
+
+    def equals(self, value: Any) -> Q:
+        """Condition matching the rows holding `value` in this column."""
+        if value is None:
+            return Q(**{f'{self.lookup}__isnull': True})
+        return Q(**{self.lookup: value})
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over the ordering of the paginated queryset.
+
+    Unlike page numbers, a page is located by the ordering values of the
+    last row of the previous page (a keyset), so no ``COUNT(*)`` is run and
+    deep pages cost the same as the first one. The queryset's own order_by()
+    is used, with the primary key appended as a tiebreaker when the ordering
+    does not already end with it. NULLs are always ordered last.
+
+    Cursors are opaque base64 tokens carried by the ``next`` and ``previous``
+    links, which keep every other query parameter of the request.
+    """
+
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE')
+    page_size_query_param = 'page_size'
+    max_page_size = settings.REST_FRAMEWORK.get('MAX_PAGE_SIZE')
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> Optional[List[Model]]:
+        """Return the page of rows following (or preceding) the request cursor.
+
+        Args:
+            queryset: An ordered queryset.
+            request: The request, holding the optional cursor and page size.
+            view: The view being paginated.
+
+        Returns:
+            Optional[List[Model]]: The rows of the page, or None when pagination is disabled.
+
+        Raises:
+            NotFound: If the cursor cannot be decoded.
+        """
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        if not self.page_size_value:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.columns = self._get_columns(queryset)
+        values, reverse = self._decode_cursor(request)
+
+        columns = [column.reversed() for column in self.columns] if reverse else self.columns
+        queryset = queryset.order_by(*(column.order_by() for column in columns))
+        if values is not None:
+            queryset = queryset.filter(self._after(columns, values))
+
+        # One extra row tells whether another page exists in this direction
+        rows = list(queryset[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = values is not None, has_more
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request: Request) -> Optional[int]:
+        """Page size from the query parameter, bounded by `max_page_size`."""
+        return PageNumberPagination.get_page_size(self, request)
+
+    def get_next_link(self) -> Optional[str]:
+        """URL of the page following the current one, if any."""
+        if not self.has_next or not self.page:
+            return None
+        return self._encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        """URL of the page preceding the current one, if any."""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # No row to anchor the cursor on, so start over from the first page
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._encode_cursor(self.page[0], reverse=True)
+
+    def get_pagination_metadata(self) -> Dict[str, Any]:
+        """Pagination block of the standard response envelope."""
+        return {
+            'mode': CURSOR_PAGINATION_MODE,
+            'page_size': self.page_size_value,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+
+    def _get_columns(self, queryset: QuerySet) -> List[KeysetColumn]:
+        """Build the keyset columns from the queryset ordering, plus a primary key tiebreaker."""
+        model = queryset.model
+        columns = []
+        for name in queryset.query.order_by or model._meta.ordering:
+            if not isinstance(name, str):
+                raise TypeError("KeysetPagination only supports orderings given as field names.")
+            descending = name.startswith('-')
+            lookup = name.lstrip('-')
+            if lookup == 'pk':
+                lookup = model._meta.pk.name
+            columns.append(KeysetColumn(lookup, self._resolve_field(model, lookup), descending, False))
+
+        if not columns or columns[-1].lookup != model._meta.pk.name:
+            descending = columns[0].descending if columns else False
+            columns.append(KeysetColumn(model._meta.pk.name, model._meta.pk, descending, False))
+        return columns
+
+    @staticmethod
+    def _resolve_field(model: type[Model], lookup: str) -> Field:
+        """Follow a lookup such as 'installment_plan__id' to its model field."""
+        *relations, name = lookup.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    @staticmethod
+    def _after(columns: List[KeysetColumn], values: List[Any]) -> Q:
+        """Rows ordered after `values`: equal on a prefix of the columns, then after on the next one."""
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for column, value in zip(columns, values):
+            condition |= prefix & column.after(value)
+            prefix &= column.equals(value)
+        return condition
+
+    def _position(self, row: Model) -> List[Any]:
+        """Ordering values of a row, read through the same lookups as the ordering."""
+        values = []
+        for column in self.columns:
+            value = row
+            for part in column.lookup.split('__'):
+                value = getattr(value, part)
+            values.append(value)
+        return values
+
+    def _encode_cursor(self, row: Model, reverse: bool) -> str:
+        """URL of the request with a cursor positioned on `row`."""
+        payload = json.dumps({'v': self._position(row), 'r': reverse}, cls=CursorJSONEncoder)
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def _decode_cursor(self, request: Request) -> Tuple[Optional[List[Any]], bool]:
+        """Decode the request cursor into ordering values and a direction.
+
+        Returns:
+            Tuple[Optional[List[Any]], bool]: The values (None on the first page) and
+            whether the page precedes the cursor.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            raw_values, reverse = payload['v'], bool(payload['r'])
+            if len(raw_values) != len(self.columns):
+                raise ValueError
+            values = [
+                None if raw is None else column.field.to_python(raw)
+                for column, raw in zip(self.columns, raw_values)
+            ]
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+
+class CursorPaginationMixin:
+    """Let clients of a list view opt into keyset pagination with ``?pagination=cursor``.
+
+    The view's `pagination_class` stays the default; `cursor_pagination_class`
+    is used only when the query parameter asks for it.
+    """
+
+    cursor_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        """The paginator instance selected by the request's pagination mode."""
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get(PAGINATION_MODE_QUERY_PARAM)
+            if mode == CURSOR_PAGINATION_MODE:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = None if self.pagination_class is None else self.pagination_class()
+        return self._paginator
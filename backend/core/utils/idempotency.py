@@ -0,0 +1,156 @@
+"""Idempotency-Key support for unsafe API endpoints.
+
+Clients on flaky networks retry POST requests whose response they never
+received. When such a request carries an ``Idempotency-Key`` header, the
+first response is stored in a cache for ``IDEMPOTENCY_KEY_TTL`` seconds,
+keyed by the user and the key, together with a hash of the request. A retry
+with the same key and the same request is answered from the cache without
+running the view again; reusing a key for a different request is rejected.
+
+Requests without the header behave exactly as before.
+"""
+import functools
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import QueryDict
+from django.utils.translation import gettext_lazy as _
+from drf_yasg import openapi
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.exceptions import BusinessException
+from core.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+
+# Header set on responses replayed from the idempotency cache
+IDEMPOTENT_REPLAYED_HEADER = 'Idempotent-Replayed'
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# Lifetime in seconds of the marker held while the first request is being processed
+IDEMPOTENCY_IN_PROGRESS_TIMEOUT = 60
+
+idempotency_key_parameter = openapi.Parameter(
+    name=IDEMPOTENCY_KEY_HEADER,
+    in_=openapi.IN_HEADER,
+    description=str(_("Unique key of this request; retries with the same key replay the first response")),
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+
+def idempotent(view_method: Callable[..., Response]) -> Callable[..., Response]:
+    """Make a DRF view method replay its first response for retried Idempotency-Keys.
+
+    Only responses returned by the view are stored; when it raises (validation
+    or business errors, server errors), the key is released and a retry runs
+    the view again.
+
+    Args:
+        view_method: The view's ``post`` (or other unsafe) method.
+
+    Returns:
+        Callable[..., Response]: The wrapped method.
+    """
+    @functools.wraps(view_method)
+    def wrapper(view: Any, request: Request, *args: Any, **kwargs: Any) -> Response:
+        idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if idempotency_key is None:
+            return view_method(view, request, *args, **kwargs)
+
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise BusinessException(
+                message=str(_("Invalid Idempotency-Key header.")),
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache = caches[settings.IDEMPOTENCY_CACHE]
+        cache_key = _cache_key(request, idempotency_key)
+        fingerprint = _request_fingerprint(request)
+
+        # add() is atomic, so only one of several concurrent requests runs the view
+        if not cache.add(cache_key, {'fingerprint': fingerprint}, IDEMPOTENCY_IN_PROGRESS_TIMEOUT):
+            return _replay(cache, cache_key, fingerprint, request, idempotency_key)
+
+        try:
+            response = view_method(view, request, *args, **kwargs)
+        except BaseException:
+            cache.delete(cache_key)
+            raise
+
+        if status.is_server_error(response.status_code):
+            cache.delete(cache_key)
+        else:
+            cache.set(
+                cache_key,
+                {'fingerprint': fingerprint, 'status': response.status_code, 'data': response.data},
+                settings.IDEMPOTENCY_KEY_TTL,
+            )
+        return response
+
+    return wrapper
+
+
+def _replay(
+    cache: BaseCache,
+    cache_key: str,
+    fingerprint: str,
+    request: Request,
+    idempotency_key: str,
+) -> Response:
+    """Answer a request whose Idempotency-Key was already used.
+
+    Raises:
+        BusinessException: If the key was used for a different request, or the
+            first request is still being processed.
+    """
+    entry: Optional[Dict[str, Any]] = cache.get(cache_key)
+    if entry is not None and entry['fingerprint'] != fingerprint:
+        logger.error(
+            "idempotency_key_reused",
+            user_id=request.user.id,
+            idempotency_key=idempotency_key,
+            path=request.path,
+        )
+        raise BusinessException(
+            message=str(_("This Idempotency-Key was already used for a different request.")),
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if entry is None or 'status' not in entry:
+        # Still running, or released by a failure between add() and get()
+        raise BusinessException(
+            message=str(_("A request with this Idempotency-Key is still being processed.")),
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+    logger.info(
+        "idempotent_response_replayed",
+        user_id=request.user.id,
+        idempotency_key=idempotency_key,
+        path=request.path,
+    )
+    return Response(entry['data'], status=entry['status'], headers={IDEMPOTENT_REPLAYED_HEADER: 'true'})
+
+
+def _cache_key(request: Request, idempotency_key: str) -> str:
+    """Cache key of an Idempotency-Key; keys are scoped to the user."""
+    digest = hashlib.sha256(idempotency_key.encode()).hexdigest()
+    return f'idempotency:{request.user.pk}:{digest}'
+
+
+def _request_fingerprint(request: Request) -> str:
+    """Hash of the method, path and body of a request."""
+    data = request.data
+    if isinstance(data, QueryDict):
+        data = sorted(data.lists())
+    body = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+    return hashlib.sha256(f'{request.method}\n{request.path}\n{body}'.encode()).hexdigest()
@@ -42,6 +42,11 @@ pagination_object_schema = openapi.Schema(
         "total_items": openapi.Schema(type=openapi.TYPE_INTEGER, example=100),
         "total_pages": openapi.Schema(type=openapi.TYPE_INTEGER, example=10),
         "current_page": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+        "mode": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="'cursor' for cursor pagination, which has no totals or page numbers",
+            example=None,
+        ),
         "page_size": openapi.Schema(type=openapi.TYPE_INTEGER, example=10),
         "next": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, example=None),
         "previous": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, example=None),
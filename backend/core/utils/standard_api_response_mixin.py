@@ -102,6 +102,14 @@ class StandardApiResponseMixin:
                 f"{self.__class__.__name__} must be used with a paginator to call get_paginated_success_response()."
             )
 
+        if hasattr(self.paginator, 'get_pagination_metadata'):
+            # Cursor pagination has no page numbers or totals
+            return self.success_response(
+                message=message,
+                data=data,
+                pagination=self.paginator.get_pagination_metadata(),
+            )
+
         page_obj = self.paginator.page
 
         pagination_data = {
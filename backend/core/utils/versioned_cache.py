@@ -0,0 +1,255 @@
+"""Versioned cache namespaces.
+
+Cached values are stored under keys that embed the current version of their
+scope (for example one customer). Invalidating a scope only replaces its
+version, so every entry written under the previous version becomes
+unreachable at once and simply expires; nothing has to be deleted.
+
+Versions are random tokens rather than counters, so a version evicted from
+the cache is recreated with a new value instead of falling back to one whose
+entries may still be stored.
+
+StaleWhileRevalidateCache keeps one entry per key instead, tagged with the
+version it was computed under, so after a bump the previous value can still
+be served while a single caller recomputes it.
+"""
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+
+
+class VersionedCache:
+    """Cache entries grouped by scope, invalidated by bumping the scope version."""
+
+    def __init__(self, namespace: str, alias_setting: str, timeout: int) -> None:
+        """
+        Args:
+            namespace: Prefix of every key written by this cache.
+            alias_setting: Name of the setting holding the cache alias; the cache
+                is disabled while the setting is unset.
+            timeout: Lifetime in seconds of the cached entries.
+        """
+        self.namespace = namespace
+        self.alias_setting = alias_setting
+        self.timeout = timeout
+
+    @property
+    def backend(self) -> Optional[BaseCache]:
+        """The configured cache backend, or None when the cache is disabled."""
+        alias = getattr(settings, self.alias_setting, None)
+        return caches[alias] if alias else None
+
+    def get(self, scope: Hashable, *parts: Any, version: Optional[str] = None) -> Any:
+        """Return the entry stored for `parts` under the current version of `scope`, or None.
+
+        Args:
+            scope: The scope of the entry.
+            *parts: Identify the entry within the scope.
+            version: Version to read instead of the current one, as returned by version().
+        """
+        backend = self.backend
+        if backend is None:
+            return None
+        return backend.get(self._entry_key(backend, scope, parts, version))
+
+    def set(self, scope: Hashable, *parts: Any, value: Any, version: Optional[str] = None) -> None:
+        """Store `value` for `parts` under the current version of `scope`.
+
+        Pass the version read before computing `value`, so a bump during the
+        computation leaves `value` unreachable instead of filing it under the
+        new version.
+        """
+        backend = self.backend
+        if backend is None:
+            return
+        backend.set(self._entry_key(backend, scope, parts, version), value, self.timeout)
+
+    def bump(self, scopes: Iterable[Hashable]) -> None:
+        """Give each scope a new version once the current transaction commits.
+
+        Bumping before the commit would let a concurrent reader cache the
+        still-visible old rows under the new version.
+
+        Args:
+            scopes: The scopes whose entries are invalidated.
+        """
+        scopes = set(scopes)
+        if not scopes or self.backend is None:
+            return
+        transaction.on_commit(lambda: self._set_versions(scopes))
+
+    def _set_versions(self, scopes: Iterable[Hashable]) -> None:
+        """Replace the versions of `scopes` with new tokens in one round trip."""
+        backend = self.backend
+        if backend is None:
+            return
+        backend.set_many({self._version_key(scope): uuid.uuid4().hex for scope in scopes}, timeout=None)
+
+    def version(self, scope: Hashable) -> Optional[str]:
+        """Current version of `scope`, or None when the cache is disabled."""
+        backend = self.backend
+        return self._version(backend, scope) if backend is not None else None
+
+    def _version(self, backend: BaseCache, scope: Hashable) -> str:
+        """Current version of `scope`, created when missing."""
+        key = self._version_key(scope)
+        version = backend.get(key)
+        if version is None:
+            # add() keeps the version of a concurrent reader that created it first
+            backend.add(key, uuid.uuid4().hex, timeout=None)
+            version = backend.get(key)
+        return version
+
+    def _version_key(self, scope: Hashable) -> str:
+        return f'{self.namespace}:version:{scope}'
+
+    def _entry_key(
+        self,
+        backend: BaseCache,
+        scope: Hashable,
+        parts: Iterable[Any],
+        version: Optional[str] = None,
+    ) -> str:
+        version = version or self._version(backend, scope)
+        return f'{self.namespace}:{scope}:{version}:{self._digest(parts)}'
+
+    @staticmethod
+    def _digest(parts: Iterable[Any]) -> str:
+        # Parts may hold arbitrary text such as URLs, so they are hashed into a safe key
+        return hashlib.sha256(repr(tuple(parts)).encode()).hexdigest()
+
+
+@dataclass
+class CacheLookup:
+    """Outcome of a StaleWhileRevalidateCache lookup.
+
+    Attributes:
+        value: The stored value, or None when nothing is stored.
+        version: Current version of the scope; store a recomputed value under
+            it, so a bump during the computation leaves the value stale.
+        fresh: Whether the value was computed under the current version and
+            is younger than the cache's max age.
+    """
+
+    value: Any = None
+    version: Optional[str] = None
+    fresh: bool = False
+
+
+class StaleWhileRevalidateCache(VersionedCache):
+    """Versioned cache whose entries remain readable, as stale, after a bump.
+
+    Lookups also count hits, stale hits and misses in the cache itself, so
+    every worker contributes to the same hit rate.
+    """
+
+    OUTCOMES = ('hit', 'stale', 'miss')
+
+    def __init__(
+        self,
+        namespace: str,
+        alias_setting: str,
+        timeout: int,
+        max_age: int,
+        refresh_timeout: int,
+    ) -> None:
+        """
+        Args:
+            namespace: Prefix of every key written by this cache.
+            alias_setting: Name of the setting holding the cache alias; the cache
+                is disabled while the setting is unset.
+            timeout: Lifetime in seconds of the stored entries, stale or not.
+            max_age: Age in seconds after which an entry is stale even without a bump.
+            refresh_timeout: Lifetime in seconds of a refresh claim; a refresh that
+                never finishes lets another caller claim it after this delay.
+        """
+        super().__init__(namespace, alias_setting, timeout)
+        self.max_age = max_age
+        self.refresh_timeout = refresh_timeout
+
+    def lookup(self, scope: Hashable, *parts: Any) -> CacheLookup:
+        """Return the entry stored for `parts` in `scope`, with its freshness.
+
+        Args:
+            scope: The scope of the entry.
+            *parts: Identify the entry within the scope.
+
+        Returns:
+            CacheLookup: The value, the current version and whether the value is fresh.
+        """
+        backend = self.backend
+        if backend is None:
+            return CacheLookup()
+
+        version = self._version(backend, scope)
+        entry = backend.get(self._latest_key(scope, parts))
+        if entry is None:
+            self._count(backend, 'miss')
+            return CacheLookup(version=version)
+
+        stored_version, stored_at, value = entry
+        fresh = stored_version == version and time.time() - stored_at < self.max_age
+        self._count(backend, 'hit' if fresh else 'stale')
+        return CacheLookup(value=value, version=version, fresh=fresh)
+
+    def store(self, scope: Hashable, *parts: Any, value: Any, version: Optional[str]) -> None:
+        """Store `value`, computed under `version`, for `parts` in `scope`."""
+        backend = self.backend
+        if backend is None or version is None:
+            return
+        backend.set(self._latest_key(scope, parts), (version, time.time(), value), self.timeout)
+
+    def claim_refresh(self, scope: Hashable, *parts: Any) -> bool:
+        """Claim the recomputation of a stale entry; only one caller at a time gets it."""
+        backend = self.backend
+        if backend is None:
+            return False
+        return backend.add(self._refresh_key(scope, parts), True, self.refresh_timeout)
+
+    def release_refresh(self, scope: Hashable, *parts: Any) -> None:
+        """Release a claim taken with claim_refresh()."""
+        backend = self.backend
+        if backend is not None:
+            backend.delete(self._refresh_key(scope, parts))
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counts since the counters were created, and the share of fresh hits.
+
+        Returns:
+            Dict[str, Any]: Count of each outcome, plus `hit_rate` (fresh hits
+                over all lookups) and `served_rate` (fresh or stale hits over all
+                lookups), or an empty dict when the cache is disabled.
+        """
+        backend = self.backend
+        if backend is None:
+            return {}
+        counts = backend.get_many([self._counter_key(outcome) for outcome in self.OUTCOMES])
+        stats = {outcome: counts.get(self._counter_key(outcome), 0) for outcome in self.OUTCOMES}
+        lookups = sum(stats.values())
+        stats['hit_rate'] = stats['hit'] / lookups if lookups else 0.0
+        stats['served_rate'] = (stats['hit'] + stats['stale']) / lookups if lookups else 0.0
+        return stats
+
+    def _count(self, backend: BaseCache, outcome: str) -> None:
+        key = self._counter_key(outcome)
+        try:
+            backend.incr(key)
+        except ValueError:
+            # Missing counter; add() keeps one created concurrently
+            backend.add(key, 0, timeout=None)
+            backend.incr(key)
+
+    def _latest_key(self, scope: Hashable, parts: Iterable[Any]) -> str:
+        return f'{self.namespace}:{scope}:latest:{self._digest(parts)}'
+
+    def _refresh_key(self, scope: Hashable, parts: Iterable[Any]) -> str:
+        return f'{self.namespace}:{scope}:refresh:{self._digest(parts)}'
+
+    def _counter_key(self, outcome: str) -> str:
+        return f'{self.namespace}:stats:{outcome}'
@@ -1,4 +1,4 @@
-"""Constants for installment filtering options."""
+"""Constants for the installment app."""
 from django.utils.translation import gettext_lazy as _
 
 
@@ -27,3 +27,35 @@ class InstallmentStatusFilters:
         return _("Filter by status: %(filters)s") % {
             "filters": ", ".join(f"'{choice[0]}'" for choice in cls.CHOICES)
         }
+
+
+# Maximum number of rows sent in a single INSERT when generating installments
+INSTALLMENT_BULK_CREATE_BATCH_SIZE = 1000
+
+# Number of computed installment schedules kept in each worker's LRU cache
+INSTALLMENT_SCHEDULE_CACHE_SIZE = 256
+
+# Lifetime in seconds of schedules stored in the optional shared cache
+INSTALLMENT_SCHEDULE_SHARED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Maximum number of installments marked as late per overdue transaction
+OVERDUE_BATCH_SIZE = 5000
+
+# Name of the OverdueScanState row used by the daily overdue scan
+OVERDUE_SCAN_NAME = 'mark_overdue_installments'
+
+# Lease of the overdue scan lock in seconds; a crashed run frees it after this delay
+OVERDUE_SCAN_LOCK_TIMEOUT = 60 * 60
+
+# Number of already processed due dates rescanned by each overdue scan, so that
+# installments inserted with a due date just behind the watermark are still marked late
+OVERDUE_SCAN_OVERLAP_DAYS = 7
+
+# Number of installment plans recomputed or verified per statement by rebuild_plan_progress
+PLAN_PROGRESS_REBUILD_BATCH_SIZE = 1000
+
+# Number of drifted installment plans listed by a progress reconciliation
+PLAN_PROGRESS_DRIFT_SAMPLE_SIZE = 20
+
+# Lifetime in seconds of a cached page of a customer's installment list
+INSTALLMENT_LIST_CACHE_TIMEOUT = 60 * 10
@@ -0,0 +1,101 @@
+"""Measure installment generation throughput for bulk enrollments.
+
+Every run happens inside a transaction that is rolled back, so the command
+can be pointed at any database without leaving data behind.
+
+Usage:
+    python manage.py benchmark_installment_generation --plans 1000 10000 100000
+"""
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+from typing import Any, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from account.models import User
+from installment.constants import INSTALLMENT_BULK_CREATE_BATCH_SIZE
+from installment.models import Installment, InstallmentPlan
+from installment.signals import enable_installment_creation, skip_installment_creation
+from installment.utils.bulk_create import bulk_create_installments
+from plan.models import Plan
+
+
+class Command(BaseCommand):
+    help = "Benchmark bulk installment generation for 1k/10k/100k plans (rolled back)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--plans', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+            help="Number of installment plans to enroll per run.",
+        )
+        parser.add_argument(
+            '--installments', type=int, default=24,
+            help="Number of installments per plan.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=INSTALLMENT_BULK_CREATE_BATCH_SIZE,
+            help="Rows per INSERT statement.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            f"{'plans':>10} {'rows':>12} {'seconds':>10} {'rows/s':>12} {'peak MiB':>10}"
+        )
+        for plan_count in options['plans']:
+            rows, elapsed, peak = self._run(
+                plan_count, options['installments'], options['batch_size']
+            )
+            self.stdout.write(
+                f"{plan_count:>10} {rows:>12} {elapsed:>10.2f} "
+                f"{rows / elapsed:>12.0f} {peak / 2 ** 20:>10.1f}"
+            )
+
+    @staticmethod
+    def _run(plan_count: int, installment_count: int, batch_size: int) -> tuple:
+        """Enroll `plan_count` plans and generate their installments, then roll back.
+
+        Returns:
+            tuple: (rows inserted, seconds spent generating installments, peak traced bytes)
+        """
+        with transaction.atomic():
+            merchant = User.objects.create_user(
+                email='benchmark-merchant@example.com', user_type=User.UserType.MERCHANT
+            )
+            customer = User.objects.create_user(
+                email='benchmark-customer@example.com', user_type=User.UserType.CUSTOMER
+            )
+            plan = Plan.objects.create(
+                merchant=merchant,
+                name='Benchmark Plan',
+                total_amount=Decimal('1000.00'),
+                installment_count=installment_count,
+                installment_period=30,
+                status=Plan.Status.ACTIVE,
+            )
+
+            skip_installment_creation()
+            try:
+                installment_plans: List[InstallmentPlan] = InstallmentPlan.objects.bulk_create(
+                    (
+                        InstallmentPlan(plan=plan, customer=customer, start_date=date.today())
+                        for _ in range(plan_count)
+                    ),
+                    batch_size=batch_size,
+                )
+            finally:
+                enable_installment_creation()
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            bulk_create_installments(installment_plans, batch_size=batch_size)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            rows = Installment.objects.filter(installment_plan__plan=plan).count()
+            transaction.set_rollback(True)
+
+        return rows, elapsed, peak
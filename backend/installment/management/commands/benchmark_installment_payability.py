@@ -0,0 +1,160 @@
+"""Compare the `is_payable` annotation before and after `next_payable_sequence`.
+
+The legacy query decides payability with a correlated EXISTS over earlier
+unpaid installments of the same plan, evaluated once per listed row. The
+current query compares the sequence number with the plan's denormalized
+`next_payable_sequence`, which is read from the already joined plan row.
+
+A customer with many installment plans is seeded inside a transaction that
+is rolled back, so the command can be pointed at any database without
+leaving data behind.
+
+Usage:
+    python manage.py benchmark_installment_payability --plans 50 --installments 24 --repeat 20
+"""
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import BooleanField, Case, Exists, OuterRef, Q, QuerySet, Value, When
+
+from account.models import User
+from installment.models import Installment, InstallmentPlan
+from installment.services.progress import refresh_plan_progress
+from installment.services.retrieval import InstallmentRetrievalService
+from installment.signals import enable_installment_creation, skip_installment_creation
+from installment.utils.bulk_create import bulk_create_installments
+from plan.models import Plan
+
+
+def legacy_customer_installments(customer: User) -> QuerySet:
+    """The listing query as it was before `next_payable_sequence` existed."""
+    previous_unpaid = Installment.objects.filter(
+        installment_plan=OuterRef('installment_plan'),
+        sequence_number__lt=OuterRef('sequence_number'),
+        status__in=[
+            Installment.Status.PENDING,
+            Installment.Status.LATE,
+            Installment.Status.FAILED,
+        ]
+    )
+    return Installment.objects.filter(
+        installment_plan__customer=customer
+    ).select_related(
+        "installment_plan", "installment_plan__plan"
+    ).annotate(
+        is_payable=Case(
+            When(status=Installment.Status.PAID, then=Value(False)),
+            When(~Q(installment_plan__status=InstallmentPlan.Status.ACTIVE), then=Value(False)),
+            When(Exists(previous_unpaid), then=Value(False)),
+            default=Value(True),
+            output_field=BooleanField()
+        )
+    ).order_by("-installment_plan__id", "sequence_number")
+
+
+class Command(BaseCommand):
+    help = "Benchmark the EXISTS-based is_payable annotation against next_payable_sequence (rolled back)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--plans', type=int, default=50,
+            help="Number of installment plans of the seeded customer.",
+        )
+        parser.add_argument(
+            '--installments', type=int, default=24,
+            help="Number of installments per plan.",
+        )
+        parser.add_argument(
+            '--paid', type=int, default=6,
+            help="Number of leading installments paid in every plan.",
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help="Number of timed evaluations per query.",
+        )
+        parser.add_argument(
+            '--skip-explain', action='store_true',
+            help="Do not print the query plans.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            customer = self._seed(options['plans'], options['installments'], options['paid'])
+            queries = {
+                'exists': lambda: legacy_customer_installments(customer),
+                'denormalized': lambda: InstallmentRetrievalService(customer).get_customer_installments(),
+            }
+
+            legacy_rows = list(queries['exists']().values_list('id', 'is_payable'))
+            current_rows = list(queries['denormalized']().values_list('id', 'is_payable'))
+            if legacy_rows != current_rows:
+                self.stderr.write("The two queries disagree on is_payable.")
+
+            if not options['skip_explain']:
+                for name, build in queries.items():
+                    self.stdout.write(f"--- {name} ---")
+                    self.stdout.write(build().explain())
+
+            self.stdout.write(f"{'query':>14} {'rows':>8} {'mean ms':>10} {'median ms':>10}")
+            for name, build in queries.items():
+                timings = self._time(build, options['repeat'])
+                self.stdout.write(
+                    f"{name:>14} {len(current_rows):>8} "
+                    f"{statistics.mean(timings):>10.2f} {statistics.median(timings):>10.2f}"
+                )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _seed(plan_count: int, installment_count: int, paid_count: int) -> User:
+        """Create a customer with `plan_count` plans whose first `paid_count` installments are paid."""
+        merchant = User.objects.create_user(
+            email='benchmark-merchant@example.com', user_type=User.UserType.MERCHANT
+        )
+        customer = User.objects.create_user(
+            email='benchmark-customer@example.com', user_type=User.UserType.CUSTOMER
+        )
+        plan = Plan.objects.create(
+            merchant=merchant,
+            name='Benchmark Plan',
+            total_amount=Decimal('1000.00'),
+            installment_count=installment_count,
+            installment_period=30,
+            status=Plan.Status.ACTIVE,
+        )
+
+        skip_installment_creation()
+        try:
+            installment_plans: List[InstallmentPlan] = InstallmentPlan.objects.bulk_create(
+                InstallmentPlan(plan=plan, customer=customer, start_date=date.today())
+                for _ in range(plan_count)
+            )
+        finally:
+            enable_installment_creation()
+
+        bulk_create_installments(installment_plans)
+        Installment.objects.filter(
+            installment_plan__in=installment_plans,
+            sequence_number__lte=paid_count,
+        ).update(status=Installment.Status.PAID)
+        refresh_plan_progress(installment_plan.id for installment_plan in installment_plans)
+        return customer
+
+    @staticmethod
+    def _time(build: Callable[[], QuerySet], repeat: int) -> List[float]:
+        """Fetch the annotated rows `repeat` times and return the durations in milliseconds.
+
+        Only ids and `is_payable` are fetched, so model instantiation does not
+        hide the difference between the two queries.
+        """
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(build().values_list('id', 'is_payable'))
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
@@ -0,0 +1,231 @@
+"""Show query plans and latencies of the hot queries with and without their indexes.
+
+A dataset of merchants, customers, installment plans and installments
+(millions of rows with the defaults) is loaded with the bulk loader, which
+uses COPY on PostgreSQL, committed and vacuumed so the tables look like a
+settled production database. Every query shape is warmed up, explained and
+timed with the composite and partial indexes in place. The indexes are then
+dropped inside a transaction that is rolled back, and the same queries are
+explained and timed again. The seeded rows are deleted at the end unless
+--keep is given; run the command against a disposable database.
+
+Usage:
+    python manage.py benchmark_query_indexes --customers 20000 --plans-per-customer 5 --installments 24
+"""
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import cycle, islice
+from typing import Any, Callable, Dict
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+
+from account.models import User
+from installment.models import Installment, InstallmentPlan
+from installment.utils.bulk_load import bulk_load_installment_plans
+from notification.services.reminder_schedule import get_due_reminders
+from plan.models import Plan
+from plan.services.plan_queryset import InstallmentPlanQueryService
+
+# Indexes added for the query shapes below; dropped for the "before" measurements
+BENCHMARKED_INDEXES = {
+    Installment: ['inst_plan_status_seq_idx', 'inst_pending_due_date_idx'],
+    InstallmentPlan: ['instplan_cust_status_ct_idx', 'instplan_plan_status_idx'],
+}
+
+
+class Command(BaseCommand):
+    help = "Explain and time the hot queries before and after the composite/partial indexes (rolled back)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--merchants', type=int, default=20,
+            help="Number of merchants; each owns the same number of plan templates.",
+        )
+        parser.add_argument(
+            '--customers', type=int, default=20_000,
+            help="Number of customers.",
+        )
+        parser.add_argument(
+            '--plans-per-customer', type=int, default=5,
+            help="Installment plans enrolled per customer.",
+        )
+        parser.add_argument(
+            '--installments', type=int, default=24,
+            help="Installments per plan.",
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=10,
+            help="Number of timed evaluations per query.",
+        )
+        parser.add_argument(
+            '--skip-explain', action='store_true',
+            help="Only print latencies.",
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help="Keep the seeded rows instead of deleting them at the end.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        started = time.perf_counter()
+        with transaction.atomic():
+            merchant, customer = self._seed(options)
+        self.stdout.write(
+            f"Seeded {InstallmentPlan.objects.count()} installment plans and "
+            f"{Installment.objects.count()} installments in {time.perf_counter() - started:.1f}s"
+        )
+
+        try:
+            self._analyze(vacuum=True)
+            queries = self._queries(merchant, customer)
+            after = self._measure(queries, options, label='with indexes')
+
+            with transaction.atomic():
+                self._drop_indexes()
+                self._analyze()
+                before = self._measure(queries, options, label='without indexes')
+                transaction.set_rollback(True)
+        finally:
+            if not options['keep']:
+                self._tear_down()
+
+        self.stdout.write(f"\n{'query':>18} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+        for name in queries:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            self.stdout.write(f"{name:>18} {before[name]:>10.2f} {after[name]:>10.2f} {speedup:>7.1f}x")
+
+    @staticmethod
+    def _queries(merchant: User, customer: User) -> Dict[str, Callable[[], QuerySet]]:
+        """The query shapes served by the new indexes."""
+        today = date.today()
+        installment_plan_id = InstallmentPlan.objects.filter(customer=customer).values_list('pk', flat=True)[0]
+        return {
+            # next_installment_expressions(): first unpaid installment of a plan
+            'next_payable': lambda: (
+                Installment.objects
+                .filter(installment_plan_id=installment_plan_id)
+                .exclude(status=Installment.Status.PAID)
+                .order_by('sequence_number')
+                .values('sequence_number')[:1]
+            ),
+            # mark_overdue_installments(): one keyset batch of overdue installments
+            'overdue_batch': lambda: (
+                Installment.objects
+                .filter(due_date__lt=today, status=Installment.Status.PENDING)
+                .order_by('due_date', 'id')
+                .values_list('due_date', 'id')[:5000]
+            ),
+            'due_reminders': lambda: get_due_reminders(today),
+            # MerchantDashboardService: the merchant's paid installments; aggregates drop the ordering
+            'dashboard_paid': lambda: (
+                Installment.objects
+                .filter(installment_plan__plan__merchant=merchant, status=Installment.Status.PAID)
+                .order_by()
+                .values('amount')
+            ),
+            'dashboard_plans': lambda: InstallmentPlan.objects.filter(
+                plan__merchant=merchant, status=InstallmentPlan.Status.ACTIVE,
+            ).order_by().values('pk'),
+            'customer_plans': lambda: InstallmentPlanQueryService.get_plans_for_user(customer)[:10],
+        }
+
+    def _measure(self, queries: Dict[str, Callable[[], QuerySet]], options: Dict[str, Any], label: str) -> Dict[str, float]:
+        """Explain each query once, then return its median latency in milliseconds.
+
+        Each query is evaluated once before timing so every run reads warm pages.
+        """
+        explain_options = {'analyze': True} if connection.vendor == 'postgresql' else {}
+        medians = {}
+        for name, build in queries.items():
+            list(build())
+            if not options['skip_explain']:
+                self.stdout.write(f"\n--- {name} ({label}) ---")
+                self.stdout.write(build().explain(**explain_options))
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - started) * 1000)
+            medians[name] = statistics.median(timings)
+        return medians
+
+    @staticmethod
+    def _seed(options: Dict[str, Any]) -> tuple:
+        """Load the dataset and return one merchant and one customer to query for."""
+        merchants = User.objects.bulk_create(
+            User(email=f'benchmark-merchant-{index}@example.com', user_type=User.UserType.MERCHANT)
+            for index in range(options['merchants'])
+        )
+        customers = User.objects.bulk_create(
+            (
+                User(email=f'benchmark-customer-{index}@example.com', user_type=User.UserType.CUSTOMER)
+                for index in range(options['customers'])
+            ),
+            batch_size=5000,
+        )
+        templates = [
+            Plan.objects.create(
+                merchant=merchant,
+                name=f'Benchmark Plan {index}',
+                total_amount=Decimal('1200.00'),
+                installment_count=options['installments'],
+                installment_period=30,
+                status=Plan.Status.ACTIVE,
+            )
+            for index, merchant in enumerate(islice(cycle(merchants), options['plans_per_customer']))
+        ]
+
+        # Spread start dates so installments are paid, overdue, due today and upcoming
+        today = date.today()
+        span = options['installments'] * 30
+        for round_index, template in enumerate(templates):
+            for offset in range(0, len(customers), 1000):
+                chunk = customers[offset:offset + 1000]
+                start_date = today - timedelta(days=(offset // 1000 * 37 + round_index * 91) % span)
+                bulk_load_installment_plans(plan=template, customers=chunk, start_date=start_date)
+
+        # Most seeded installments due before today are paid; every tenth one is late
+        past_due = Installment.objects.filter(
+            installment_plan__customer__email__startswith='benchmark-',
+            due_date__lt=today,
+        )
+        past_due.update(status=Installment.Status.PAID)
+        past_due.alias(bucket=F('id') % 10).filter(bucket=0).update(
+            status=Installment.Status.LATE, paid_at=None,
+        )
+        return merchants[0], customers[0]
+
+    @staticmethod
+    def _drop_indexes() -> None:
+        """Drop the benchmarked indexes; the enclosing rollback restores them."""
+        with connection.cursor() as cursor:
+            for model, names in BENCHMARKED_INDEXES.items():
+                for name in names:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+
+    @staticmethod
+    def _analyze(vacuum: bool = False) -> None:
+        """Refresh planner statistics so plans reflect the seeded data.
+
+        Args:
+            vacuum: Also vacuum the tables (PostgreSQL only, outside a transaction),
+                which clears the dead rows left by the seeding updates.
+        """
+        command = 'VACUUM ANALYZE' if vacuum and connection.vendor == 'postgresql' else 'ANALYZE'
+        with connection.cursor() as cursor:
+            for model in BENCHMARKED_INDEXES:
+                cursor.execute(f"{command} {connection.ops.quote_name(model._meta.db_table)}")
+
+    @staticmethod
+    def _tear_down() -> None:
+        """Delete the seeded rows, installments and plans without loading them first."""
+        users = User.objects.filter(email__startswith='benchmark-')
+        installment_plans = InstallmentPlan.objects.filter(customer__in=users)
+        Installment.objects.filter(installment_plan__in=installment_plans)._raw_delete(using=connection.alias)
+        installment_plans._raw_delete(using=connection.alias)
+        Plan.objects.filter(merchant__in=users).delete()
+        users.delete()
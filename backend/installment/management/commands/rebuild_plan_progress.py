@@ -0,0 +1,70 @@
+"""Rebuild or verify the progress fields denormalized onto InstallmentPlan.
+
+Installment plans are walked in ascending id order, `--batch-size` at a
+time. Without options every batch is recomputed in its own transaction, and
+fully paid active plans are completed. With `--verify` nothing is written:
+the stored values and statuses are compared with values computed from the
+installments, and the command fails when any plan has drifted, so it can
+run as a periodic consistency check. `--verify --repair` repairs only the
+drifted plans.
+
+Usage:
+    python manage.py rebuild_plan_progress
+    python manage.py rebuild_plan_progress --verify
+    python manage.py rebuild_plan_progress --verify --repair
+"""
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from installment.constants import PLAN_PROGRESS_REBUILD_BATCH_SIZE
+from installment.services.progress import plan_id_batches, reconcile_plan_progress, repair_plan_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized progress of installment plans, or verify it with --verify."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--verify', action='store_true',
+            help="Only report installment plans whose stored progress differs from their installments.",
+        )
+        parser.add_argument(
+            '--repair', action='store_true',
+            help="With --verify, repair the drifted installment plans instead of failing.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=PLAN_PROGRESS_REBUILD_BATCH_SIZE,
+            help="Installment plans per statement.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['verify']:
+            self._verify(options['batch_size'], options['repair'])
+        else:
+            self._rebuild(options['batch_size'])
+
+    def _rebuild(self, batch_size: int) -> None:
+        updated = 0
+        for ids in plan_id_batches(batch_size):
+            with transaction.atomic():
+                updated += repair_plan_progress(ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt progress of {updated} installment plans."))
+
+    def _verify(self, batch_size: int, repair: bool) -> None:
+        result = reconcile_plan_progress(repair=repair, batch_size=batch_size)
+        for pk, drifted in result.sample.items():
+            self.stdout.write(f"Installment plan {pk}: {', '.join(drifted)}")
+
+        if result.drifted and not repair:
+            raise CommandError(
+                f"{result.drifted} of {result.checked} installment plans have stale progress; "
+                f"run rebuild_plan_progress to repair them."
+            )
+        if result.drifted:
+            self.stdout.write(self.style.WARNING(
+                f"Repaired {result.repaired} of {result.checked} installment plans with stale progress."
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Progress of {result.checked} installment plans is consistent."))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('installment', '0002_alter_installment_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OverdueScanState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Timestamp when this record was created.', verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when this record was last updated.', verbose_name='updated at')),
+                ('name', models.CharField(help_text='Identifier of the scan this state belongs to.', max_length=64, unique=True, verbose_name='name')),
+                ('last_processed_due_date', models.DateField(blank=True, help_text='Latest due date fully processed by a successful run.', null=True, verbose_name='last processed due date')),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Lease expiry of the run in progress, if any.', null=True, verbose_name='locked until')),
+            ],
+            options={
+                'verbose_name': 'overdue scan state',
+                'verbose_name_plural': 'overdue scan states',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def remove_duplicate_overdue_task(apps, schema_editor):
+    """Delete the beat entry that ran the overdue scan a second time at midnight."""
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTask.objects.filter(name='update-overdue-status').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('installment', '0003_overdue_scan_state'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_overdue_task, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:36
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_next_payable_sequence(apps, schema_editor):
+    """Set the first unpaid sequence number of every existing installment plan."""
+    Installment = apps.get_model('installment', 'Installment')
+    InstallmentPlan = apps.get_model('installment', 'InstallmentPlan')
+
+    unpaid = Installment.objects.filter(installment_plan=OuterRef('pk')).exclude(status='paid')
+    InstallmentPlan.objects.update(
+        next_payable_sequence=Subquery(unpaid.order_by('sequence_number').values('sequence_number')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('installment', '0004_remove_duplicate_overdue_beat_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='installmentplan',
+            name='next_payable_sequence',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Sequence number of the first unpaid installment; empty when none is unpaid.', null=True, verbose_name='next payable installment number'),
+        ),
+        migrations.RunPython(populate_next_payable_sequence, migrations.RunPython.noop),
+    ]
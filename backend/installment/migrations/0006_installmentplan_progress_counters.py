@@ -0,0 +1,73 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:39
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_progress_counters(apps, schema_editor):
+    """Compute the progress counters of every existing installment plan."""
+    Installment = apps.get_model('installment', 'Installment')
+    InstallmentPlan = apps.get_model('installment', 'InstallmentPlan')
+
+    installments = Installment.objects.filter(installment_plan=OuterRef('pk')).order_by()
+    unpaid = installments.exclude(status='paid')
+
+    def aggregate(queryset, expression, output_field):
+        return Subquery(
+            queryset.values('installment_plan').annotate(value=expression).values('value'),
+            output_field=output_field,
+        )
+
+    InstallmentPlan.objects.update(
+        paid_count=Coalesce(
+            aggregate(installments.filter(status='paid'), Count('pk'), models.PositiveSmallIntegerField()),
+            Value(0),
+        ),
+        total_count=Coalesce(
+            aggregate(installments, Count('pk'), models.PositiveSmallIntegerField()),
+            Value(0),
+        ),
+        next_due_date=Subquery(
+            installments.filter(status='pending').order_by('due_date').values('due_date')[:1]
+        ),
+        outstanding_amount=Coalesce(
+            aggregate(unpaid, Sum('amount'), models.DecimalField(max_digits=12, decimal_places=2)),
+            Value(Decimal('0.00')),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('installment', '0005_installmentplan_next_payable_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='installmentplan',
+            name='next_due_date',
+            field=models.DateField(blank=True, editable=False, help_text='Earliest due date of the pending installments; empty when none is pending.', null=True, verbose_name='next due date'),
+        ),
+        migrations.AddField(
+            model_name='installmentplan',
+            name='outstanding_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Sum of the amounts of the unpaid installments.', max_digits=12, verbose_name='outstanding amount'),
+        ),
+        migrations.AddField(
+            model_name='installmentplan',
+            name='paid_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Number of paid installments.', verbose_name='paid installments'),
+        ),
+        migrations.AddField(
+            model_name='installmentplan',
+            name='total_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Number of installments in the plan.', verbose_name='total installments'),
+        ),
+        migrations.RunPython(populate_progress_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('installment', '0006_installmentplan_progress_counters'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='installment',
+            index=models.Index(fields=['installment_plan', 'status', 'sequence_number'], name='inst_plan_status_seq_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='installment',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['due_date', 'id'], name='inst_pending_due_date_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='installmentplan',
+            index=models.Index(fields=['customer', 'status', '-created_at'], name='instplan_cust_status_ct_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='installmentplan',
+            index=models.Index(fields=['plan', 'status'], name='instplan_plan_status_idx'),
+        ),
+    ]
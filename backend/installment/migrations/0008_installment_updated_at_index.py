@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('installment', '0007_query_shape_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='installment',
+            index=models.Index(fields=['updated_at'], name='inst_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-17 11:05
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('installment', '0008_installment_updated_at_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='installment',
+            index=models.Index(fields=['due_date'], name='inst_due_date_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='installment',
+            index=models.Index(condition=models.Q(('status', 'paid')), fields=['paid_at'], name='inst_paid_at_idx'),
+        ),
+    ]
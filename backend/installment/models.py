@@ -1,4 +1,5 @@
 from datetime import date
+from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
@@ -54,15 +55,79 @@ class InstallmentPlan(AbstractTimestampedModel):
         default=Status.ACTIVE,
         help_text=_('Current lifecycle status of the installment plan.'),
     )
+    next_payable_sequence = models.PositiveSmallIntegerField(
+        _('next payable installment number'),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Sequence number of the first unpaid installment; empty when none is unpaid.'),
+    )
+    paid_count = models.PositiveSmallIntegerField(
+        _('paid installments'),
+        default=0,
+        editable=False,
+        help_text=_('Number of paid installments.'),
+    )
+    total_count = models.PositiveSmallIntegerField(
+        _('total installments'),
+        default=0,
+        editable=False,
+        help_text=_('Number of installments in the plan.'),
+    )
+    next_due_date = models.DateField(
+        _('next due date'),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Earliest due date of the pending installments; empty when none is pending.'),
+    )
+    outstanding_amount = models.DecimalField(
+        _('outstanding amount'),
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text=_('Sum of the amounts of the unpaid installments.'),
+    )
+
+    # Plans whose next unpaid installment can be paid; a defaulted plan becomes
+    # active again once its late installments are paid
+    PAYABLE_STATUSES = (Status.ACTIVE, Status.DEFAULTED)
+
+    # Denormalized from the installments (see installment.services.progress): recomputed for new
+    # plans and repairs, shifted by each installment write otherwise.
+    # Saving an existing instance never writes them, so stale in-memory values cannot overwrite them.
+    PROGRESS_FIELDS = (
+        'next_payable_sequence',
+        'paid_count',
+        'total_count',
+        'next_due_date',
+        'outstanding_amount',
+    )
 
     def __str__(self) -> str:
         """Return a readable identifier for the installment plan."""
         return f"Installment Plan #{self.id}"
 
+    def save(self, *args, **kwargs):
+        """Override save to leave the denormalized progress fields untouched on updates."""
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.PROGRESS_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _('installment plan')
         verbose_name_plural = _('installment plans')
         ordering = ['-created_at']
+        indexes = [
+            # Customer plan listing: filtered by customer and status, newest first
+            models.Index(fields=['customer', 'status', '-created_at'], name='instplan_cust_status_ct_idx'),
+            # Merchant dashboard: plans of the merchant's templates by status
+            models.Index(fields=['plan', 'status'], name='instplan_plan_status_idx'),
+        ]
 
 
 class Installment(AbstractTimestampedModel):
@@ -110,10 +175,23 @@ class Installment(AbstractTimestampedModel):
         help_text=_('Timestamp when the installment was paid.'),
     )
 
+    # Fields a save applies to the progress of the plan (see installment.services.progress)
+    PROGRESS_STATE_FIELDS = ('installment_plan_id', 'status', 'amount', 'due_date', 'sequence_number')
+
     def __str__(self) -> str:
         """Return a readable identifier for the installment."""
         return f"Installment #{self.sequence_number}"
 
+    def current_progress_state(self) -> tuple:
+        """Plan, status, amount, due date and sequence number of the installment."""
+        return (
+            self.installment_plan_id,
+            self.status,
+            Decimal(str(self.amount)),
+            self.due_date,
+            self.sequence_number,
+        )
+
     def clean(self):
         """Validate the installment amount."""
         if self.amount <= 0:
@@ -145,3 +223,55 @@ class Installment(AbstractTimestampedModel):
                 name='unique_due_date_per_plan',
             ),
         ]
+        indexes = [
+            # Payability and progress: unpaid or paid installments of a plan by sequence number;
+            # also serves the dashboard's per-plan status filters
+            models.Index(fields=['installment_plan', 'status', 'sequence_number'], name='inst_plan_status_seq_idx'),
+            # Overdue scan (keyset over due date, id) and reminders only look at pending installments
+            models.Index(
+                fields=['due_date', 'id'],
+                condition=models.Q(status='pending'),
+                name='inst_pending_due_date_idx',
+            ),
+            # Merchant metrics rollup: installments changed since its previous run
+            models.Index(fields=['updated_at'], name='inst_updated_at_idx'),
+            # Merchant metrics rollup and time series: installments due or paid on given days
+            models.Index(fields=['due_date'], name='inst_due_date_idx'),
+            models.Index(fields=['paid_at'], condition=models.Q(status='paid'), name='inst_paid_at_idx'),
+        ]
+
+
+class OverdueScanState(AbstractTimestampedModel):
+    """Watermark and lock of the periodic overdue scan.
+
+    A single row is kept per scan. `last_processed_due_date` is the latest due
+    date whose installments were fully processed, so the next run only looks
+    at later due dates. `locked_until` is a lease taken by the running scan.
+    """
+
+    name = models.CharField(
+        _('name'),
+        max_length=64,
+        unique=True,
+        help_text=_('Identifier of the scan this state belongs to.'),
+    )
+    last_processed_due_date = models.DateField(
+        _('last processed due date'),
+        null=True,
+        blank=True,
+        help_text=_('Latest due date fully processed by a successful run.'),
+    )
+    locked_until = models.DateTimeField(
+        _('locked until'),
+        null=True,
+        blank=True,
+        help_text=_('Lease expiry of the run in progress, if any.'),
+    )
+
+    def __str__(self) -> str:
+        """Return a readable identifier for the scan state."""
+        return f"Overdue scan '{self.name}'"
+
+    class Meta:
+        verbose_name = _('overdue scan state')
+        verbose_name_plural = _('overdue scan states')
@@ -1,11 +1,13 @@
 """Serializers for installment related models."""
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from installment.constants import InstallmentStatusFilters
 from installment.models import Installment, InstallmentPlan
 from installment.services.retrieval import InstallmentRetrievalService
+from plan.constants import MAX_INSTALLMENT_COUNT
 
 
 class BaseInstallmentSerializer(serializers.ModelSerializer):
@@ -36,6 +38,47 @@ class InstallmentFilterSerializer(serializers.Serializer):
     )
 
 
+class InstallmentBulkPaymentSerializer(serializers.Serializer):
+    """Serializer for validating a bulk payment request.
+
+    Either `installment_ids`, or `installment_plan_id` together with
+    `through_sequence`, must be given.
+    """
+
+    installment_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        min_length=1,
+        max_length=MAX_INSTALLMENT_COUNT,
+        help_text=_("Ids of the installments to pay, all from the same installment plan"),
+    )
+    installment_plan_id = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        help_text=_("Installment plan to pay, together with through_sequence"),
+    )
+    through_sequence = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_INSTALLMENT_COUNT,
+        help_text=_("Pay every unpaid installment of the plan up to this sequence number"),
+    )
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure exactly one way of selecting the installments is used."""
+        by_ids = 'installment_ids' in attrs
+        through = 'installment_plan_id' in attrs or 'through_sequence' in attrs
+        if by_ids == through:
+            raise serializers.ValidationError(
+                _("Provide either installment_ids, or installment_plan_id and through_sequence.")
+            )
+        if through and not ('installment_plan_id' in attrs and 'through_sequence' in attrs):
+            raise serializers.ValidationError(
+                _("installment_plan_id and through_sequence must be provided together.")
+            )
+        return attrs
+
+
 class CustomerFacingInstallmentSerializer(BaseInstallmentSerializer):
     """Serializer for listing installments along
     with payment eligibility flag, subscription and template plan details.
@@ -0,0 +1,73 @@
+"""Per-customer cache of the serialized installment list.
+
+Customers poll their installment list far more often than it changes, and
+it only changes on payment, overdue marking or enrollment. Each page of the
+list (one per status filter, page and page size) is cached under the
+customer's version, which those three operations bump, so a stale page is
+never served and no entry has to be deleted.
+
+The cache is enabled by pointing ``INSTALLMENT_LIST_CACHE`` at a cache alias
+shared by every worker.
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.utils.translation import get_language
+from rest_framework.request import Request
+
+from core.utils.versioned_cache import VersionedCache
+from installment.constants import INSTALLMENT_LIST_CACHE_TIMEOUT
+
+installment_list_cache = VersionedCache(
+    namespace='installment-list',
+    alias_setting='INSTALLMENT_LIST_CACHE',
+    timeout=INSTALLMENT_LIST_CACHE_TIMEOUT,
+)
+
+
+def get_cached_installment_list(request: Request) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Return the cached response body of an installment list request, if any.
+
+    Args:
+        request: The list request of an authenticated customer.
+
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Optional[str]]: The response body, or None
+            on a miss, and the customer's version to pass to cache_installment_list().
+    """
+    # Read before the page is computed, so a bump in between leaves the page unreachable
+    version = installment_list_cache.version(request.user.pk)
+    return installment_list_cache.get(request.user.pk, *_request_parts(request), version=version), version
+
+
+def cache_installment_list(request: Request, body: Dict[str, Any], version: Optional[str]) -> None:
+    """Store the response body of an installment list request.
+
+    Args:
+        request: The list request of an authenticated customer.
+        body: The response body, including the pagination block.
+        version: The version returned by get_cached_installment_list() before computing `body`.
+    """
+    installment_list_cache.set(request.user.pk, *_request_parts(request), value=body, version=version)
+
+
+def invalidate_customer_installments(customer_ids: Iterable[int]) -> None:
+    """Make the cached installment lists of the given customers unreachable.
+
+    The versions are bumped when the current transaction commits.
+
+    Args:
+        customer_ids: Ids of the customers whose installments changed.
+    """
+    installment_list_cache.bump(customer_ids)
+
+
+def _request_parts(request: Request) -> tuple:
+    """Key parts of a list request.
+
+    The absolute URL carries the status filter, pagination mode, page or cursor
+    and page size, plus the host used in the pagination links. The date is
+    included because the upcoming/past split moves at midnight, and the
+    language because the response message is translated.
+    """
+    return request.build_absolute_uri(), date.today().isoformat(), get_language()
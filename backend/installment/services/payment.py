@@ -1,8 +1,238 @@
+"""Service layer for installment payments."""
+from typing import List, NoReturn, Optional, Sequence
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Subquery
 from django.utils import timezone
-from installment.models import Installment
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+
+from analytics.services.invalidation import invalidate_merchant_analytics
+from core.exceptions import BusinessException
+from core.logging.logger import get_logger
+from installment.models import Installment, InstallmentPlan
+from installment.services.list_cache import invalidate_customer_installments
+from installment.services.progress import progress_delta_expressions
+from installment.services.retrieval import InstallmentRetrievalService
+
+User = get_user_model()
+logger = get_logger(__name__)
+
 
 def process_installment_payment(installment: Installment) -> Installment:
-    installment.status = Installment.Status.PAID
-    installment.paid_at = timezone.now()
-    installment.save(update_fields=["status", "paid_at"])
+    """Validate and pay an installment while its installment plan is locked.
+
+    The installment and its plan are re-read with ``SELECT ... FOR UPDATE``,
+    so concurrent payments of the same plan are serialized and each one is
+    validated against the committed state left by the previous one: an
+    installment can never be paid twice, nor out of order.
+
+    The payment then takes two more statements: an UPDATE of the installment
+    and a single UPDATE shifting the plan progress counters, which
+    also completes the plan when the last installment is paid. Neither goes
+    through save(), so no post_save receivers run.
+
+    Args:
+        installment: The installment to pay; only its id is used.
+
+    Returns:
+        Installment: The paid installment, with its plan, customer and template loaded.
+
+    Raises:
+        BusinessException: If the installment is already paid, its plan is
+            completed, or an earlier installment is still unpaid.
+    """
+    with transaction.atomic():
+        installment = (
+            Installment.objects
+            .select_related('installment_plan__customer', 'installment_plan__plan')
+            .select_for_update(of=('self', 'installment_plan'))
+            .get(pk=installment.pk)
+        )
+        installment_plan = installment.installment_plan
+        InstallmentRetrievalService(
+            customer=installment_plan.customer,
+            raise_validation_errors=True,
+        ).validate_installment_payment(installment)
+
+        _settle_installments(installment_plan, [installment])
+
+    logger.info(
+        "installment_paid",
+        operation="installment_payment",
+        user_id=installment_plan.customer_id,
+        installment_id=installment.pk,
+        installment_plan_id=installment_plan.pk,
+        installment_plan_completed=installment_plan.status == InstallmentPlan.Status.COMPLETED,
+    )
     return installment
+
+
+def process_bulk_installment_payment(
+    customer: User,
+    installment_ids: Optional[Sequence[int]] = None,
+    installment_plan_id: Optional[int] = None,
+    through_sequence: Optional[int] = None,
+) -> List[Installment]:
+    """Pay several installments of one installment plan in a single transaction.
+
+    The installments are given either as a list of ids, or as an installment
+    plan and the last sequence number to pay ("pay through sequence N"). In
+    both cases the paid installments must be exactly the next unpaid ones of
+    the plan, in order, so payments can never skip an installment.
+
+    The plan row is locked first, the targeted installments are read and
+    validated with one query, all of them are paid with one UPDATE, and the
+    plan progress (and completion) is updated once.
+
+    Args:
+        customer: The customer paying; installments of other customers are not found.
+        installment_ids: Ids of the installments to pay.
+        installment_plan_id: Installment plan to pay, with `through_sequence`.
+        through_sequence: Last sequence number to pay, with `installment_plan_id`.
+
+    Returns:
+        List[Installment]: The paid installments, ordered by sequence number.
+
+    Raises:
+        BusinessException: If the installments cannot be found in one plan of
+            the customer, are already paid, skip an unpaid installment, or the
+            plan is completed.
+    """
+    if installment_ids is not None:
+        installment_ids = set(installment_ids)
+        plan_lookup = {
+            'pk': Subquery(
+                Installment.objects.filter(pk__in=installment_ids).values('installment_plan_id')[:1]
+            ),
+        }
+    else:
+        plan_lookup = {'pk': installment_plan_id}
+
+    with transaction.atomic():
+        try:
+            installment_plan = (
+                InstallmentPlan.objects
+                .select_related('customer', 'plan')
+                .select_for_update(of=('self',))
+                .get(customer=customer, **plan_lookup)
+            )
+        except InstallmentPlan.DoesNotExist:
+            _raise_not_found(customer)
+
+        if installment_ids is not None:
+            targeted = installment_plan.installments.filter(pk__in=installment_ids)
+        else:
+            targeted = installment_plan.installments.filter(sequence_number__lte=through_sequence).exclude(
+                status=Installment.Status.PAID,
+            )
+        installments = list(targeted.order_by('sequence_number'))
+        if installment_ids is not None and len(installments) != len(installment_ids):
+            # Some ids are missing, belong to another customer or to another plan
+            _raise_not_found(customer)
+
+        _validate_bulk_payment(installment_plan, installments)
+        _settle_installments(installment_plan, installments)
+
+    logger.info(
+        "installments_paid",
+        operation="bulk_installment_payment",
+        user_id=customer.id,
+        installment_plan_id=installment_plan.pk,
+        installment_ids=[installment.pk for installment in installments],
+        installment_plan_completed=installment_plan.status == InstallmentPlan.Status.COMPLETED,
+    )
+    return installments
+
+
+def _validate_bulk_payment(installment_plan: InstallmentPlan, installments: List[Installment]) -> None:
+    """Check that `installments` are the next unpaid installments of the locked plan, in order.
+
+    Raises:
+        BusinessException: If the plan is completed, nothing is left to pay, or
+            the installments do not start at the next payable one without gaps.
+    """
+    retrieval = InstallmentRetrievalService(customer=installment_plan.customer, raise_validation_errors=True)
+    if not installments:
+        # "Pay through N" with every installment up to N already paid
+        logger.error(
+            "already_paid",
+            user_id=installment_plan.customer_id,
+            installment_plan_id=installment_plan.pk,
+            operation="bulk_installment_payment",
+        )
+        raise BusinessException(
+            message=str(_("Installment already paid.")),
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+    for offset, installment in enumerate(installments):
+        installment.installment_plan = installment_plan
+        if offset == 0:
+            # Already paid, plan not payable, or not the plan's next payable installment
+            retrieval.validate_installment_payment(installment)
+        # Every installment after the next payable one is unpaid, so contiguity is enough
+        elif installment.sequence_number != installments[offset - 1].sequence_number + 1:
+            logger.error(
+                "previous_unpaid",
+                user_id=installment_plan.customer_id,
+                attempted_sequence_number=installment.sequence_number,
+                next_payable_sequence=installments[offset - 1].sequence_number + 1,
+                operation="bulk_installment_payment",
+            )
+            raise BusinessException(
+                message=str(_("Previous installments must be paid before this one.")),
+                status_code=status.HTTP_409_CONFLICT,
+            )
+
+
+def _settle_installments(installment_plan: InstallmentPlan, installments: List[Installment]) -> None:
+    """Mark validated installments of a locked plan as paid and update the plan once.
+
+    Args:
+        installment_plan: The installment plan, locked by the caller's transaction.
+        installments: Its installments being paid, all currently unpaid.
+    """
+    paid_at = timezone.now()
+    Installment.objects.filter(pk__in=[installment.pk for installment in installments]).update(
+        status=Installment.Status.PAID,
+        paid_at=paid_at,
+        updated_at=paid_at,
+    )
+    for installment in installments:
+        installment.status = Installment.Status.PAID
+        installment.paid_at = paid_at
+
+    # The plan is locked, so its counters are exact: the payment settles it
+    # when every other installment is already paid
+    plan_updates = progress_delta_expressions(
+        paid=len(installments),
+        outstanding=-sum(installment.amount for installment in installments),
+    )
+    if installment_plan.paid_count + len(installments) >= installment_plan.total_count:
+        installment_plan.status = InstallmentPlan.Status.COMPLETED
+        plan_updates.update(status=installment_plan.status, updated_at=paid_at)
+    elif (
+        installment_plan.status == InstallmentPlan.Status.DEFAULTED
+        and not installment_plan.installments.filter(status=Installment.Status.LATE).exists()
+    ):
+        # The customer caught up with every late installment
+        installment_plan.status = InstallmentPlan.Status.ACTIVE
+        plan_updates.update(status=installment_plan.status, updated_at=paid_at)
+    InstallmentPlan.objects.filter(pk=installment_plan.pk).update(**plan_updates)
+    invalidate_customer_installments([installment_plan.customer_id])
+    invalidate_merchant_analytics([installment_plan.plan.merchant_id])
+
+
+def _raise_not_found(customer: User) -> NoReturn:
+    """Reject installments that cannot be found in a single installment plan of the customer."""
+    logger.error(
+        "not_found",
+        user_id=customer.id,
+        operation="bulk_installment_payment",
+    )
+    raise BusinessException(
+        message=str(_("Installment not found")),
+        status_code=status.HTTP_404_NOT_FOUND,
+    )
@@ -0,0 +1,410 @@
+"""Maintenance of the progress fields denormalized onto InstallmentPlan.
+
+Saved and deleted installments shift the counters of their plan through the
+installment signals: the state of an updated installment is read just
+before the save, only when the saved fields can change the progress. Bulk
+writes that bypass the signals refresh the plans themselves, and the nightly
+reconciliation repairs whatever drifted anyway.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    DecimalField,
+    Expression,
+    F,
+    OuterRef,
+    PositiveSmallIntegerField,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.logging.logger import get_logger
+from installment.constants import PLAN_PROGRESS_DRIFT_SAMPLE_SIZE, PLAN_PROGRESS_REBUILD_BATCH_SIZE
+from installment.models import Installment, InstallmentPlan
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PlanProgressReconciliation:
+    """Outcome of a reconciliation of the stored plan progress.
+
+    Attributes:
+        checked: Installment plans compared with their installments.
+        drifted: Installment plans whose stored progress or status had drifted.
+        repaired: Drifted installment plans that were repaired.
+        sample: Drifted field names of the first drifted installment plans, by id.
+    """
+
+    checked: int = 0
+    drifted: int = 0
+    repaired: int = 0
+    sample: Dict[int, List[str]] = field(default_factory=dict)
+
+
+def plan_progress_expressions() -> Dict[str, Expression]:
+    """Build the expressions computing each progress field of an installment plan.
+
+    Every expression is a subquery correlated on the outer InstallmentPlan row,
+    so the result can be used in ``update()`` as well as in ``annotate()``.
+    The counters aggregate every installment of the plan, so this full
+    recompute is reserved for new plans and for repairs; write paths shift
+    the counters with progress_delta_expressions() instead.
+
+    Returns:
+        Dict[str, Expression]: One expression per name in ``InstallmentPlan.PROGRESS_FIELDS``.
+    """
+    installments = Installment.objects.filter(installment_plan=OuterRef('pk')).order_by()
+    unpaid = installments.exclude(status=Installment.Status.PAID)
+
+    def aggregate(queryset, expression, output_field):
+        # Group by the plan so the subquery yields a single aggregated row
+        return Subquery(
+            queryset.values('installment_plan').annotate(value=expression).values('value'),
+            output_field=output_field,
+        )
+
+    next_payable_sequence, next_due_date = next_installment_expressions().values()
+    return {
+        'next_payable_sequence': next_payable_sequence,
+        'paid_count': Coalesce(
+            aggregate(installments.filter(status=Installment.Status.PAID), Count('pk'), PositiveSmallIntegerField()),
+            Value(0),
+        ),
+        'total_count': Coalesce(
+            aggregate(installments, Count('pk'), PositiveSmallIntegerField()),
+            Value(0),
+        ),
+        'next_due_date': next_due_date,
+        'outstanding_amount': Coalesce(
+            aggregate(unpaid, Sum('amount'), DecimalField(max_digits=12, decimal_places=2)),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    }
+
+
+def next_installment_expressions() -> Dict[str, Expression]:
+    """Build the expressions reading the next payable sequence and next due date of a plan.
+
+    Each one is a single-row subquery walking an index of the plan's
+    installments, so it stops at the first unpaid (or pending) installment
+    instead of aggregating all of them.
+
+    Returns:
+        Dict[str, Expression]: Expressions for `next_payable_sequence` and `next_due_date`.
+    """
+    installments = Installment.objects.filter(installment_plan=OuterRef('pk'))
+    return {
+        'next_payable_sequence': Subquery(
+            installments.exclude(status=Installment.Status.PAID)
+            .order_by('sequence_number').values('sequence_number')[:1]
+        ),
+        'next_due_date': Subquery(
+            installments.filter(status=Installment.Status.PENDING).order_by('due_date').values('due_date')[:1]
+        ),
+    }
+
+
+def refresh_next_installments(installment_plan_ids: Iterable[int]) -> int:
+    """Re-read the next payable sequence and next due date of installment plans.
+
+    Enough after status changes that move no counter, such as installments
+    becoming late.
+
+    Args:
+        installment_plan_ids (Iterable[int]): IDs of the installment plans to refresh.
+
+    Returns:
+        int: Number of installment plans updated.
+    """
+    return InstallmentPlan.objects.filter(pk__in=list(installment_plan_ids)).update(
+        **next_installment_expressions()
+    )
+
+
+def progress_delta_expressions(
+    paid: int = 0,
+    total: int = 0,
+    outstanding: Decimal = Decimal('0.00'),
+) -> Dict[str, Expression]:
+    """Build the updates shifting the progress counters of an installment plan.
+
+    The counters are moved atomically relative to their stored values, and
+    the next payable sequence and due date are re-read with an index probe
+    each, so no update scans the plan's installments.
+
+    Args:
+        paid: Change of the number of paid installments.
+        total: Change of the number of installments.
+        outstanding: Change of the unpaid amount.
+
+    Returns:
+        Dict[str, Expression]: One expression per name in ``InstallmentPlan.PROGRESS_FIELDS``.
+    """
+    return {
+        **next_installment_expressions(),
+        'paid_count': F('paid_count') + paid,
+        'total_count': F('total_count') + total,
+        'outstanding_amount': F('outstanding_amount') + outstanding,
+    }
+
+
+def apply_progress_delta(
+    installment_plan_id: int,
+    paid: int = 0,
+    total: int = 0,
+    outstanding: Decimal = Decimal('0.00'),
+) -> None:
+    """Shift the progress of an installment plan and complete it when every installment is paid.
+
+    One UPDATE of the plan row: an active plan is completed when its paid
+    count, after the shift, reaches its total count. The counters are read
+    and written by the same statement, so concurrent shifts cannot be lost.
+
+    Args:
+        installment_plan_id: ID of the installment plan.
+        paid: Change of the number of paid installments.
+        total: Change of the number of installments.
+        outstanding: Change of the unpaid amount.
+    """
+    # Every expression of an UPDATE sees the row as it was before the update
+    completed = Q(
+        status=InstallmentPlan.Status.ACTIVE,
+        total_count__gt=-total,
+        paid_count__gte=F('total_count') + (total - paid),
+    )
+    InstallmentPlan.objects.filter(pk=installment_plan_id).update(
+        status=Case(
+            When(completed, then=Value(InstallmentPlan.Status.COMPLETED)),
+            default=F('status'),
+            output_field=CharField(),
+        ),
+        updated_at=Case(When(completed, then=Value(timezone.now())), default=F('updated_at')),
+        **progress_delta_expressions(paid, total, outstanding),
+    )
+
+
+def load_progress_state(installment: Installment, update_fields: Optional[Iterable[str]] = None) -> Optional[tuple]:
+    """Read the stored state of an installment about to be updated, as needed by apply_installment_save().
+
+    Args:
+        installment: The installment being saved.
+        update_fields: The fields being saved, or None for all of them.
+
+    Returns:
+        Optional[tuple]: The stored state, or None for a new installment or
+            when none of the saved fields affects the plan progress.
+    """
+    if installment.pk is None:
+        return None
+    if update_fields is not None:
+        opts = Installment._meta
+        saved = {opts.get_field(name).name for name in update_fields}
+        if not saved & {opts.get_field(name).name for name in Installment.PROGRESS_STATE_FIELDS}:
+            return None
+    stored = Installment.objects.filter(pk=installment.pk).order_by().values_list(*Installment.PROGRESS_STATE_FIELDS)
+    return next(iter(stored), None)
+
+
+def apply_installment_save(installment: Installment, created: bool, previous: Optional[tuple]) -> None:
+    """Apply a saved installment to the progress of its plan.
+
+    The change is derived from the installment's previous state, as read by
+    load_progress_state() before the save, and its new one: for instance,
+    paying an installment adds one to the paid count and removes its amount
+    from the outstanding amount.
+
+    Args:
+        installment: The saved installment.
+        created: Whether the installment was inserted.
+        previous: The state read before the save; None when the installment
+            was inserted or the saved fields do not affect the progress.
+    """
+    if created:
+        _apply_progress_states(None, installment.current_progress_state())
+    elif previous is not None:
+        _apply_progress_states(previous, installment.current_progress_state())
+
+
+def apply_installment_delete(installment: Installment) -> None:
+    """Remove a deleted installment from the progress of its plan.
+
+    Args:
+        installment: The deleted installment.
+    """
+    _apply_progress_states(installment.current_progress_state(), None)
+
+
+def _apply_progress_states(previous: Optional[tuple], current: Optional[tuple]) -> None:
+    """Shift the plans of an installment by the difference between two of its states."""
+    if previous == current:
+        return
+
+    contributions = defaultdict(lambda: [0, 0, Decimal('0.00')])
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+        installment_plan_id, status, amount = state[:3]
+        paid = status == Installment.Status.PAID
+        contribution = contributions[installment_plan_id]
+        contribution[0] += sign * int(paid)
+        contribution[1] += sign
+        contribution[2] += sign * (Decimal('0.00') if paid else amount)
+    for installment_plan_id, (paid, total, outstanding) in contributions.items():
+        apply_progress_delta(installment_plan_id, paid, total, outstanding)
+
+
+def refresh_plan_progress(installment_plan_ids: Iterable[int]) -> int:
+    """Recompute the denormalized progress fields of installment plans.
+
+    The values are derived from the installments with a single set-based
+    UPDATE, so they always reflect the rows visible to the current transaction.
+    Callers changing installments should run it in the same transaction, so
+    the installments and the progress of their plans are committed together.
+
+    Args:
+        installment_plan_ids (Iterable[int]): IDs of the installment plans to refresh.
+
+    Returns:
+        int: Number of installment plans updated.
+    """
+    return InstallmentPlan.objects.filter(pk__in=list(installment_plan_ids)).update(
+        **plan_progress_expressions()
+    )
+
+
+def complete_paid_plans(installment_plan_ids: Iterable[int]) -> int:
+    """Mark as COMPLETED the active installment plans whose counters show every installment paid.
+
+    Completion is a single conditional UPDATE on the plan rows, driven by the
+    stored `paid_count` and `total_count`, so it never scans installments.
+    The counters must be current, i.e. refreshed earlier in the same transaction.
+
+    Args:
+        installment_plan_ids (Iterable[int]): IDs of the installment plans to check.
+
+    Returns:
+        int: Number of installment plans completed.
+    """
+    return InstallmentPlan.objects.filter(
+        pk__in=list(installment_plan_ids),
+        status=InstallmentPlan.Status.ACTIVE,
+        total_count__gt=0,
+        paid_count__gte=F('total_count'),
+    ).update(status=InstallmentPlan.Status.COMPLETED, updated_at=timezone.now())
+
+
+def find_drifted_plans(installment_plan_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """Compare the stored progress of installment plans with their installments.
+
+    Besides every progress field, the status is checked: an active plan whose
+    installments are all paid has missed its completion.
+
+    Args:
+        installment_plan_ids (Iterable[int]): IDs of the installment plans to check.
+
+    Returns:
+        Dict[int, List[str]]: Names of the drifted fields, per drifted installment plan id.
+    """
+    fields = InstallmentPlan.PROGRESS_FIELDS
+    expected = {f'expected_{name}': expression for name, expression in plan_progress_expressions().items()}
+    expected['expected_status'] = Case(
+        When(
+            Q(status=InstallmentPlan.Status.ACTIVE, expected_total_count__gt=0)
+            & Q(expected_paid_count__gte=F('expected_total_count')),
+            then=Value(InstallmentPlan.Status.COMPLETED),
+        ),
+        default=F('status'),
+        output_field=CharField(),
+    )
+
+    rows = (
+        InstallmentPlan.objects
+        .filter(pk__in=list(installment_plan_ids))
+        .annotate(**expected)
+        .values('pk', 'status', *fields, *expected)
+    )
+    drifted = {}
+    for row in rows:
+        names = [name for name in (*fields, 'status') if row[name] != row[f'expected_{name}']]
+        if names:
+            drifted[row['pk']] = names
+    return drifted
+
+
+def repair_plan_progress(installment_plan_ids: Iterable[int]) -> int:
+    """Recompute the progress of installment plans and complete the fully paid ones.
+
+    Args:
+        installment_plan_ids (Iterable[int]): IDs of the installment plans to repair.
+
+    Returns:
+        int: Number of installment plans updated.
+    """
+    installment_plan_ids = list(installment_plan_ids)
+    updated = refresh_plan_progress(installment_plan_ids)
+    complete_paid_plans(installment_plan_ids)
+    return updated
+
+
+def reconcile_plan_progress(
+    repair: bool = True,
+    batch_size: int = PLAN_PROGRESS_REBUILD_BATCH_SIZE,
+) -> PlanProgressReconciliation:
+    """Detect, and optionally repair, installment plans whose stored progress has drifted.
+
+    Installment plans are walked in ascending id order, `batch_size` at a
+    time. Only the drifted plans of a batch are repaired, each batch in its
+    own transaction.
+
+    Args:
+        repair: Repair the drifted installment plans instead of only reporting them.
+        batch_size: Installment plans compared per statement.
+
+    Returns:
+        PlanProgressReconciliation: Counts and a sample of the drifted plans.
+    """
+    result = PlanProgressReconciliation()
+    for ids in plan_id_batches(batch_size):
+        with transaction.atomic():
+            drifted = find_drifted_plans(ids)
+            if repair and drifted:
+                result.repaired += repair_plan_progress(drifted)
+        result.checked += len(ids)
+        result.drifted += len(drifted)
+        for pk, names in drifted.items():
+            if len(result.sample) < PLAN_PROGRESS_DRIFT_SAMPLE_SIZE:
+                result.sample[pk] = names
+
+    log = logger.warning if result.drifted else logger.info
+    log(
+        "plan_progress_reconciled",
+        operation="reconcile_plan_progress",
+        checked=result.checked,
+        drifted=result.drifted,
+        repaired=result.repaired,
+        sample=result.sample,
+    )
+    return result
+
+
+def plan_id_batches(batch_size: int) -> Iterator[List[int]]:
+    """Yield installment plan ids in ascending batches (keyset pagination)."""
+    last_id = 0
+    plans = InstallmentPlan.objects.order_by('pk').values_list('pk', flat=True)
+    while ids := list(plans.filter(pk__gt=last_id)[:batch_size]):
+        last_id = ids[-1]
+        yield ids
@@ -3,7 +3,7 @@ from datetime import date
 from typing import Optional
 
 from django.contrib.auth import get_user_model
-from django.db.models import QuerySet, Q, Case, When, Value, BooleanField, Exists, OuterRef
+from django.db.models import QuerySet, Q, Case, When, Value, BooleanField, F
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 
@@ -45,8 +45,9 @@ class InstallmentRetrievalService:
 
         Additionally, we add a field `is_payable`, which is True only if:
           * The installment is not paid.
-          * The installment plan is active.
-          * There are no previous unpaid installments (with lower sequence_number) in the same plan.
+          * The installment plan is active or defaulted.
+          * There are no previous unpaid installments (with lower sequence_number) in the same plan,
+            i.e. it is the plan's `next_payable_sequence`.
 
         Args:
             status_filter: Optional status filter ('upcoming' or 'past').
@@ -54,17 +55,6 @@ class InstallmentRetrievalService:
         Returns:
             QuerySet: Filtered queryset of installments with annotated `is_payable`.
         """
-        # Subquery to check for any previous unpaid installments in the same plan
-        previous_unpaid = Installment.objects.filter(
-            installment_plan=OuterRef('installment_plan'),
-            sequence_number__lt=OuterRef('sequence_number'),
-            status__in=[
-                Installment.Status.PENDING,
-                Installment.Status.LATE,
-                Installment.Status.FAILED,
-            ]
-        )
-
         # Base queryset with annotations
         queryset = Installment.objects.filter(
             installment_plan__customer=self.customer
@@ -74,12 +64,12 @@ class InstallmentRetrievalService:
             is_payable=Case(
                 # Condition 1: Already paid -> not payable
                 When(status=Installment.Status.PAID, then=Value(False)),
-                # Condition 2: Installment plan not active -> not payable
-                When(~Q(installment_plan__status=InstallmentPlan.Status.ACTIVE), then=Value(False)),
-                # Condition 3: Has previous unpaid installments -> not payable
-                When(Exists(previous_unpaid), then=Value(False)),
-                # Default case: payable
-                default=Value(True),
+                # Condition 2: Installment plan completed -> not payable
+                When(~Q(installment_plan__status__in=InstallmentPlan.PAYABLE_STATUSES), then=Value(False)),
+                # Condition 3: First unpaid installment of the plan -> payable
+                When(sequence_number=F("installment_plan__next_payable_sequence"), then=Value(True)),
+                # Default case: previous installments are unpaid
+                default=Value(False),
                 output_field=BooleanField()
             )
         )
@@ -127,7 +117,7 @@ class InstallmentRetrievalService:
                 status_code=status.HTTP_409_CONFLICT,
             )
 
-        if installment.installment_plan.status != InstallmentPlan.Status.ACTIVE:
+        if installment.installment_plan.status not in InstallmentPlan.PAYABLE_STATUSES:
             if not self.raise_validation_errors:
                 return False
             logger.error(
@@ -141,26 +131,16 @@ class InstallmentRetrievalService:
                 status_code=status.HTTP_409_CONFLICT,
             )
 
-        previous_unpaid_qs = installment.installment_plan.installments.filter(
-            installment_plan__customer=installment.installment_plan.customer,
-            sequence_number__lt=installment.sequence_number,
-            status__in=[
-                Installment.Status.PENDING,
-                Installment.Status.LATE,
-                Installment.Status.FAILED,
-            ],
-        )
-
-        if previous_unpaid_qs.exists():
+        # Only the first unpaid installment of the plan can be paid
+        next_payable_sequence = installment.installment_plan.next_payable_sequence
+        if installment.sequence_number != next_payable_sequence:
             if not self.raise_validation_errors:
                 return False
             logger.error(
                 "previous_unpaid",
                 user_id=self.customer.id,
                 attempted_sequence_number=installment.sequence_number,
-                unpaid_installments=list(
-                    previous_unpaid_qs.values_list("id", "sequence_number", "status")
-                ),
+                next_payable_sequence=next_payable_sequence,
                 operation="installment_payment",
             )
             raise BusinessException(
@@ -1,20 +1,192 @@
-from datetime import date
-from installment.models import Installment
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
 
-def mark_overdue_installments() -> None:
-    """Mark installments with past due dates as overdue.
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
-    This function checks for all installments that are still marked as PENDING
-    and have a due date earlier than today's date, then updates their status
-    to LATE.
+from analytics.services.invalidation import invalidate_merchant_analytics
+from core.logging.logger import get_logger
+from installment.constants import (
+    OVERDUE_BATCH_SIZE,
+    OVERDUE_SCAN_LOCK_TIMEOUT,
+    OVERDUE_SCAN_NAME,
+    OVERDUE_SCAN_OVERLAP_DAYS,
+)
+from installment.models import Installment, InstallmentPlan, OverdueScanState
+from installment.services.list_cache import invalidate_customer_installments
+from installment.services.progress import refresh_next_installments
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class OverdueRunResult:
+    """Counts and timings of one overdue processing run.
+
+    Attributes:
+        installments_marked: Installments moved from PENDING to LATE.
+        plans_defaulted: Installment plans moved from ACTIVE to DEFAULTED.
+        batches: Number of batches (transactions) executed.
+        duration_seconds: Wall-clock duration of the whole run.
+        max_batch_seconds: Duration of the slowest batch transaction.
+    """
+
+    installments_marked: int = 0
+    plans_defaulted: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+    max_batch_seconds: float = 0.0
+
+
+def mark_overdue_installments(
+    today: Optional[date] = None,
+    since: Optional[date] = None,
+    batch_size: int = OVERDUE_BATCH_SIZE,
+) -> OverdueRunResult:
+    """Mark installments with past due dates as overdue and default their plans.
+
+    Pending installments due before today are walked in (due_date, id) order
+    with keyset pagination, at most `batch_size` per batch, which matches the
+    partial index on pending installments' due dates. Each batch runs in its
+    own short transaction that updates the installments to LATE, moves
+    their ACTIVE installment plans to DEFAULTED and refreshes the next due date
+    of those plans, then invalidates the cached installment lists of their
+    customers, so row locks are held briefly and a failure only rolls back
+    the current batch.
+
+    Args:
+        today: Reference date; installments due before it are overdue. Defaults to today.
+        since: Only installments due on or after this date are examined. Defaults to all.
+        batch_size: Maximum number of installments per batch.
 
     Returns:
-        None
+        OverdueRunResult: Counts and timings of the run.
     """
-    overdue_installments = Installment.objects.filter(
-        due_date__lt=date.today(),
-        status=Installment.Status.PENDING
+    today = today or date.today()
+    result = OverdueRunResult()
+    started = time.monotonic()
+
+    overdue = Installment.objects.filter(
+        due_date__lt=today,
+        status=Installment.Status.PENDING,
+    ).order_by('due_date', 'id')
+    if since is not None:
+        overdue = overdue.filter(due_date__gte=since)
+
+    batch = overdue
+    while rows := list(batch.values_list('due_date', 'id')[:batch_size]):
+        last_due_date, last_id = rows[-1]
+        ids = [installment_id for _, installment_id in rows]
+        # The redundant lower bound keeps the next batch an index range scan
+        batch = overdue.filter(
+            Q(due_date__gt=last_due_date) | Q(due_date=last_due_date, id__gt=last_id),
+            due_date__gte=last_due_date,
+        )
+        batch_started = time.monotonic()
+
+        with transaction.atomic():
+            now = timezone.now()
+            owners = set(
+                Installment.objects.filter(id__in=ids).values_list(
+                    'installment_plan_id', 'installment_plan__customer_id', 'installment_plan__plan__merchant_id',
+                )
+            )
+            plan_ids = {plan_id for plan_id, _, _ in owners}
+            # Status is re-checked so installments paid since the id scan are left alone
+            marked = Installment.objects.filter(
+                id__in=ids,
+                status=Installment.Status.PENDING,
+            ).update(status=Installment.Status.LATE, updated_at=now)
+            defaulted = InstallmentPlan.objects.filter(
+                status=InstallmentPlan.Status.ACTIVE,
+                id__in=plan_ids,
+            ).update(status=InstallmentPlan.Status.DEFAULTED, updated_at=now)
+            # Late installments no longer count towards the next due date; no counter moves
+            refresh_next_installments(plan_ids)
+            invalidate_customer_installments(customer_id for _, customer_id, _ in owners)
+            invalidate_merchant_analytics(merchant_id for _, _, merchant_id in owners)
+
+        batch_seconds = time.monotonic() - batch_started
+        result.installments_marked += marked
+        result.plans_defaulted += defaulted
+        result.batches += 1
+        result.max_batch_seconds = max(result.max_batch_seconds, batch_seconds)
+
+    result.duration_seconds = time.monotonic() - started
+    logger.info(
+        "overdue_installments_marked",
+        operation="mark_overdue_installments",
+        today=today,
+        since=since,
+        installments_marked=result.installments_marked,
+        plans_defaulted=result.plans_defaulted,
+        batches=result.batches,
+        duration_seconds=round(result.duration_seconds, 3),
+        max_batch_seconds=round(result.max_batch_seconds, 3),
     )
+    return result
+
+
+def run_overdue_scan(today: Optional[date] = None, full_scan: bool = False) -> Optional[OverdueRunResult]:
+    """Run the overdue scan over the due dates not processed since the last successful run.
+
+    The scan state row holds a watermark (the last fully processed due date)
+    and a lease-based lock. Only one run can hold the lock, and a run finding
+    the watermark already at yesterday does nothing, so overlapping or repeated
+    invocations scan each day once. After missed days the window simply starts
+    further back. The watermark only moves forward when the run succeeds.
+
+    Each run also rescans the last `OVERDUE_SCAN_OVERLAP_DAYS` due dates
+    before the watermark, which catches pending installments inserted with a
+    due date the watermark had already passed. Older back-dated installments
+    need a full scan.
+
+    Args:
+        today: Reference date; installments due before it are overdue. Defaults to today.
+        full_scan: Ignore the watermark and examine every past due date.
+
+    Returns:
+        Optional[OverdueRunResult]: The run result, or None if the run was skipped.
+    """
+    today = today or date.today()
+    up_to = today - timedelta(days=1)
+
+    state, _ = OverdueScanState.objects.get_or_create(name=OVERDUE_SCAN_NAME)
+    if not full_scan and state.last_processed_due_date and state.last_processed_due_date >= up_to:
+        logger.info(
+            "overdue_scan_skipped",
+            operation="run_overdue_scan",
+            reason="up_to_date",
+            last_processed_due_date=state.last_processed_due_date,
+        )
+        return None
+
+    now = timezone.now()
+    # Conditional UPDATE acts as the lock: only one worker can take an expired lease
+    acquired = OverdueScanState.objects.filter(pk=state.pk).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    ).update(locked_until=now + timedelta(seconds=OVERDUE_SCAN_LOCK_TIMEOUT))
+    if not acquired:
+        logger.info("overdue_scan_skipped", operation="run_overdue_scan", reason="locked")
+        return None
+
+    try:
+        state.refresh_from_db(fields=['last_processed_due_date'])
+        watermark = None if full_scan else state.last_processed_due_date
+        if watermark and watermark >= up_to:
+            # Another run finished between the first check and taking the lock
+            return None
+
+        since = watermark - timedelta(days=OVERDUE_SCAN_OVERLAP_DAYS - 1) if watermark else None
+        result = mark_overdue_installments(today=today, since=since)
 
-    # Update the status of overdue installments
-    overdue_installments.update(status=Installment.Status.LATE)
+        OverdueScanState.objects.filter(pk=state.pk).update(
+            last_processed_due_date=up_to,
+            updated_at=timezone.now(),
+        )
+        return result
+    finally:
+        OverdueScanState.objects.filter(pk=state.pk).update(locked_until=None)
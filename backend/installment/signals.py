@@ -1,10 +1,11 @@
 import threading
 from typing import Type
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from .models import InstallmentPlan, Installment
+from .services.progress import apply_installment_delete, apply_installment_save, load_progress_state
 from .utils.bulk_create import bulk_create_installments
 
 # Thread-local flag to control signal execution
@@ -51,28 +52,57 @@ def create_installments(
     bulk_create_installments(installment_plans=[instance])
 
 
+@receiver(pre_save, sender=Installment)
+def capture_installment_progress_state(
+    sender: Type[Installment],
+    instance: Installment,
+    update_fields=None,
+    **kwargs,
+) -> None:
+    """Read the stored state of an updated installment, to which its save is compared.
+
+    Args:
+        sender (Type[Installment]): The model class.
+        instance (Installment): The Installment instance about to be saved.
+        update_fields: The fields being saved, or None for all of them.
+        **kwargs: Additional keyword arguments.
+    """
+    instance._previous_progress_state = load_progress_state(instance, update_fields)
+
+
 @receiver(post_save, sender=Installment)
-def update_installment_plan_status(
+def update_installment_plan_progress(
     sender: Type[Installment],
     instance: Installment,
+    created: bool,
     **kwargs,
 ) -> None:
-    """Update the status of InstallmentPlan to COMPLETED when all installments are paid.
+    """Apply a saved installment to the progress of its InstallmentPlan.
+
+    The plan counters are shifted by the change of the installment, and the
+    plan is set to COMPLETED when its last installment is paid, in one
+    conditional UPDATE of the plan row that scans none of its installments.
 
     Args:
         sender (Type[Installment]): The model class.
-        instance (Installment): The updated Installment instance.
+        instance (Installment): The created or updated Installment instance.
+        created (bool): True if a new object was created.
         **kwargs: Additional keyword arguments.
     """
-    if instance.status != Installment.Status.PAID:
-        return
+    apply_installment_save(instance, created, getattr(instance, '_previous_progress_state', None))
 
-    plan = instance.installment_plan
 
-    # If any installment is not paid, do not update status
-    if plan.installments.exclude(status=Installment.Status.PAID).exists():
-        return
+@receiver(post_delete, sender=Installment)
+def remove_installment_from_plan_progress(
+    sender: Type[Installment],
+    instance: Installment,
+    **kwargs,
+) -> None:
+    """Remove a deleted installment from the progress of its InstallmentPlan.
 
-    if plan.status != InstallmentPlan.Status.COMPLETED:
-        plan.status = InstallmentPlan.Status.COMPLETED
-        plan.save(update_fields=["status"])
+    Args:
+        sender (Type[Installment]): The model class.
+        instance (Installment): The deleted Installment instance.
+        **kwargs: Additional keyword arguments.
+    """
+    apply_installment_delete(instance)
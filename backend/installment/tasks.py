@@ -1,14 +1,39 @@
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
 from celery import shared_task
-from installment.services.status import mark_overdue_installments
+from installment.services.progress import reconcile_plan_progress
+from installment.services.status import run_overdue_scan
 
 @shared_task
-def check_overdue_installments() -> None:
+def check_overdue_installments(full_scan: bool = False) -> Optional[Dict[str, Any]]:
     """Check and mark overdue installments.
 
-    This task will invoke the `mark_overdue_installments` function to
-    update the status of installments that are overdue.
+    This task will invoke the `run_overdue_scan` function to update the
+    status of installments that became overdue since the previous successful
+    run and default their installment plans.
+
+    Args:
+        full_scan (bool): Ignore the watermark and rescan every past due date.
+
+    Returns:
+        Optional[Dict[str, Any]]: Counts and timings of the run, stored as the task
+            result, or None if another run holds the lock or today was already scanned.
+    """
+    result = run_overdue_scan(full_scan=full_scan)
+    return asdict(result) if result else None
+
+
+@shared_task
+def reconcile_installment_plan_progress() -> Dict[str, Any]:
+    """Detect and repair installment plans whose stored progress has drifted.
+
+    Progress counters and completion are maintained incrementally, so a
+    write path that bypasses them (raw SQL, a bulk update without a refresh)
+    leaves them stale. This task compares every plan with its installments
+    and repairs only the drifted ones.
 
     Returns:
-        None
+        Dict[str, Any]: Counts and a sample of the drifted plans, stored as the task result.
     """
-    mark_overdue_installments()
+    return asdict(reconcile_plan_progress(repair=True))
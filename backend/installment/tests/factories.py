@@ -2,6 +2,7 @@ import factory
 from factory.django import DjangoModelFactory
 from customer.tests.factories import CustomerUserFactory
 from installment.models import InstallmentPlan, Installment
+from installment.utils.signal_control import disable_installment_creation_signal
 from datetime import date, timedelta
 
 
@@ -25,3 +26,19 @@ class InstallmentFactory(DjangoModelFactory):
     )
     sequence_number = factory.Sequence(lambda n: n + 1)  # Use Sequence for guaranteed uniqueness
     status = Installment.Status.PENDING
+
+
+def create_standalone_installment(plan, customer, **kwargs) -> Installment:
+    """Create an installment as the only one of a new installment plan of `plan`.
+
+    No schedule is generated for the installment plan, so any number of
+    standalone installments can share a due date.
+
+    Args:
+        plan: The plan template of the installment plan.
+        customer: The customer of the installment plan.
+        **kwargs: Fields of the installment, e.g. due_date, status, amount.
+    """
+    with disable_installment_creation_signal():
+        installment_plan = InstallmentPlanFactory(plan=plan, customer=customer)
+    return InstallmentFactory(installment_plan=installment_plan, **kwargs)
@@ -4,13 +4,16 @@ from unittest import mock
 from typing import List
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from dateutil.relativedelta import relativedelta
 from rest_framework import status
 
 from core.exceptions import BusinessException
 from installment.models import Installment
 from installment.utils.bulk_create import bulk_create_installments
+from installment.utils.schedule import compute_schedule, schedule_cache
 from installment.utils.signal_control import disable_installment_creation_signal
 from plan.tests.factories import PlanFactory
 from installment.tests.factories import InstallmentPlanFactory
@@ -33,6 +36,7 @@ class BulkCreateInstallmentsTests(TestCase):
             installment_period=10,
         )
         self.today: date = date.today()
+        schedule_cache.clear()
 
         # Disable any post_save signals that might auto‐create Installments.
         with disable_installment_creation_signal():
@@ -216,3 +220,58 @@ class BulkCreateInstallmentsTests(TestCase):
                 exc_info.exception.status_code,
                 status.HTTP_422_UNPROCESSABLE_ENTITY,
             )
+
+    def test_installments_are_inserted_in_bounded_batches(self) -> None:
+        """
+        With batch_size smaller than the number of generated rows, every
+        installment must still be created, using one INSERT per batch.
+        """
+        Installment.objects.all().delete()
+
+        with disable_installment_creation_signal():
+            second_installment_plan = InstallmentPlanFactory(
+                plan=self.valid_plan,
+                start_date=self.today,
+            )
+
+        # 2 plans x 3 installments = 6 rows -> 3 INSERTs of 2 rows each
+        with CaptureQueriesContext(connection) as ctx:
+            bulk_create_installments(
+                [self.valid_installment_plan, second_installment_plan],
+                batch_size=2,
+            )
+
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+
+        self.assertEqual(Installment.objects.count(), 6)
+        self.assertEqual(second_installment_plan.installments.count(), 3)
+
+    def test_schedule_is_computed_once_per_plan_template(self) -> None:
+        """
+        Installment plans sharing the same template must reuse a single
+        computed schedule, shifted onto each plan's start date.
+        """
+        Installment.objects.all().delete()
+
+        with disable_installment_creation_signal():
+            later_installment_plan = InstallmentPlanFactory(
+                plan=self.valid_plan,
+                start_date=self.today + relativedelta(days=5),
+            )
+
+        with mock.patch(
+            "installment.utils.schedule.compute_schedule",
+            wraps=compute_schedule,
+        ) as compute_mock:
+            bulk_create_installments([self.valid_installment_plan, later_installment_plan])
+
+        self.assertEqual(compute_mock.call_count, 1)
+        self.assertListEqual(
+            list(
+                later_installment_plan.installments
+                .order_by("sequence_number")
+                .values_list("due_date", flat=True)
+            ),
+            [self.today + relativedelta(days=5 + 10 * i) for i in range(3)],
+        )
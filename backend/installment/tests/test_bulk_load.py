@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment, InstallmentPlan
+from installment.utils.bulk_load import CopyRowWriter, bulk_load_installment_plans, format_copy_value
+from installment.utils.schedule import schedule_cache
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import Plan
+from plan.services.plan_creator import PlanCreatorService
+from plan.tests.factories import PlanFactory
+
+
+class BulkLoadInstallmentPlansTests(TestCase):
+    """Tests for the bulk loader used by the multi-customer enrollment flow."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        self.plan = PlanFactory(
+            installment_count=3,
+            total_amount=Decimal("100.00"),
+            installment_period=10,
+        )
+        self.customers = CustomerUserFactory.create_batch(3)
+        self.today = date.today()
+
+    def _assert_enrolled(self) -> None:
+        """Every customer has one installment plan with the expected schedule."""
+        installment_plans = InstallmentPlan.objects.filter(plan=self.plan)
+        self.assertSetEqual(
+            set(installment_plans.values_list("customer_id", flat=True)),
+            {customer.id for customer in self.customers},
+        )
+        for installment_plan in installment_plans:
+            installments = installment_plan.installments.order_by("sequence_number")
+            self.assertListEqual(
+                [inst.amount for inst in installments],
+                [Decimal("33.34"), Decimal("33.33"), Decimal("33.33")],
+            )
+            self.assertListEqual(
+                [inst.due_date for inst in installments],
+                [self.today + timedelta(days=10 * i) for i in range(3)],
+            )
+            self.assertTrue(all(inst.status == Installment.Status.PENDING for inst in installments))
+
+    def test_fallback_loads_plans_and_installments_in_chunks(self) -> None:
+        """Without COPY, chunks smaller than the customer list still enroll everyone."""
+        created = bulk_load_installment_plans(
+            plan=self.plan,
+            customers=iter(self.customers),
+            start_date=self.today,
+            use_copy=False,
+            batch_size=2,
+        )
+
+        self.assertEqual(created, 3)
+        self._assert_enrolled()
+
+    @skipUnless(connection.vendor == "postgresql", "COPY FROM STDIN requires PostgreSQL")
+    def test_copy_loads_plans_and_installments(self) -> None:
+        """The COPY path writes the same rows as the ORM path."""
+        created = bulk_load_installment_plans(
+            plan=self.plan,
+            customers=self.customers,
+            start_date=self.today,
+            use_copy=True,
+            batch_size=2,
+        )
+
+        self.assertEqual(created, 3)
+        self._assert_enrolled()
+
+    @skipUnless(connection.vendor == "postgresql", "COPY FROM STDIN requires PostgreSQL")
+    def test_copy_is_used_unless_disabled_by_setting(self) -> None:
+        """Without an explicit `use_copy`, INSTALLMENT_BULK_LOAD_USE_COPY picks the loader."""
+        with mock.patch("installment.utils.bulk_load._copy_load", return_value=0) as copy_load:
+            bulk_load_installment_plans(plan=self.plan, customers=self.customers, start_date=self.today)
+            with override_settings(INSTALLMENT_BULK_LOAD_USE_COPY=False):
+                bulk_load_installment_plans(plan=self.plan, customers=self.customers, start_date=self.today)
+
+        copy_load.assert_called_once()
+        self._assert_enrolled()
+
+    def test_plan_creator_multi_customer_flow_uses_loader(self) -> None:
+        """PlanCreatorService with `customers` enrolls every customer in one plan."""
+        merchant = MerchantUserFactory()
+        plan = PlanCreatorService(
+            merchant=merchant,
+            name="Bulk Plan",
+            total_amount=Decimal("90.00"),
+            installment_count=3,
+            installment_period=30,
+            customers=self.customers,
+            start_date=self.today,
+        ).execute()
+
+        self.assertIsInstance(plan, Plan)
+        self.assertEqual(plan.installment_plans.count(), 3)
+        self.assertEqual(Installment.objects.filter(installment_plan__plan=plan).count(), 9)
+
+    def test_copy_row_escapes_values_and_fills_defaults(self) -> None:
+        """Rows use COPY text escaping and fall back to field defaults."""
+        self.assertEqual(format_copy_value(None), "\\N")
+        self.assertEqual(format_copy_value("a\tb\\c\n"), "a\\tb\\\\c\\n")
+        self.assertEqual(format_copy_value(Decimal("33.34")), "33.34")
+
+        writer = CopyRowWriter(InstallmentPlan, ["id", "plan_id", "customer_id", "start_date"])
+        row = writer.row(7, self.plan.id, 9, self.today).rstrip("\n").split("\t")
+        values = dict(zip(writer.columns, row))
+
+        self.assertEqual(values["id"], "7")
+        self.assertEqual(values["start_date"], self.today.isoformat())
+        self.assertEqual(values["status"], InstallmentPlan.Status.ACTIVE)
@@ -0,0 +1,119 @@
+"""Tests for the bulk installment payment endpoint."""
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment, InstallmentPlan
+from installment.tests.factories import InstallmentPlanFactory
+from installment.utils.schedule import schedule_cache
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import Plan
+from plan.tests.factories import PlanFactory
+
+
+class InstallmentBulkPaymentAPITest(APITestCase):
+    """Test suite for POST /api/installments/pay/."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        self.customer = CustomerUserFactory()
+        self.plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            installment_count=4,
+            status=Plan.Status.ACTIVE,
+        )
+        self.installment_plan = InstallmentPlanFactory(plan=self.plan, customer=self.customer)
+        self.installments = list(self.installment_plan.installments.order_by('sequence_number'))
+        self.client.force_authenticate(user=self.customer)
+        self.url = reverse('installment_bulk_pay_api')
+
+    def _paid_sequences(self) -> list:
+        return list(
+            self.installment_plan.installments.filter(status=Installment.Status.PAID)
+            .order_by('sequence_number').values_list('sequence_number', flat=True)
+        )
+
+    def test_pay_by_ids(self) -> None:
+        """The next installments are paid together and returned in the single-payment envelope."""
+        ids = [self.installments[1].pk, self.installments[0].pk]
+        response = self.client.post(self.url, {'installment_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['success'])
+        self.assertEqual([item['sequence_number'] for item in response.data['data']], [1, 2])
+        self.assertEqual({item['status'] for item in response.data['data']}, {'paid'})
+        self.assertEqual(self._paid_sequences(), [1, 2])
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.next_payable_sequence, 3)
+
+    def test_pay_through_sequence_completes_plan(self) -> None:
+        """Paying through the last sequence settles the plan in one request."""
+        self.client.post(reverse('installment_pay_api', kwargs={'pk': self.installments[0].pk}))
+
+        # Plan lock, installments, one UPDATE each, plus SAVEPOINT and RELEASE
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                self.url,
+                {'installment_plan_id': self.installment_plan.pk, 'through_sequence': 4},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['sequence_number'] for item in response.data['data']], [2, 3, 4])
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.COMPLETED)
+        self.assertEqual(self.installment_plan.paid_count, 4)
+
+    def test_gap_rejects_the_whole_payment(self) -> None:
+        """Skipping an unpaid installment fails and pays nothing."""
+        ids = [self.installments[0].pk, self.installments[2].pk]
+        response = self.client.post(self.url, {'installment_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self._paid_sequences(), [])
+
+    def test_not_starting_at_next_payable_is_rejected(self) -> None:
+        """The first paid installment must be the plan's next payable one."""
+        ids = [self.installments[1].pk, self.installments[2].pk]
+        response = self.client.post(self.url, {'installment_ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_already_paid_through_sequence_is_rejected(self) -> None:
+        """Paying through a sequence that is already settled is a conflict."""
+        self.client.post(reverse('installment_pay_api', kwargs={'pk': self.installments[0].pk}))
+        response = self.client.post(
+            self.url,
+            {'installment_plan_id': self.installment_plan.pk, 'through_sequence': 1},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_other_customer_installments_are_not_found(self) -> None:
+        """Installments of another customer, or spread over two plans, are not found."""
+        other_plan = InstallmentPlanFactory(plan=self.plan, customer=CustomerUserFactory())
+        other = other_plan.installments.get(sequence_number=1)
+        response = self.client.post(self.url, {'installment_ids': [other.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        second_plan = InstallmentPlanFactory(plan=self.plan, customer=self.customer)
+        ids = [self.installments[0].pk, second_plan.installments.get(sequence_number=1).pk]
+        response = self.client.post(self.url, {'installment_ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self._paid_sequences(), [])
+
+    def test_invalid_body_is_rejected(self) -> None:
+        """Exactly one way of selecting installments must be given."""
+        for body in (
+            {},
+            {'installment_plan_id': self.installment_plan.pk},
+            {'installment_ids': [self.installments[0].pk], 'through_sequence': 2},
+        ):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, body)
+
+    def test_merchant_cannot_use_bulk_payment(self) -> None:
+        """Only customers can pay."""
+        self.client.force_authenticate(user=self.plan.merchant)
+        response = self.client.post(self.url, {'installment_ids': [self.installments[0].pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
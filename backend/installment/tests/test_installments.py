@@ -1,6 +1,9 @@
 """Tests for customer installment listing functionality."""
 from datetime import date, timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
 
@@ -84,3 +87,89 @@ class InstallmentListAPIViewTest(APITestCase):
         """Test unauthenticated users cannot access endpoint."""
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class InstallmentCursorPaginationTest(APITestCase):
+    """Test suite for the opt-in cursor pagination of the installment list."""
+
+    def setUp(self):
+        """Create two plans with paid, overdue and upcoming installments."""
+        self.customer = CustomerUserFactory()
+        merchant = MerchantUserFactory()
+        today = date.today()
+
+        for _ in range(2):
+            with disable_installment_creation_signal():
+                installment_plan = InstallmentPlanFactory(
+                    plan=PlanFactory(merchant=merchant, installment_count=4),
+                    customer=self.customer,
+                )
+            for sequence_number, (days, status_, paid_days_ago) in enumerate(
+                [(-40, Installment.Status.PAID, 41), (-10, Installment.Status.PAID, None),
+                 (-5, Installment.Status.LATE, None), (20, Installment.Status.PENDING, None)],
+                start=1,
+            ):
+                InstallmentFactory(
+                    installment_plan=installment_plan,
+                    sequence_number=sequence_number,
+                    due_date=today + timedelta(days=days),
+                    status=status_,
+                    paid_at=None if paid_days_ago is None else timezone.now() - timedelta(days=paid_days_ago),
+                )
+
+        self.url = reverse("installment_list_api")
+        self.client.force_authenticate(user=self.customer)
+
+    def _walk(self, params: str) -> list:
+        """Follow the next links from the first page and collect the installment ids."""
+        response = self.client.get(f"{self.url}?pagination=cursor&page_size=2{params}")
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["pagination"]["mode"], "cursor")
+            ids.extend(item["id"] for item in response.data["data"])
+            if not response.data["pagination"]["next"]:
+                return ids
+            response = self.client.get(response.data["pagination"]["next"])
+
+    def test_cursor_pages_match_page_number_listing(self):
+        """Walking the cursor pages returns every row once, in the listing order, for each filter."""
+        for params in ["", "&status=upcoming", "&status=past"]:
+            with self.subTest(params=params):
+                expected = [
+                    item["id"] for item in self.client.get(f"{self.url}?page_size=10{params}").data["data"]
+                ]
+                walked = self._walk(params)
+                self.assertEqual(sorted(walked), sorted(expected))
+                self.assertEqual(len(walked), len(set(walked)))
+                if params != "&status=past":
+                    # Page numbers order NULL paid_at differently per database; cursors put them last
+                    self.assertEqual(walked, expected)
+
+    def test_cursor_page_runs_no_count_query(self):
+        """A cursor page skips the COUNT(*) of page number pagination."""
+        first = self.client.get(f"{self.url}?pagination=cursor&page_size=2")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(first.data["pagination"]["next"])
+
+        self.assertEqual(len(response.data["data"]), 2)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+        self.assertNotIn("total_items", response.data["pagination"])
+
+    def test_previous_link_returns_previous_page(self):
+        """The previous link of the second page leads back to the first page."""
+        first = self.client.get(f"{self.url}?pagination=cursor&page_size=3&status=past")
+        self.assertIsNone(first.data["pagination"]["previous"])
+        second = self.client.get(first.data["pagination"]["next"])
+        back = self.client.get(second.data["pagination"]["previous"])
+
+        self.assertEqual(
+            [item["id"] for item in back.data["data"]],
+            [item["id"] for item in first.data["data"]],
+        )
+        self.assertIsNone(back.data["pagination"]["previous"])
+
+    def test_invalid_cursor_is_rejected(self):
+        """A cursor that cannot be decoded returns 404."""
+        response = self.client.get(f"{self.url}?pagination=cursor&cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,120 @@
+"""Tests for the per-customer installment list cache."""
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from customer.tests.factories import CustomerUserFactory
+from installment.models import InstallmentPlan
+from installment.services.list_cache import installment_list_cache
+from installment.services.status import mark_overdue_installments
+from installment.tests.factories import InstallmentPlanFactory
+from installment.utils.bulk_create import bulk_create_installments
+from installment.utils.schedule import schedule_cache
+from installment.utils.signal_control import disable_installment_creation_signal
+from installment.views import InstallmentListAPIView
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import Plan
+from plan.tests.factories import PlanFactory
+
+
+@override_settings(INSTALLMENT_LIST_CACHE='default')
+class InstallmentListCacheTest(APITestCase):
+    """Test suite for caching and invalidation of GET /api/installments/."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        cache.clear()
+        self.customer = CustomerUserFactory()
+        self.plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            installment_count=3,
+            status=Plan.Status.ACTIVE,
+        )
+        self.installment_plan = InstallmentPlanFactory(
+            plan=self.plan,
+            customer=self.customer,
+            start_date=date.today() - timedelta(days=1),
+        )
+        self.client.force_authenticate(user=self.customer)
+        self.url = reverse('installment_list_api')
+
+    def _statuses(self, **params) -> list:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['status'] for item in response.data['data']]
+
+    def test_repeated_request_is_served_from_cache(self) -> None:
+        """The second identical request runs no query, other filters are cached separately."""
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {'status': 'upcoming'})
+
+    def test_payment_invalidates_customer_list(self) -> None:
+        """Paying an installment makes the next request see the paid installment."""
+        self.assertEqual(self._statuses(), ['pending'] * 3)
+
+        first = self.installment_plan.installments.get(sequence_number=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('installment_pay_api', kwargs={'pk': first.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._statuses(), ['paid', 'pending', 'pending'])
+
+    def test_overdue_run_invalidates_customer_list(self) -> None:
+        """Marking installments late makes the next request see them as late."""
+        self.assertEqual(self._statuses(), ['pending'] * 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue_installments()
+
+        self.assertEqual(self._statuses(), ['late', 'pending', 'pending'])
+
+    def test_enrollment_invalidates_customer_list(self) -> None:
+        """Installments generated for a new plan of the customer show up immediately."""
+        self.assertEqual(self.client.get(self.url).data['pagination']['total_items'], 3)
+
+        with disable_installment_creation_signal():
+            installment_plan = InstallmentPlan.objects.create(plan=self.plan, customer=self.customer)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_create_installments([installment_plan])
+
+        self.assertEqual(self.client.get(self.url).data['pagination']['total_items'], 6)
+
+    def test_other_customers_keep_their_entries(self) -> None:
+        """A bump only affects the customer whose installments changed."""
+        other = CustomerUserFactory()
+        InstallmentPlanFactory(plan=self.plan, customer=other)
+        self.client.force_authenticate(user=other)
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue_installments()
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_page_computed_before_a_bump_is_not_served(self) -> None:
+        """A page read before a concurrent bump is stored under the previous version."""
+        paginate = InstallmentListAPIView.paginate_queryset
+
+        def paginate_then_bump(view, queryset):
+            page = paginate(view, queryset)
+            # A payment commits after the page was read, before it is stored
+            installment_list_cache._set_versions([self.customer.pk])
+            return page
+
+        with mock.patch.object(InstallmentListAPIView, 'paginate_queryset', paginate_then_bump):
+            self.client.get(self.url)
+
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
@@ -1,11 +1,15 @@
 from django.test import TestCase
+from django.utils import timezone
 from datetime import date, timedelta
 
-from installment.models import Installment
+from installment.constants import OVERDUE_SCAN_NAME, OVERDUE_SCAN_OVERLAP_DAYS
+from installment.models import Installment, InstallmentPlan, OverdueScanState
 from installment.utils.signal_control import disable_installment_creation_signal
 from plan.tests.factories import PlanFactory
 from installment.tests.factories import InstallmentPlanFactory, InstallmentFactory
-from installment.services.status import mark_overdue_installments
+from installment.services.payment import process_bulk_installment_payment, process_installment_payment
+from installment.services.retrieval import InstallmentRetrievalService
+from installment.services.status import mark_overdue_installments, run_overdue_scan
 
 class OverdueDetectionTest(TestCase):
     """Test suite for detecting overdue installments.
@@ -36,3 +40,143 @@ class OverdueDetectionTest(TestCase):
         # Refresh installment status from the database and check if it's marked as late
         installment.refresh_from_db()
         self.assertEqual(installment.status, Installment.Status.LATE)
+
+    def test_overdue_runs_in_batches_and_defaults_plans(self):
+        """Overdue installments are processed in keyset batches and their plans defaulted."""
+        with disable_installment_creation_signal():
+            other_plan = InstallmentPlanFactory(plan=self.plan)
+            untouched_plan = InstallmentPlanFactory(plan=self.plan)
+
+        past = date.today() - timedelta(days=3)
+        overdue = [
+            InstallmentFactory(installment_plan=self.installment_plan, due_date=past - timedelta(days=i))
+            for i in range(3)
+        ] + [InstallmentFactory(installment_plan=other_plan, due_date=past)]
+        paid = InstallmentFactory(
+            installment_plan=untouched_plan, due_date=past, status=Installment.Status.PAID
+        )
+        upcoming = InstallmentFactory(
+            installment_plan=untouched_plan, due_date=date.today() + timedelta(days=1)
+        )
+
+        result = mark_overdue_installments(batch_size=2)
+
+        self.assertEqual(result.installments_marked, 4)
+        self.assertEqual(result.plans_defaulted, 2)
+        self.assertEqual(result.batches, 2)
+        self.assertGreaterEqual(result.duration_seconds, result.max_batch_seconds)
+
+        for installment in overdue:
+            installment.refresh_from_db()
+            self.assertEqual(installment.status, Installment.Status.LATE)
+        paid.refresh_from_db()
+        upcoming.refresh_from_db()
+        self.assertEqual(paid.status, Installment.Status.PAID)
+        self.assertEqual(upcoming.status, Installment.Status.PENDING)
+
+        self.assertSetEqual(
+            set(InstallmentPlan.objects.filter(status=InstallmentPlan.Status.DEFAULTED).values_list('id', flat=True)),
+            {self.installment_plan.id, other_plan.id},
+        )
+
+        # A second run finds nothing left to do
+        self.assertEqual(mark_overdue_installments(batch_size=2).installments_marked, 0)
+
+
+class OverdueScanWatermarkTest(TestCase):
+    """Test suite for the incremental, locked overdue scan."""
+
+    def setUp(self):
+        self.today = date.today()
+        with disable_installment_creation_signal():
+            self.installment_plan = InstallmentPlanFactory(plan=PlanFactory())
+
+    def _installment(self, days_ago):
+        return InstallmentFactory(
+            installment_plan=self.installment_plan,
+            due_date=self.today - timedelta(days=days_ago),
+        )
+
+    def test_scan_only_examines_due_dates_after_watermark(self):
+        """Due dates before the overlap window are not rescanned; missed days are caught up."""
+        OverdueScanState.objects.create(
+            name=OVERDUE_SCAN_NAME,
+            last_processed_due_date=self.today - timedelta(days=4),
+        )
+        old = self._installment(days_ago=4 + OVERDUE_SCAN_OVERLAP_DAYS)
+        missed = [self._installment(days_ago=3), self._installment(days_ago=1)]
+
+        result = run_overdue_scan(today=self.today)
+
+        self.assertEqual(result.installments_marked, 2)
+        old.refresh_from_db()
+        self.assertEqual(old.status, Installment.Status.PENDING)
+        for installment in missed:
+            installment.refresh_from_db()
+            self.assertEqual(installment.status, Installment.Status.LATE)
+
+        state = OverdueScanState.objects.get(name=OVERDUE_SCAN_NAME)
+        self.assertEqual(state.last_processed_due_date, self.today - timedelta(days=1))
+        self.assertIsNone(state.locked_until)
+
+        # Same day again: already up to date
+        self.assertIsNone(run_overdue_scan(today=self.today))
+
+        # A full scan ignores the watermark
+        self.assertEqual(run_overdue_scan(today=self.today, full_scan=True).installments_marked, 1)
+
+    def test_scan_rescans_due_dates_behind_the_watermark(self):
+        """A pending installment inserted with an already scanned due date is marked by the next run."""
+        run_overdue_scan(today=self.today)
+        back_dated = self._installment(days_ago=OVERDUE_SCAN_OVERLAP_DAYS - 1)
+
+        result = run_overdue_scan(today=self.today + timedelta(days=1))
+
+        self.assertEqual(result.installments_marked, 1)
+        back_dated.refresh_from_db()
+        self.assertEqual(back_dated.status, Installment.Status.LATE)
+
+    def test_scan_is_skipped_while_another_run_holds_the_lock(self):
+        """An overlapping invocation does nothing and leaves the watermark alone."""
+        OverdueScanState.objects.create(
+            name=OVERDUE_SCAN_NAME,
+            locked_until=timezone.now() + timedelta(minutes=5),
+        )
+        installment = self._installment(days_ago=1)
+
+        self.assertIsNone(run_overdue_scan(today=self.today))
+
+        installment.refresh_from_db()
+        self.assertEqual(installment.status, Installment.Status.PENDING)
+        self.assertIsNone(OverdueScanState.objects.get(name=OVERDUE_SCAN_NAME).last_processed_due_date)
+
+    def test_late_installments_remain_payable_on_defaulted_plans(self):
+        """A customer behind on payments can pay the late installments, which reactivates the plan."""
+        late = [
+            InstallmentFactory(
+                installment_plan=self.installment_plan,
+                due_date=date.today() - timedelta(days=days_ago),
+                sequence_number=sequence_number,
+            )
+            for sequence_number, days_ago in ((1, 40), (2, 10))
+        ]
+        InstallmentFactory(
+            installment_plan=self.installment_plan, due_date=date.today() + timedelta(days=20), sequence_number=3,
+        )
+        mark_overdue_installments()
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.DEFAULTED)
+
+        customer = self.installment_plan.customer
+        payable = InstallmentRetrievalService(customer).get_customer_installments().filter(is_payable=True)
+        self.assertEqual([installment.pk for installment in payable], [late[0].pk])
+
+        process_installment_payment(late[0])
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.DEFAULTED)
+
+        process_bulk_installment_payment(customer, installment_ids=[late[1].pk])
+        late[1].refresh_from_db()
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(late[1].status, Installment.Status.PAID)
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.ACTIVE)
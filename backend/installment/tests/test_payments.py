@@ -1,8 +1,17 @@
+import threading
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from core.exceptions import BusinessException
 from customer.tests.factories import CustomerUserFactory
 from installment.models import Installment, InstallmentPlan
+from installment.services.payment import process_installment_payment
+from installment.utils.schedule import schedule_cache
 from installment.utils.signal_control import disable_installment_creation_signal
 from merchant.tests.factories import MerchantUserFactory
 from plan.models import Plan
@@ -89,3 +98,98 @@ class InstallmentPaymentAPITest(APITestCase):
         url = reverse('installment_pay_api', kwargs={'pk': self.installment.id})
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_retried_payment_replays_success(self):
+        """A retry with the same Idempotency-Key gets the first 200 instead of 'already paid'."""
+        cache.clear()
+        self.client.force_authenticate(user=self.customer)
+        url = reverse('installment_pay_api', kwargs={'pk': self.installment.id})
+
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY='pay-1')
+        retry = self.client.post(url, HTTP_IDEMPOTENCY_KEY='pay-1')
+        without_key = self.client.post(url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(without_key.status_code, status.HTTP_409_CONFLICT)
+
+
+class InstallmentPaymentServiceTest(TestCase):
+    """Test suite for the locked payment path of process_installment_payment()."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        self.customer = CustomerUserFactory()
+        plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            installment_count=2,
+            status=Plan.Status.ACTIVE,
+        )
+        self.installment_plan = InstallmentPlanFactory(plan=plan, customer=self.customer)
+
+    def test_payment_runs_a_bounded_number_of_queries(self) -> None:
+        """Lock, installment update and plan update, whichever installment is paid."""
+        for sequence_number in (1, 2):
+            installment = self.installment_plan.installments.get(sequence_number=sequence_number)
+            # SAVEPOINT and RELEASE of the atomic block are counted as well
+            with self.assertNumQueries(5):
+                process_installment_payment(installment)
+
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.COMPLETED)
+        self.assertEqual(self.installment_plan.paid_count, 2)
+        self.assertIsNone(self.installment_plan.next_payable_sequence)
+
+    def test_stale_instance_cannot_be_paid_twice(self) -> None:
+        """Validation uses the row read under lock, not the instance passed in."""
+        installment = self.installment_plan.installments.get(sequence_number=1)
+        stale = Installment.objects.get(pk=installment.pk)
+        process_installment_payment(installment)
+
+        with self.assertRaises(BusinessException) as raised:
+            process_installment_payment(stale)
+        self.assertEqual(raised.exception.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.installment_plan.installments.filter(status=Installment.Status.PAID).count(), 1)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentInstallmentPaymentTest(TransactionTestCase):
+    """Concurrent payments of the same installment from separate connections."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            installment_count=2,
+            status=Plan.Status.ACTIVE,
+        )
+        self.installment_plan = InstallmentPlanFactory(plan=plan, customer=CustomerUserFactory())
+
+    def test_concurrent_payments_pay_once(self) -> None:
+        """Exactly one of several simultaneous payments succeeds; the others conflict."""
+        installment = self.installment_plan.installments.get(sequence_number=1)
+        workers = 4
+        barrier = threading.Barrier(workers)
+        outcomes = []
+
+        def pay() -> None:
+            try:
+                barrier.wait()
+                process_installment_payment(Installment(pk=installment.pk))
+                outcomes.append('paid')
+            except BusinessException as exc:
+                outcomes.append(exc.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=pay) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(Counter(outcomes), {'paid': 1, status.HTTP_409_CONFLICT: workers - 1})
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.paid_count, 1)
+        self.assertEqual(self.installment_plan.next_payable_sequence, 2)
@@ -0,0 +1,301 @@
+"""Tests for the progress fields denormalized onto InstallmentPlan."""
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment, InstallmentPlan
+from installment.services.payment import process_installment_payment
+from installment.services.progress import reconcile_plan_progress, refresh_plan_progress
+from installment.services.status import mark_overdue_installments
+from installment.tests.factories import InstallmentPlanFactory
+from installment.utils.bulk_create import bulk_create_installments
+from installment.utils.schedule import schedule_cache
+from installment.utils.signal_control import disable_installment_creation_signal
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import Plan
+from plan.tests.factories import PlanFactory
+
+
+class NextPayableSequenceTest(TestCase):
+    """Test suite for maintenance of InstallmentPlan.next_payable_sequence."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        self.customer = CustomerUserFactory()
+        self.plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            installment_count=3,
+            status=Plan.Status.ACTIVE,
+        )
+
+    def test_generated_installment_plan_starts_at_first_installment(self) -> None:
+        """Installments generated on creation make the first one payable."""
+        installment_plan = InstallmentPlanFactory(plan=self.plan, customer=self.customer)
+        installment_plan.refresh_from_db()
+        self.assertEqual(installment_plan.next_payable_sequence, 1)
+
+    def test_bulk_created_installments_refresh_plans(self) -> None:
+        """bulk_create_installments() refreshes the plans it generated installments for."""
+        with disable_installment_creation_signal():
+            installment_plans = InstallmentPlan.objects.bulk_create([
+                InstallmentPlan(plan=self.plan, customer=self.customer) for _ in range(3)
+            ])
+        bulk_create_installments(installment_plans, batch_size=2)
+
+        self.assertEqual(
+            set(InstallmentPlan.objects.values_list('next_payable_sequence', flat=True)),
+            {1},
+        )
+
+    def test_paying_installments_advances_sequence(self) -> None:
+        """Each paid installment moves the sequence on, and it is cleared once all are paid."""
+        installment_plan = InstallmentPlanFactory(plan=self.plan, customer=self.customer)
+
+        for expected in (2, 3, None):
+            installment = installment_plan.installments.exclude(status=Installment.Status.PAID).first()
+            installment.status = Installment.Status.PAID
+            installment.save()
+            installment_plan.refresh_from_db()
+            self.assertEqual(installment_plan.next_payable_sequence, expected)
+
+    def test_saving_stale_plan_keeps_sequence(self) -> None:
+        """A full save() of an outdated instance does not overwrite the denormalized value."""
+        installment_plan = InstallmentPlanFactory(plan=self.plan, customer=self.customer)
+        stale = InstallmentPlan.objects.get(pk=installment_plan.pk)
+
+        installment = installment_plan.installments.get(sequence_number=1)
+        installment.status = Installment.Status.PAID
+        installment.save()
+
+        stale.status = InstallmentPlan.Status.DEFAULTED
+        stale.save()
+
+        installment_plan.refresh_from_db()
+        self.assertEqual(installment_plan.status, InstallmentPlan.Status.DEFAULTED)
+        self.assertEqual(installment_plan.next_payable_sequence, 2)
+
+    def test_refresh_repairs_bulk_updates(self) -> None:
+        """refresh_plan_progress() recomputes the sequence after queryset updates."""
+        installment_plan = InstallmentPlanFactory(plan=self.plan, customer=self.customer)
+        installment_plan.installments.filter(sequence_number__lte=2).update(status=Installment.Status.PAID)
+
+        self.assertEqual(refresh_plan_progress([installment_plan.pk]), 1)
+        installment_plan.refresh_from_db()
+        self.assertEqual(installment_plan.next_payable_sequence, 3)
+
+
+class InstallmentPayabilityAPITest(APITestCase):
+    """Test suite for is_payable derived from next_payable_sequence."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        self.customer = CustomerUserFactory()
+        plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            installment_count=3,
+            status=Plan.Status.ACTIVE,
+        )
+        self.installment_plan = InstallmentPlanFactory(plan=plan, customer=self.customer)
+        self.client.force_authenticate(user=self.customer)
+
+    def _payable_sequences(self) -> list:
+        response = self.client.get(reverse('installment_list_api'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['sequence_number'] for item in response.data['data'] if item['is_payable']]
+
+    def test_only_next_installment_is_payable(self) -> None:
+        """Only the first unpaid installment is listed as payable, before and after a payment."""
+        self.assertEqual(self._payable_sequences(), [1])
+
+        first = self.installment_plan.installments.get(sequence_number=1)
+        response = self.client.post(reverse('installment_pay_api', kwargs={'pk': first.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._payable_sequences(), [2])
+
+    def test_out_of_order_payment_is_rejected(self) -> None:
+        """Paying an installment after an unpaid one is rejected."""
+        third = self.installment_plan.installments.get(sequence_number=3)
+        response = self.client.post(reverse('installment_pay_api', kwargs={'pk': third.pk}))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+
+class PlanProgressCountersTest(TestCase):
+    """Test suite for the progress counters kept on InstallmentPlan."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        self.plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            total_amount=Decimal('300.00'),
+            installment_count=3,
+            status=Plan.Status.ACTIVE,
+        )
+        self.installment_plan = InstallmentPlanFactory(
+            plan=self.plan,
+            customer=CustomerUserFactory(),
+            start_date=date.today() - timedelta(days=45),
+        )
+
+    def test_counters_follow_payments(self) -> None:
+        """A payment moves the paid count, the outstanding amount and the next due date."""
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.total_count, 3)
+        self.assertEqual(self.installment_plan.paid_count, 0)
+        self.assertEqual(self.installment_plan.outstanding_amount, Decimal('300.00'))
+        self.assertEqual(self.installment_plan.next_due_date, self.installment_plan.start_date)
+
+        process_installment_payment(self.installment_plan.installments.get(sequence_number=1))
+
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.paid_count, 1)
+        self.assertEqual(self.installment_plan.outstanding_amount, Decimal('200.00'))
+        self.assertEqual(
+            self.installment_plan.next_due_date,
+            self.installment_plan.start_date + timedelta(days=self.plan.installment_period),
+        )
+
+    def test_overdue_run_skips_late_installments_for_next_due_date(self) -> None:
+        """Installments marked late no longer count as the next pending due date."""
+        mark_overdue_installments()
+
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.DEFAULTED)
+        self.assertEqual(
+            self.installment_plan.next_due_date,
+            self.installment_plan.installments.get(status=Installment.Status.PENDING).due_date,
+        )
+        self.assertEqual(self.installment_plan.outstanding_amount, Decimal('300.00'))
+
+    def test_verify_command_reports_and_rebuild_repairs_drift(self) -> None:
+        """rebuild_plan_progress --verify fails on drift, and a rebuild repairs it."""
+        call_command('rebuild_plan_progress', '--verify', stdout=StringIO())
+
+        InstallmentPlan.objects.filter(pk=self.installment_plan.pk).update(paid_count=2, next_due_date=None)
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_plan_progress', '--verify', stdout=out)
+        self.assertIn('paid_count, next_due_date', out.getvalue())
+
+        call_command('rebuild_plan_progress', '--batch-size', '1', stdout=StringIO())
+        call_command('rebuild_plan_progress', '--verify', stdout=StringIO())
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.paid_count, 0)
+
+
+class PlanCompletionTest(TestCase):
+    """Test suite for counter-driven plan completion and its reconciliation."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        plan = PlanFactory(
+            merchant=MerchantUserFactory(),
+            installment_count=2,
+            status=Plan.Status.ACTIVE,
+        )
+        self.installment_plan = InstallmentPlanFactory(plan=plan, customer=CustomerUserFactory())
+
+    def _pay(self, sequence_number: int) -> None:
+        installment = self.installment_plan.installments.get(sequence_number=sequence_number)
+        installment.status = Installment.Status.PAID
+        installment.save()
+
+    def test_last_paid_installment_completes_plan_without_scanning(self) -> None:
+        """Completion is one conditional UPDATE; only the saved installment itself is read."""
+        self._pay(1)
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.ACTIVE)
+
+        installment = self.installment_plan.installments.get(sequence_number=2)
+        installment.status = Installment.Status.PAID
+        with CaptureQueriesContext(connection) as queries:
+            installment.save()
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        reads = [sql for sql in statements if sql.startswith('SELECT') and '"status"' in sql]
+        self.assertEqual(len(reads), 1)
+        self.assertIn(f'WHERE "installment_installment"."id" = {installment.pk}', reads[0])
+        self.assertTrue(statements[-1].startswith('UPDATE "installment_installmentplan" SET "status"'))
+        # Counters are shifted, not recounted from the installments
+        self.assertNotIn('COUNT(', statements[-1])
+        self.assertNotIn('SUM(', statements[-1])
+
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.COMPLETED)
+
+    def test_completion_leaves_defaulted_plans_alone(self) -> None:
+        """Only active plans are completed by their counters."""
+        InstallmentPlan.objects.filter(pk=self.installment_plan.pk).update(status=InstallmentPlan.Status.DEFAULTED)
+        self._pay(1)
+        self._pay(2)
+
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.DEFAULTED)
+
+    def test_installment_edits_shift_counters(self) -> None:
+        """Amount changes, payments and reverted payments keep the counters exact."""
+        installment = self.installment_plan.installments.get(sequence_number=1)
+        installment.amount = Decimal(str(installment.amount)) + Decimal('10.00')
+        installment.save()
+        self._pay(1)
+        installment = self.installment_plan.installments.get(sequence_number=1)
+        installment.status = Installment.Status.PENDING
+        installment.save()
+        self.installment_plan.installments.create(
+            amount=Decimal('5.00'), due_date=date.today() + timedelta(days=365), sequence_number=3,
+        )
+
+        self.assertEqual(reconcile_plan_progress(repair=False).drifted, 0)
+        self.installment_plan.refresh_from_db()
+        self.assertEqual((self.installment_plan.paid_count, self.installment_plan.total_count), (0, 3))
+        self.assertEqual(self.installment_plan.next_payable_sequence, 1)
+
+    def test_deleted_installment_leaves_counters(self) -> None:
+        """Deleting an installment removes it from the counters; deleting the last unpaid one completes the plan."""
+        self._pay(1)
+        unpaid = self.installment_plan.installments.get(sequence_number=2)
+
+        unpaid.delete()
+
+        self.installment_plan.refresh_from_db()
+        self.assertEqual((self.installment_plan.paid_count, self.installment_plan.total_count), (1, 1))
+        self.assertEqual(self.installment_plan.outstanding_amount, Decimal('0.00'))
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.COMPLETED)
+        self.assertEqual(reconcile_plan_progress(repair=False).drifted, 0)
+
+    def test_saves_of_other_fields_read_nothing(self) -> None:
+        """A save limited to fields outside the progress does not read the stored installment."""
+        installment = self.installment_plan.installments.get(sequence_number=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            installment.save(update_fields=['paid_at'])
+
+        self.assertFalse([query['sql'] for query in queries.captured_queries if '"status"' in query['sql']])
+
+    def test_reconciliation_repairs_drifted_counters_and_completion(self) -> None:
+        """Installments paid behind the counters' back are detected and the plan is completed."""
+        self.installment_plan.installments.update(status=Installment.Status.PAID)
+
+        result = reconcile_plan_progress(repair=False)
+        self.assertEqual((result.checked, result.drifted, result.repaired), (1, 1, 0))
+        self.assertIn('paid_count', result.sample[self.installment_plan.pk])
+        self.assertIn('status', result.sample[self.installment_plan.pk])
+
+        out = StringIO()
+        call_command('rebuild_plan_progress', '--verify', '--repair', stdout=out)
+        self.assertIn('Repaired 1 of 1', out.getvalue())
+
+        self.installment_plan.refresh_from_db()
+        self.assertEqual(self.installment_plan.status, InstallmentPlan.Status.COMPLETED)
+        self.assertEqual(self.installment_plan.paid_count, 2)
+        self.assertEqual(reconcile_plan_progress(repair=False).drifted, 0)
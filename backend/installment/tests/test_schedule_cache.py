@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from installment.models import InstallmentPlan
+from installment.utils.schedule import (
+    ScheduleCache,
+    compute_schedule,
+    get_schedule,
+    schedule_cache,
+    schedule_key,
+)
+from plan.tests.factories import PlanFactory
+
+
+class ScheduleCacheTests(TestCase):
+    """Tests for the memoized schedule lookup used by enrollment."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        cache.clear()
+        self.plan = PlanFactory(
+            installment_count=4,
+            total_amount=Decimal("100.00"),
+            installment_period=30,
+        )
+
+    def _installment_plan(self, plan=None) -> InstallmentPlan:
+        return InstallmentPlan(plan=plan or self.plan, start_date=date.today())
+
+    def test_repeated_template_is_served_from_cache(self) -> None:
+        """The first lookup is a miss; later lookups for the template are hits."""
+        with mock.patch(
+            "installment.utils.schedule.compute_schedule",
+            wraps=compute_schedule,
+        ) as compute_mock:
+            first = get_schedule(self._installment_plan())
+            for _ in range(4):
+                self.assertIs(get_schedule(self._installment_plan()), first)
+
+        self.assertEqual(compute_mock.call_count, 1)
+        stats = schedule_cache.stats()
+        self.assertEqual(stats["hits"], 4)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_equivalent_amounts_share_one_key(self) -> None:
+        """Amounts that differ only in representation map to the same entry."""
+        self.assertEqual(schedule_key(100, 4, 30), schedule_key(Decimal("100.00"), 4, 30))
+        self.assertNotEqual(schedule_key(100, 4, 30), schedule_key(100, 4, 15))
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        """A full cache evicts the entry that was used least recently."""
+        lru = ScheduleCache(maxsize=2)
+        keys = [schedule_key(amount, 2, 30) for amount in (10, 20, 30)]
+        lru.set(keys[0], compute_schedule(*keys[0]))
+        lru.set(keys[1], compute_schedule(*keys[1]))
+        lru.get(keys[0])
+        lru.set(keys[2], compute_schedule(*keys[2]))
+
+        self.assertIsNotNone(lru.get(keys[0]))
+        self.assertIsNone(lru.get(keys[1]))
+        self.assertEqual(lru.stats()["size"], 2)
+
+    @override_settings(INSTALLMENT_SCHEDULE_SHARED_CACHE="default")
+    def test_shared_cache_is_used_after_local_miss(self) -> None:
+        """A schedule computed by another worker is reused without recomputing."""
+        get_schedule(self._installment_plan())
+        # Simulate a fresh worker: local cache empty, shared cache populated
+        schedule_cache.clear()
+
+        with mock.patch("installment.utils.schedule.compute_schedule") as compute_mock:
+            schedule = get_schedule(self._installment_plan())
+
+        compute_mock.assert_not_called()
+        self.assertEqual(sum(schedule.amounts), Decimal("100.00"))
+        self.assertEqual(schedule_cache.stats()["shared_hits"], 1)
@@ -1,7 +1,8 @@
 from django.urls import path
-from installment.views import InstallmentPaymentAPIView, InstallmentListAPIView
+from installment.views import InstallmentBulkPaymentAPIView, InstallmentPaymentAPIView, InstallmentListAPIView
 
 urlpatterns = [
     path('', InstallmentListAPIView.as_view(), name='installment_list_api'),
     path('<int:pk>/pay/', InstallmentPaymentAPIView.as_view(), name='installment_pay_api'),
+    path('pay/', InstallmentBulkPaymentAPIView.as_view(), name='installment_bulk_pay_api'),
 ]
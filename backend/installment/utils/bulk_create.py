@@ -1,39 +1,34 @@
-from decimal import Decimal
-from typing import Iterable
-from dateutil.relativedelta import relativedelta
-from django.core.exceptions import ValidationError
-from django.utils.translation import gettext_lazy as _
-from rest_framework import status
-
-from core.exceptions import BusinessException
+from itertools import islice
+from typing import Iterable, Iterator
+
+from analytics.services.invalidation import invalidate_merchant_analytics
 from core.logging.logger import get_logger
+from installment.constants import INSTALLMENT_BULK_CREATE_BATCH_SIZE
 from installment.models import Installment, InstallmentPlan
+from installment.services.list_cache import invalidate_customer_installments
+from installment.services.progress import refresh_plan_progress
+from installment.utils.schedule import get_schedule
 
 logger = get_logger(__name__)
 
 
-def bulk_create_installments(installment_plans: Iterable[InstallmentPlan]) -> None:
+def generate_installments(installment_plans: Iterable[InstallmentPlan]) -> Iterator[Installment]:
     """
-    Bulk create Installment objects for the given InstallmentPlan instances.
+    Lazily generate unsaved Installment objects for the given InstallmentPlan instances.
 
-    For each InstallmentPlan, this function:
-      - Computes the base amount by dividing total_amount by installment_count.
-      - Calculates due dates using the installment period and start date.
-      - Adjusts the last installment to absorb any rounding discrepancies.
-      - Validates amounts are positive before creation.
+    The schedule (cent split and due-date offsets) of each plan template comes from
+    the schedule cache and is shifted onto each InstallmentPlan's start date.
 
     Args:
-        installment_plans (Iterable[InstallmentPlan]): Iterable of InstallmentPlan objects
+        installment_plans (Iterable[InstallmentPlan]): InstallmentPlan objects
             for which installments should be generated.
 
-    Returns:
-        None
+    Yields:
+        Installment: Unsaved installments, grouped by installment plan.
 
     Raises:
-        ValueError: If any calculated installment amount would be invalid
+        BusinessException: If the schedule of a plan template is invalid.
     """
-    installments: list[Installment] = []
-
     for installment_plan in installment_plans:
         plan = installment_plan.plan
         # Skip invalid plans (should be prevented by validation)
@@ -41,7 +36,7 @@ def bulk_create_installments(installment_plans: Iterable[InstallmentPlan]) -> No
             logger.critical(
                 "invalid_plan_installment_count",
                 operation="bulk_create_installments",
-                user_id=plan.merchant.id,
+                user_id=plan.merchant_id,
                 installment_count=plan.installment_count
             )
             continue
@@ -49,74 +44,45 @@ def bulk_create_installments(installment_plans: Iterable[InstallmentPlan]) -> No
             logger.critical(
                 "invalid_plan_total_amount",
                 operation="bulk_create_installments",
-                user_id=plan.merchant.id,
+                user_id=plan.merchant_id,
                 total_amount=plan.total_amount
             )
             continue
 
-        count = plan.installment_count
-        total = Decimal(str(plan.total_amount))  # Ensure Decimal
-
-        # Convert total to cents using rounding to nearest cent
-        total_cents = int((total * 100).to_integral_value())
-        base_cents = total_cents // count
-        remainder = total_cents % count  # Extra cents to distribute
-
-        for seq in range(1, count + 1):
-            # Distribute extra cents to first 'remainder' installments
-            cents = base_cents + (1 if seq <= remainder else 0)
-            amount = Decimal(cents) / Decimal(100)
-
-            # Validate amount is positive
-            if amount <= 0:
-                logger.critical(
-                    "invalid_calc_installment_amount",
-                    operation="bulk_create_installments",
-                    user_id=plan.merchant.id,
-                    plan_id=plan.id,
-                    installment_plan_id=installment_plan.id,
-                    sequence_number=seq,
-                    base_cents=base_cents,
-                    calc_amount=amount
-                )
-                raise BusinessException(
-                    message=str(_("An issue occurred while creating installments.")),
-                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
-                )
-
-            # Calculate due date (n-1 periods after start)
-            due_date = installment_plan.start_date + relativedelta(
-                days=plan.installment_period * (seq - 1)
-            )
+        yield from get_schedule(installment_plan).build_installments(installment_plan)
 
-            installments.append(
-                Installment(
-                    installment_plan=installment_plan,
-                    amount=amount,
-                    due_date=due_date,
-                    sequence_number=seq,
-                )
-            )
 
-    # Validate all installments before bulk create
-    for installment in installments:
-        try:
-            installment.full_clean()
-        except ValidationError:
-            logger.critical(
-                "validation_error_on_installment_full_clean",
-                operation="bulk_create_installments",
-                exc_info=True,
-                user_id=installment.installment_plan.plan.merchant.id,
-                plan_id=installment.installment_plan.plan.id,
-                plan_total_amount=installment.installment_plan.plan.total_amount,
-                installment_plan_id=installment.installment_plan.id,
-                installment_amount=installment.amount,
-                sequence_number=installment.sequence_number,
-            )
-            raise BusinessException(
-                message=str(_("An issue occurred while creating installments.")),
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
-            )
+def bulk_create_installments(
+    installment_plans: Iterable[InstallmentPlan],
+    batch_size: int = INSTALLMENT_BULK_CREATE_BATCH_SIZE,
+) -> None:
+    """
+    Bulk create Installment objects for the given InstallmentPlan instances.
+
+    Installments are generated lazily and inserted in batches of `batch_size`,
+    so memory use stays flat regardless of how many plans are enrolled.
+    bulk_create() sends no post_save signals, so the progress fields of the
+    plans in each batch are refreshed right after it is inserted, and the
+    cached installment lists of their customers and dashboards of their
+    merchants are invalidated.
+    Callers creating several plans should wrap the call in a transaction, since
+    an invalid template found later on leaves earlier batches inserted.
+
+    Args:
+        installment_plans (Iterable[InstallmentPlan]): Iterable of InstallmentPlan objects
+            for which installments should be generated.
+        batch_size (int): Maximum number of installments per INSERT statement.
+
+    Returns:
+        None
+
+    Raises:
+        BusinessException: If any calculated installment amount would be invalid
+    """
+    installments = generate_installments(installment_plans)
 
-    Installment.objects.bulk_create(installments)
+    while batch := list(islice(installments, batch_size)):
+        Installment.objects.bulk_create(batch, batch_size=batch_size)
+        refresh_plan_progress({installment.installment_plan_id for installment in batch})
+        invalidate_customer_installments({installment.installment_plan.customer_id for installment in batch})
+        invalidate_merchant_analytics({installment.installment_plan.plan.merchant_id for installment in batch})
@@ -0,0 +1,264 @@
+"""Bulk loader for enrolling many customers into one plan template.
+
+On PostgreSQL, InstallmentPlan and Installment rows are streamed to the
+database with ``COPY ... FROM STDIN`` without building ORM objects. Other
+database backends fall back to chunked ``bulk_create``.
+"""
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, models
+from django.utils import timezone
+
+from analytics.services.invalidation import invalidate_merchant_analytics
+from core.logging.logger import get_logger
+from installment.constants import INSTALLMENT_BULK_CREATE_BATCH_SIZE
+from installment.models import Installment, InstallmentPlan
+from installment.services.list_cache import invalidate_customer_installments
+from installment.utils.bulk_create import bulk_create_installments
+from installment.utils.schedule import InstallmentSchedule, get_schedule, schedule_cache
+from plan.models import Plan
+
+User = get_user_model()
+logger = get_logger(__name__)
+
+# COPY text format: NULL marker and characters that must be escaped
+COPY_NULL = '\\N'
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def format_copy_value(value: Any) -> str:
+    """Render a Python value as a field of PostgreSQL's COPY text format.
+
+    Args:
+        value: A value already converted to its database representation.
+
+    Returns:
+        str: The escaped text representation of the value.
+    """
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (int, Decimal)):
+        return str(value)
+    return str(value).translate(COPY_ESCAPES)
+
+
+class IteratorFile(io.TextIOBase):
+    """Read-only file object over an iterator of text lines.
+
+    ``cursor.copy_expert`` pulls data through ``read()``, so rows are produced
+    on demand and never held in memory all at once.
+    """
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._buffer = ''
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        if size < 0:
+            chunk, self._buffer = self._buffer, ''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+class CopyRowWriter:
+    """Build COPY rows for a model from a few varying columns.
+
+    Columns that are not passed per row are filled with the field default,
+    prepared once, so new fields with defaults do not break the loader. An
+    auto primary key that is not passed is left to the database.
+    """
+
+    def __init__(self, model: type[models.Model], varying_fields: Sequence[str]) -> None:
+        """
+        Args:
+            model: The model whose table is loaded.
+            varying_fields: Attribute names of the fields supplied for every row.
+        """
+        self.model = model
+        self.varying_fields = list(varying_fields)
+        self.columns: List[str] = []
+        self._template: List[Any] = []
+        self._positions: Dict[str, int] = {}
+
+        for field in model._meta.concrete_fields:
+            if field.attname not in self.varying_fields and field.primary_key:
+                continue
+            self.columns.append(field.column)
+            if field.attname in self.varying_fields:
+                self._positions[field.attname] = len(self._template)
+                self._template.append(None)
+            else:
+                value = field.get_db_prep_save(field.get_default(), connection)
+                self._template.append(format_copy_value(value))
+
+        missing = set(self.varying_fields) - set(self._positions)
+        if missing:
+            raise ValueError(f"Unknown fields for {model.__name__}: {sorted(missing)}")
+
+    @property
+    def copy_sql(self) -> str:
+        """The ``COPY ... FROM STDIN`` statement for this model's table."""
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(column) for column in self.columns)
+        return f"COPY {quote(self.model._meta.db_table)} ({columns}) FROM STDIN"
+
+    def row(self, *values: Any) -> str:
+        """Render one row; `values` follow the order of `varying_fields`."""
+        fields = list(self._template)
+        for name, value in zip(self.varying_fields, values):
+            fields[self._positions[name]] = format_copy_value(value)
+        return '\t'.join(fields) + '\n'
+
+
+def bulk_load_installment_plans(
+    plan: Plan,
+    customers: Iterable[User],
+    start_date: date,
+    use_copy: Optional[bool] = None,
+    batch_size: int = INSTALLMENT_BULK_CREATE_BATCH_SIZE,
+) -> int:
+    """Create one InstallmentPlan per customer, with all its installments.
+
+    Customers are processed in chunks of `batch_size`. Callers should wrap the
+    call in a transaction so a failure does not leave a partial enrollment.
+
+    Args:
+        plan: The plan template to enroll customers into.
+        customers: The customers to enroll.
+        start_date: Due date of the first installment of every plan.
+        use_copy: Use ``COPY FROM STDIN`` when the database is PostgreSQL.
+            Defaults to the ``INSTALLMENT_BULK_LOAD_USE_COPY`` setting.
+        batch_size: Number of customers per chunk.
+
+    Returns:
+        int: Number of installment plans created.
+
+    Raises:
+        BusinessException: If the plan template produces an invalid schedule.
+    """
+    if use_copy is None:
+        use_copy = getattr(settings, 'INSTALLMENT_BULK_LOAD_USE_COPY', True)
+    if use_copy and connection.vendor == 'postgresql':
+        created = _copy_load(plan, customers, start_date, batch_size)
+    else:
+        created = _bulk_create_load(plan, customers, start_date, batch_size)
+
+    logger.info(
+        "installment_plans_bulk_loaded",
+        operation="bulk_load_installment_plans",
+        plan_id=plan.id,
+        installment_plans=created,
+        schedule_cache=schedule_cache.stats(),
+    )
+    return created
+
+
+def _bulk_create_load(
+    plan: Plan,
+    customers: Iterable[User],
+    start_date: date,
+    batch_size: int,
+) -> int:
+    """Portable fallback: chunked ``bulk_create`` of plans and installments."""
+    created = 0
+    customers = iter(customers)
+
+    while chunk := list(islice(customers, batch_size)):
+        # bulk_create() does not send post_save, so installments are generated here
+        installment_plans = InstallmentPlan.objects.bulk_create(
+            [InstallmentPlan(plan=plan, customer=customer, start_date=start_date) for customer in chunk],
+            batch_size=batch_size,
+        )
+        bulk_create_installments(installment_plans, batch_size=batch_size)
+        created += len(installment_plans)
+
+    return created
+
+
+def _copy_load(
+    plan: Plan,
+    customers: Iterable[User],
+    start_date: date,
+    batch_size: int,
+) -> int:
+    """PostgreSQL path: reserve ids from the sequence, then COPY both tables."""
+    schedule = get_schedule(InstallmentPlan(plan=plan, start_date=start_date))
+
+    plan_writer = CopyRowWriter(
+        InstallmentPlan,
+        [
+            'id', 'created_at', 'updated_at', 'plan_id', 'customer_id', 'start_date',
+            'next_payable_sequence', 'total_count', 'next_due_date', 'outstanding_amount',
+        ],
+    )
+    installment_writer = CopyRowWriter(
+        Installment,
+        ['created_at', 'updated_at', 'installment_plan_id', 'amount', 'due_date', 'sequence_number'],
+    )
+    plan_table = InstallmentPlan._meta.db_table
+    due_dates = list(schedule.due_dates(start_date))
+    outstanding_amount = sum(schedule.amounts)
+
+    created = 0
+    customers = iter(customers)
+
+    with connection.cursor() as cursor:
+        while chunk := list(islice(customers, batch_size)):
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [plan_table, len(chunk)],
+            )
+            plan_ids = [row[0] for row in cursor.fetchall()]
+            now = timezone.now()
+
+            # Every installment is still pending, so progress follows from the schedule
+            plan_rows = (
+                plan_writer.row(
+                    plan_id, now, now, plan.id, customer.pk, start_date,
+                    1, schedule.installment_count, due_dates[0], outstanding_amount,
+                )
+                for plan_id, customer in zip(plan_ids, chunk)
+            )
+            cursor.copy_expert(plan_writer.copy_sql, IteratorFile(plan_rows))
+
+            cursor.copy_expert(
+                installment_writer.copy_sql,
+                IteratorFile(_installment_rows(installment_writer, schedule, due_dates, plan_ids, now)),
+            )
+            invalidate_customer_installments(customer.pk for customer in chunk)
+            invalidate_merchant_analytics([plan.merchant_id])
+            created += len(plan_ids)
+
+    return created
+
+
+def _installment_rows(
+    writer: CopyRowWriter,
+    schedule: InstallmentSchedule,
+    due_dates: List[date],
+    plan_ids: List[int],
+    now: datetime,
+) -> Iterator[str]:
+    """Yield COPY rows for every installment of the given installment plans."""
+    for plan_id in plan_ids:
+        for seq, (amount, due_date) in enumerate(zip(schedule.amounts, due_dates), start=1):
+            yield writer.row(now, now, plan_id, amount, due_date, seq)
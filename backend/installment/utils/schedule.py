@@ -0,0 +1,291 @@
+"""Installment schedule engine.
+
+A schedule is the part of an installment plan that depends only on its
+template Plan: how the total amount is split into cents and how many days
+after the start date each installment falls due. It is computed and
+validated once per (total_amount, installment_count, installment_period)
+and then shifted onto the start date of each InstallmentPlan that uses it.
+
+Validated schedules are memoized in a bounded per-process LRU cache and,
+when ``INSTALLMENT_SCHEDULE_SHARED_CACHE`` names a cache alias, in that
+shared cache as well.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+
+from core.exceptions import BusinessException
+from core.logging.logger import get_logger
+from installment.constants import (
+    INSTALLMENT_SCHEDULE_CACHE_SIZE,
+    INSTALLMENT_SCHEDULE_SHARED_CACHE_TIMEOUT,
+)
+from installment.models import Installment, InstallmentPlan
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class InstallmentSchedule:
+    """Precomputed amounts and due-date offsets for a plan template.
+
+    Attributes:
+        amounts: Amount of each installment, ordered by sequence number.
+        offsets: Days between the start date and each installment's due date.
+    """
+
+    amounts: Tuple[Decimal, ...]
+    offsets: Tuple[int, ...]
+
+    @property
+    def installment_count(self) -> int:
+        """Number of installments in the schedule."""
+        return len(self.amounts)
+
+    def due_dates(self, start_date: date) -> Iterator[date]:
+        """Shift the schedule offsets onto a concrete start date.
+
+        Args:
+            start_date: Date when the first installment is due.
+
+        Yields:
+            date: Due date of each installment, ordered by sequence number.
+        """
+        for offset in self.offsets:
+            yield start_date + timedelta(days=offset)
+
+    def build_installments(self, installment_plan: InstallmentPlan) -> Iterator[Installment]:
+        """Yield unsaved Installment objects for an installment plan.
+
+        Args:
+            installment_plan: The InstallmentPlan the installments belong to.
+
+        Yields:
+            Installment: One unsaved installment per schedule entry.
+        """
+        due_dates = self.due_dates(installment_plan.start_date)
+        for seq, (amount, due_date) in enumerate(zip(self.amounts, due_dates), start=1):
+            yield Installment(
+                installment_plan=installment_plan,
+                amount=amount,
+                due_date=due_date,
+                sequence_number=seq,
+            )
+
+
+def compute_schedule(
+    total_amount: Decimal,
+    installment_count: int,
+    installment_period: int,
+) -> InstallmentSchedule:
+    """Split the total amount into installments and compute due-date offsets.
+
+    The total is converted to cents and divided evenly; the first `remainder`
+    installments absorb one extra cent each so the amounts always add up to
+    the total.
+
+    Args:
+        total_amount: Total amount of the plan template.
+        installment_count: Number of installments.
+        installment_period: Days between consecutive installments.
+
+    Returns:
+        InstallmentSchedule: The (not yet validated) schedule.
+    """
+    total = Decimal(str(total_amount))  # Ensure Decimal
+
+    # Convert total to cents using rounding to nearest cent
+    total_cents = int((total * 100).to_integral_value())
+    base_cents = total_cents // installment_count
+    remainder = total_cents % installment_count  # Extra cents to distribute
+
+    amounts = tuple(
+        Decimal(base_cents + (1 if seq <= remainder else 0)) / Decimal(100)
+        for seq in range(1, installment_count + 1)
+    )
+    # Due date of installment n is (n-1) periods after start
+    offsets = tuple(installment_period * seq for seq in range(installment_count))
+    return InstallmentSchedule(amounts=amounts, offsets=offsets)
+
+
+def validate_schedule(schedule: InstallmentSchedule, installment_plan: InstallmentPlan) -> None:
+    """Validate a schedule once instead of validating every generated row.
+
+    Every installment of a schedule differs only in amount, due date and
+    sequence number. Amounts take at most two distinct values, so running the
+    model validation on one prototype per distinct amount covers all rows.
+    Due dates and sequence numbers are unique per plan by construction.
+
+    Args:
+        schedule: The schedule to validate.
+        installment_plan: The installment plan being generated, used for logging.
+
+    Raises:
+        BusinessException: If any installment of the schedule would be invalid.
+    """
+    plan = installment_plan.plan
+
+    for seq, amount in enumerate(schedule.amounts, start=1):
+        if amount <= 0:
+            logger.critical(
+                "invalid_calc_installment_amount",
+                operation="bulk_create_installments",
+                user_id=plan.merchant_id,
+                plan_id=plan.id,
+                installment_plan_id=installment_plan.id,
+                sequence_number=seq,
+                calc_amount=amount
+            )
+            raise BusinessException(
+                message=str(_("An issue occurred while creating installments.")),
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+    for amount in sorted(set(schedule.amounts)):
+        prototype = Installment(amount=amount, sequence_number=1)
+        try:
+            prototype.full_clean(exclude=['installment_plan', 'due_date'], validate_unique=False)
+        except ValidationError:
+            logger.critical(
+                "validation_error_on_installment_full_clean",
+                operation="bulk_create_installments",
+                exc_info=True,
+                user_id=plan.merchant_id,
+                plan_id=plan.id,
+                plan_total_amount=plan.total_amount,
+                installment_plan_id=installment_plan.id,
+                installment_amount=amount,
+            )
+            raise BusinessException(
+                message=str(_("An issue occurred while creating installments.")),
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+
+ScheduleKey = Tuple[Decimal, int, int]
+
+
+class ScheduleCache:
+    """Thread-safe, bounded LRU cache of validated schedules with hit/miss counters."""
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Args:
+            maxsize: Maximum number of schedules kept in memory.
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[ScheduleKey, InstallmentSchedule]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    def get(self, key: ScheduleKey) -> Optional[InstallmentSchedule]:
+        """Return the cached schedule for `key` and count the lookup."""
+        with self._lock:
+            schedule = self._entries.get(key)
+            if schedule is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return schedule
+
+    def set(self, key: ScheduleKey, schedule: InstallmentSchedule) -> None:
+        """Store a schedule, evicting the least recently used one when full."""
+        with self._lock:
+            self._entries[key] = schedule
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def record_shared_hit(self) -> None:
+        """Count a schedule found in the shared cache after a local miss."""
+        with self._lock:
+            self.shared_hits += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counters and the current size of the cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared_hits': self.shared_hits,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached schedule and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.shared_hits = 0
+
+
+# Per-process cache shared by every enrollment running in this worker
+schedule_cache = ScheduleCache(maxsize=INSTALLMENT_SCHEDULE_CACHE_SIZE)
+
+
+def schedule_key(total_amount: Decimal, installment_count: int, installment_period: int) -> ScheduleKey:
+    """Normalize template values into a cache key.
+
+    The amount is quantized to cents so that 100, 100.0 and Decimal('100.00')
+    share one entry.
+    """
+    amount = Decimal(str(total_amount)).quantize(Decimal('0.01'))
+    return amount, int(installment_count), int(installment_period)
+
+
+def get_schedule(installment_plan: InstallmentPlan) -> InstallmentSchedule:
+    """Return the validated schedule for an installment plan's template.
+
+    Lookups go to the in-process LRU cache first, then to the optional shared
+    cache; only a miss in both computes and validates the schedule.
+
+    Args:
+        installment_plan: The installment plan whose template is used.
+
+    Returns:
+        InstallmentSchedule: The validated schedule.
+
+    Raises:
+        BusinessException: If the template produces an invalid schedule.
+    """
+    plan = installment_plan.plan
+    key = schedule_key(plan.total_amount, plan.installment_count, plan.installment_period)
+
+    schedule = schedule_cache.get(key)
+    if schedule is not None:
+        return schedule
+
+    shared_cache = _get_shared_cache()
+    shared_key = 'installment-schedule:{}:{}:{}'.format(*key)
+    if shared_cache is not None:
+        schedule = shared_cache.get(shared_key)
+        if schedule is not None:
+            schedule_cache.record_shared_hit()
+
+    if schedule is None:
+        schedule = compute_schedule(*key)
+        # Only valid schedules are cached, so invalid templates are reported every time
+        validate_schedule(schedule, installment_plan)
+        if shared_cache is not None:
+            shared_cache.set(shared_key, schedule, INSTALLMENT_SCHEDULE_SHARED_CACHE_TIMEOUT)
+
+    schedule_cache.set(key, schedule)
+    return schedule
+
+
+def _get_shared_cache():
+    """Return the configured shared cache, or None when it is disabled."""
+    alias = getattr(settings, 'INSTALLMENT_SCHEDULE_SHARED_CACHE', None)
+    return caches[alias] if alias else None
@@ -1,7 +1,7 @@
 """Views for installment related operations."""
 from typing import Any, List
 
-from django.db.models import QuerySet, Prefetch
+from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 from rest_framework import generics, permissions, status
 from rest_framework.exceptions import NotFound
@@ -10,7 +10,8 @@ from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from core.pagination import DrfPagination
+from core.pagination import CursorPaginationMixin, DrfPagination
+from core.utils.idempotency import idempotency_key_parameter, idempotent
 from core.permissions import IsCustomer
 from core.views import CheckObjectPermissionAPIView
 from core.utils.response_schemas import (
@@ -25,9 +26,11 @@ from installment.models import Installment
 from installment.permissions import IsInstallmentCustomer
 from installment.serializers import (
     CustomerFacingInstallmentSerializer,
+    InstallmentBulkPaymentSerializer,
     InstallmentFilterSerializer,
 )
-from installment.services.payment import process_installment_payment
+from installment.services.list_cache import cache_installment_list, get_cached_installment_list
+from installment.services.payment import process_bulk_installment_payment, process_installment_payment
 from installment.services.retrieval import InstallmentRetrievalService
 
 logger = get_logger(__name__)
@@ -48,28 +51,13 @@ class InstallmentPaymentAPIView(
     ]
     custom_not_found_message = str(_("Installment not found"))  # used in CheckObjectPermissionAPIView
 
-    # Optimized queryset to avoid N+1 queries in permissions and serializer:
-    queryset = Installment.objects.select_related(
-        'installment_plan',                 # Access to installment.installment_plan
-        'installment_plan__customer',       # Access to installment.installment_plan.customer
-        'installment_plan__plan',           # Access to installment.installment_plan.plan
-    ).prefetch_related(
-        Prefetch(
-            'installment_plan__installments',  # Prefetch all installments for checking previous unpaid ones
-            queryset=Installment.objects.only(
-                'id',
-                'sequence_number',
-                'status',
-                'installment_plan_id',
-                'installment_plan__customer_id',
-            ),  # Minimize columns fetched
-            to_attr='prefetched_installments',  # Store in a temporary in-memory attribute
-        )
-    )
+    # The customer is needed by the permission check; the payment re-reads the row under lock
+    queryset = Installment.objects.select_related('installment_plan__customer')
 
     @swagger_auto_schema(
         tags=["Installments"],
         operation_description=str(_("Pay a specific installment (Customer only)")),
+        manual_parameters=[idempotency_key_parameter],
         responses={
             status.HTTP_200_OK: openapi.Response(
                 description=str(_("Installment paid successfully")),
@@ -95,6 +83,7 @@ class InstallmentPaymentAPIView(
             ),
         },
     )
+    @idempotent
     def post(self, request: Request, pk: int, *args: Any, **kwargs: Any) -> Response:
         """Process payment for a specific installment.
 
@@ -122,14 +111,7 @@ class InstallmentPaymentAPIView(
             )
             raise NotFound(detail=_("Installment not found"))
 
-        # Validate payment eligibility
-        service = InstallmentRetrievalService(
-            customer=request.user,
-            raise_validation_errors=True
-        )
-        service.validate_installment_payment(installment)
-
-        # Process payment if validation passed
+        # Validated and paid in one transaction, with the installment plan locked
         installment = process_installment_payment(installment)
         serializer = self.get_serializer(installment)
         return self.success_response(
@@ -138,12 +120,90 @@ class InstallmentPaymentAPIView(
         )
 
 
-class InstallmentListAPIView(StandardApiResponseMixin, generics.ListAPIView):
+class InstallmentBulkPaymentAPIView(StandardApiResponseMixin, generics.GenericAPIView):
+    """API endpoint to pay several installments of one installment plan at once.
+
+    The installments are given by id, or as "every unpaid installment of a
+    plan through sequence N". They are validated, paid and the plan is
+    completed in one transaction; either all of them are paid or none is.
+    """
+
+    serializer_class = CustomerFacingInstallmentSerializer
+    permission_classes = [permissions.IsAuthenticated, IsCustomer]
+
+    @swagger_auto_schema(
+        tags=["Installments"],
+        operation_description=str(_("Pay several installments of an installment plan (Customer only)")),
+        request_body=InstallmentBulkPaymentSerializer,
+        manual_parameters=[idempotency_key_parameter],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description=str(_("Installments paid successfully")),
+                schema=build_success_response_schema(
+                    serializer_class=CustomerFacingInstallmentSerializer,
+                    many=True,
+                ),
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Response(
+                description=str(_("Validation error")),
+                schema=api_error_schema,
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("User account is not a Customer.")),
+                schema=api_error_schema,
+            ),
+            status.HTTP_404_NOT_FOUND: openapi.Response(
+                description=str(_("Installment not found")),
+                schema=api_error_schema,
+            ),
+            status.HTTP_409_CONFLICT: openapi.Response(
+                description=str(_("Installment conflict")),
+                schema=build_error_schema(
+                    messages=[
+                        str(_("Installment already paid.")),
+                        str(_("Cannot pay because the installment plan is not active.")),
+                        str(_("Previous installments must be paid before this one.")),
+                    ]
+                ),
+            ),
+        },
+    )
+    @idempotent
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Pay the requested installments.
+
+        Args:
+            request: The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The paid installments, ordered by sequence number.
+
+        Raises:
+            ValidationError: If the request body is invalid.
+            BusinessException: If the installments cannot be paid.
+        """
+        request_serializer = InstallmentBulkPaymentSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        installments = process_bulk_installment_payment(customer=request.user, **request_serializer.validated_data)
+        serializer = self.get_serializer(installments, many=True)
+        return self.success_response(
+            message=str(_("Installments paid successfully")),
+            data=serializer.data,
+        )
+
+
+class InstallmentListAPIView(StandardApiResponseMixin, CursorPaginationMixin, generics.ListAPIView):
     """API endpoint to list installments with filtering.
 
     Supports:
     - Filtering by status (upcoming/past)
-    - Pagination
+    - Pagination, by page number or by cursor with ?pagination=cursor
+
+    Responses are cached per customer and request URL (see
+    installment.services.list_cache) until the customer's installments change.
     """
 
     serializer_class = CustomerFacingInstallmentSerializer
@@ -176,6 +236,21 @@ class InstallmentListAPIView(StandardApiResponseMixin, generics.ListAPIView):
                 enum=[choice[0] for choice in InstallmentStatusFilters.CHOICES],
                 required=False,
             ),
+            openapi.Parameter(
+                name="pagination",
+                in_=openapi.IN_QUERY,
+                description=str(_("Set to 'cursor' for cursor pagination: no totals, constant cost on deep pages")),
+                type=openapi.TYPE_STRING,
+                enum=["cursor"],
+                required=False,
+            ),
+            openapi.Parameter(
+                name="cursor",
+                in_=openapi.IN_QUERY,
+                description=str(_("Opaque cursor from the next/previous link of a cursor-paginated response")),
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
         responses={
             status.HTTP_200_OK: openapi.Response(
@@ -206,15 +281,22 @@ class InstallmentListAPIView(StandardApiResponseMixin, generics.ListAPIView):
         Returns:
             Response: Paginated list of installments.
         """
+        cached, cache_version = get_cached_installment_list(request)
+        if cached is not None:
+            return Response(cached)
+
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
 
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_success_response(serializer.data)
+            response = self.get_paginated_success_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = self.success_response(
+                message=str(_("Installment list retrieved successfully")),
+                data=serializer.data,
+            )
 
-        serializer = self.get_serializer(queryset, many=True)
-        return self.success_response(
-            message=str(_("Installment list retrieved successfully")),
-            data=serializer.data,
-        )
\ No newline at end of file
+        cache_installment_list(request, response.data, cache_version)
+        return response
\ No newline at end of file
@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from notification.models import ReminderDelivery
+
+
+@admin.register(ReminderDelivery)
+class ReminderDeliveryAdmin(admin.ModelAdmin):
+    """Admin interface for ReminderDelivery model."""
+    list_display = ('id', 'installment', 'kind', 'reminder_date', 'created_at')
+    list_filter = ('kind', 'reminder_date')
+    search_fields = ('installment__installment_plan__customer__email',)
+    readonly_fields = ('created_at', 'updated_at')
@@ -0,0 +1,18 @@
+"""Constants for the notification app."""
+from django.conf import settings
+
+REMINDER_FROM_EMAIL = 'notifications@bnpl.com'
+REMINDER_TEMPLATE = 'payment_reminder.txt'
+
+# Days before the due date when reminders are sent; negative values are days after it
+REMINDER_OFFSETS = tuple(getattr(settings, 'REMINDER_OFFSETS', (7, 3, 1, 0, -1, -3)))
+
+# Messages sent over one mail connection before it is closed
+REMINDER_BATCH_SIZE = 100
+
+# Retries of a failing reminder on a fresh connection before it is skipped until the next run
+REMINDER_BATCH_MAX_RETRIES = 3
+REMINDER_RETRY_DELAY = 2  # Seconds, multiplied by the attempt number
+
+# Installment ids handed to one worker task when reminders are fanned out
+REMINDER_FAN_OUT_CHUNK_SIZE = 500
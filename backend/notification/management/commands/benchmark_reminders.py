@@ -0,0 +1,105 @@
+"""Measure payment reminder throughput of the batched dispatcher.
+
+Reminders are built from in-memory installments, so no database rows are
+needed. Point EMAIL_BACKEND at the backend to measure: the locmem backend
+isolates rendering and batching overhead, while the SMTP backend against a
+local sink (e.g. ``python -m aiosmtpd -n -l localhost:1025``) includes the
+connection cost that batching avoids.
+
+Usage:
+    python manage.py benchmark_reminders --messages 1000 10000 --backend locmem
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, List
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.core.management.base import BaseCommand, CommandParser
+from django.template.loader import render_to_string
+
+from account.models import User
+from installment.models import Installment, InstallmentPlan
+from notification.constants import REMINDER_BATCH_SIZE, REMINDER_FROM_EMAIL, REMINDER_TEMPLATE
+from notification.services.reminder_dispatcher import ReminderDispatcher
+from plan.models import Plan
+
+BACKENDS = {
+    'locmem': 'django.core.mail.backends.locmem.EmailBackend',
+    'smtp': 'django.core.mail.backends.smtp.EmailBackend',
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark batched payment reminders against per-message send_mail()."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--messages', type=int, nargs='+', default=[1_000, 10_000],
+            help="Number of reminders per run.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=REMINDER_BATCH_SIZE,
+            help="Messages sent over one connection.",
+        )
+        parser.add_argument(
+            '--backend', choices=sorted(BACKENDS), default='locmem',
+            help="Mail backend; 'smtp' uses EMAIL_HOST/EMAIL_PORT from settings.",
+        )
+        parser.add_argument(
+            '--skip-baseline', action='store_true',
+            help="Only measure the batched dispatcher.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        settings.EMAIL_BACKEND = BACKENDS[options['backend']]
+        self.stdout.write(f"{'mode':>10} {'messages':>10} {'seconds':>10} {'msgs/s':>12}")
+
+        for count in options['messages']:
+            installments = self._installments(count)
+            if not options['skip_baseline']:
+                self._report('per-msg', count, self._per_message(installments))
+            dispatcher = ReminderDispatcher(batch_size=options['batch_size'])
+            started = time.perf_counter()
+            dispatcher.dispatch(installments)
+            self._report('batched', count, time.perf_counter() - started)
+
+    def _report(self, mode: str, count: int, elapsed: float) -> None:
+        self.stdout.write(f"{mode:>10} {count:>10} {elapsed:>10.2f} {count / elapsed:>12.0f}")
+
+    @staticmethod
+    def _per_message(installments: List[Installment]) -> float:
+        """Send reminders the way the task did before batching: one connection per email."""
+        started = time.perf_counter()
+        for installment in installments:
+            send_mail(
+                subject=f"Upcoming payment reminder: Due on {installment.due_date}",
+                message=render_to_string(REMINDER_TEMPLATE, {
+                    'customer': installment.installment_plan.customer,
+                    'amount': installment.amount,
+                    'due_date': installment.due_date,
+                    'plan': installment.installment_plan.plan.name,
+                }),
+                from_email=REMINDER_FROM_EMAIL,
+                recipient_list=[installment.installment_plan.customer.email],
+                fail_silently=False,
+            )
+        return time.perf_counter() - started
+
+    @staticmethod
+    def _installments(count: int) -> List[Installment]:
+        """Build unsaved installments with their related objects attached."""
+        plan = Plan(name='Benchmark Plan', total_amount=Decimal('1000.00'), installment_count=4)
+        due_date = date.today() + timedelta(days=3)
+        installments = []
+        for index in range(count):
+            customer = User(email=f'customer-{index}@example.com', user_type=User.UserType.CUSTOMER)
+            installment_plan = InstallmentPlan(plan=plan, customer=customer)
+            installments.append(Installment(
+                installment_plan=installment_plan,
+                amount=Decimal('250.00'),
+                due_date=due_date,
+                sequence_number=1,
+            ))
+        return installments
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('installment', '0004_remove_duplicate_overdue_beat_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Timestamp when this record was created.', verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when this record was last updated.', verbose_name='updated at')),
+                ('kind', models.CharField(choices=[('upcoming', 'Upcoming')], help_text='Kind of reminder that was sent.', max_length=16, verbose_name='kind')),
+                ('reminder_date', models.DateField(help_text='Date of the reminder run that sent the reminder.', verbose_name='reminder date')),
+                ('installment', models.ForeignKey(help_text='The installment the reminder was sent for.', on_delete=django.db.models.deletion.CASCADE, related_name='reminder_deliveries', to='installment.installment')),
+            ],
+            options={
+                'verbose_name': 'reminder delivery',
+                'verbose_name_plural': 'reminder deliveries',
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(fields=('installment', 'kind', 'reminder_date'), name='unique_reminder_delivery')],
+            },
+        ),
+    ]
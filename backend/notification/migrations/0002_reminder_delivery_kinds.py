@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0001_reminder_delivery'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reminderdelivery',
+            name='kind',
+            field=models.CharField(choices=[('upcoming', 'Upcoming'), ('due_today', 'Due today'), ('overdue', 'Overdue')], help_text='Kind of reminder that was sent.', max_length=16, verbose_name='kind'),
+        ),
+    ]
@@ -1,3 +1,51 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from core.models import AbstractTimestampedModel
+from installment.models import Installment
+
+
+class ReminderDelivery(AbstractTimestampedModel):
+    """Ledger entry recording that a reminder was sent for an installment.
+
+    The unique key (installment, kind, reminder_date) makes reminder runs
+    idempotent: a retried or resumed run skips every key already recorded.
+    """
+
+    class Kind(models.TextChoices):
+        """Enumeration of reminder kinds."""
+        UPCOMING = 'upcoming', _('Upcoming')     # Sent before the due date
+        DUE_TODAY = 'due_today', _('Due today')  # Sent on the due date
+        OVERDUE = 'overdue', _('Overdue')        # Sent after the due date
+
+    installment = models.ForeignKey(
+        Installment,
+        on_delete=models.CASCADE,
+        related_name='reminder_deliveries',
+        help_text=_('The installment the reminder was sent for.'),
+    )
+    kind = models.CharField(
+        _('kind'),
+        max_length=16,
+        choices=Kind.choices,
+        help_text=_('Kind of reminder that was sent.'),
+    )
+    reminder_date = models.DateField(
+        _('reminder date'),
+        help_text=_('Date of the reminder run that sent the reminder.'),
+    )
+
+    def __str__(self) -> str:
+        """Return a readable identifier for the delivery."""
+        return f"{self.get_kind_display()} reminder for Installment #{self.installment_id} on {self.reminder_date}"
+
+    class Meta:
+        verbose_name = _('reminder delivery')
+        verbose_name_plural = _('reminder deliveries')
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['installment', 'kind', 'reminder_date'],
+                name='unique_reminder_delivery',
+            ),
+        ]
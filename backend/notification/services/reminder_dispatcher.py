@@ -0,0 +1,193 @@
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Set
+
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import get_template
+
+from core.logging.logger import get_logger
+from installment.models import Installment
+from notification.constants import (
+    REMINDER_BATCH_MAX_RETRIES,
+    REMINDER_BATCH_SIZE,
+    REMINDER_FROM_EMAIL,
+    REMINDER_RETRY_DELAY,
+    REMINDER_TEMPLATE,
+)
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class DispatchResult:
+    """Outcome of one reminder dispatch.
+
+    Attributes:
+        sent: Messages accepted by the mail backend.
+        failed: Messages skipped after failing on every retry.
+        batches: Number of batches, i.e. mail connections opened on the first attempt.
+        retries: Number of retries on a fresh connection after a send error.
+        duration_seconds: Wall-clock duration of the dispatch.
+    """
+
+    sent: int = 0
+    failed: int = 0
+    batches: int = 0
+    retries: int = 0
+    duration_seconds: float = 0.0
+
+
+class ReminderDispatcher:
+    """Send payment reminder emails in batches over pooled mail connections.
+
+    The template is loaded once per dispatcher. Each batch of messages is sent
+    over a single connection. When sending fails midway, the batch is resumed
+    on a fresh connection starting from the message that failed, so messages
+    already accepted are never sent twice. A message still failing after
+    `max_retries` retries (for example a refused recipient) is skipped, and
+    the rest of the batch is sent. After every batch, `on_sent` receives the
+    installments whose reminder was accepted; skipped ones are left for the
+    next run.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = REMINDER_BATCH_SIZE,
+        max_retries: int = REMINDER_BATCH_MAX_RETRIES,
+        retry_delay: float = REMINDER_RETRY_DELAY,
+        sleep: Callable[[float], None] = time.sleep,
+        on_sent: Optional[Callable[[List[Installment]], None]] = None,
+    ) -> None:
+        """
+        Args:
+            batch_size: Messages sent over one connection.
+            max_retries: Retries of a failing message before it is skipped.
+            retry_delay: Base delay in seconds between retries.
+            sleep: Function used to wait between retries.
+            on_sent: Called after each batch with the installments reminded successfully.
+        """
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.sleep = sleep
+        self.on_sent = on_sent
+        self.template = get_template(REMINDER_TEMPLATE)
+
+    def build_message(self, installment: Installment) -> EmailMessage:
+        """Render the reminder email for an installment.
+
+        The wording depends on the `reminder_offset` annotation set by the
+        reminder schedule; installments without it get an upcoming reminder.
+
+        Args:
+            installment (Installment): The installment with its plan, template plan
+                and customer already loaded.
+
+        Returns:
+            EmailMessage: The unsent message.
+        """
+        installment_plan = installment.installment_plan
+        offset = getattr(installment, 'reminder_offset', None)
+        days_overdue = -offset if offset is not None and offset < 0 else 0
+
+        if days_overdue:
+            subject = f"Overdue payment reminder: Was due on {installment.due_date}"
+        elif offset == 0:
+            subject = f"Payment due today: Due on {installment.due_date}"
+        else:
+            subject = f"Upcoming payment reminder: Due on {installment.due_date}"
+
+        body = self.template.render({
+            'customer': installment_plan.customer,
+            'amount': installment.amount,
+            'due_date': installment.due_date,
+            'days_overdue': days_overdue,
+            'plan': installment_plan.plan.name,
+        })
+        return EmailMessage(
+            subject=subject,
+            body=body,
+            from_email=REMINDER_FROM_EMAIL,
+            to=[installment_plan.customer.email],
+        )
+
+    def dispatch(self, installments: Iterable[Installment]) -> DispatchResult:
+        """Send one reminder per installment.
+
+        Args:
+            installments (Iterable[Installment]): Installments to remind; consumed lazily.
+
+        Returns:
+            DispatchResult: Counts and timing of the dispatch.
+        """
+        result = DispatchResult()
+        started = time.monotonic()
+        installments = iter(installments)
+
+        while batch := list(islice(installments, self.batch_size)):
+            result.batches += 1
+            skipped = self._send_batch([self.build_message(installment) for installment in batch], result)
+            sent = [installment for position, installment in enumerate(batch) if position not in skipped]
+            if sent and self.on_sent:
+                self.on_sent(sent)
+
+        result.duration_seconds = time.monotonic() - started
+        logger.info(
+            "payment_reminders_dispatched",
+            operation="dispatch_payment_reminders",
+            sent=result.sent,
+            failed=result.failed,
+            batches=result.batches,
+            retries=result.retries,
+            duration_seconds=round(result.duration_seconds, 3),
+        )
+        return result
+
+    def _send_batch(self, messages: List[EmailMessage], result: DispatchResult) -> Set[int]:
+        """Send a batch over one connection, reopening it after a failure.
+
+        Sending resumes from the failed message. Once that message has failed
+        `max_retries` times more, it is skipped and the rest of the batch is
+        sent on a fresh connection.
+
+        Returns:
+            Set[int]: Positions in `messages` of the skipped messages.
+        """
+        skipped = set()
+        position = 0
+        attempt = 0
+
+        while position < len(messages):
+            try:
+                with get_connection(fail_silently=False) as connection:
+                    while position < len(messages):
+                        connection.send_messages([messages[position]])
+                        result.sent += 1
+                        position += 1
+                        attempt = 0
+            except Exception:
+                attempt += 1
+                logger.warning(
+                    "payment_reminder_send_failed",
+                    operation="dispatch_payment_reminders",
+                    exc_info=True,
+                    attempt=attempt,
+                    unsent=len(messages) - position,
+                )
+                if attempt > self.max_retries:
+                    # Left out of on_sent, so the next run tries this reminder again
+                    logger.error(
+                        "payment_reminder_skipped",
+                        operation="dispatch_payment_reminders",
+                        recipients=messages[position].to,
+                    )
+                    result.failed += 1
+                    skipped.add(position)
+                    position += 1
+                    attempt = 0
+                else:
+                    result.retries += 1
+                    self.sleep(self.retry_delay * attempt)
+
+        return skipped
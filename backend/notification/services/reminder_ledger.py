@@ -0,0 +1,47 @@
+from datetime import date
+from typing import Iterable
+
+from django.db.models import Exists, OuterRef, QuerySet
+
+from installment.models import Installment
+from notification.models import ReminderDelivery
+
+
+def exclude_delivered(installments: QuerySet, reminder_date: date) -> QuerySet:
+    """Drop installments whose reminder was already sent on `reminder_date`.
+
+    The queryset must be annotated with `reminder_kind`. The check is a single
+    NOT EXISTS anti-join evaluated by the database, not a lookup per installment.
+
+    Args:
+        installments (QuerySet): Installments due for a reminder.
+        reminder_date (date): Date of the reminder run.
+
+    Returns:
+        QuerySet: The installments still to remind.
+    """
+    delivered = ReminderDelivery.objects.filter(
+        installment=OuterRef('pk'),
+        kind=OuterRef('reminder_kind'),
+        reminder_date=reminder_date,
+    )
+    return installments.filter(~Exists(delivered))
+
+
+def record_deliveries(installments: Iterable[Installment], reminder_date: date) -> None:
+    """Record sent reminders in the ledger with one bulk INSERT.
+
+    Each installment must carry the `reminder_kind` annotation. Keys recorded
+    concurrently by another run are ignored.
+
+    Args:
+        installments (Iterable[Installment]): Installments whose reminder was sent.
+        reminder_date (date): Date of the reminder run.
+    """
+    ReminderDelivery.objects.bulk_create(
+        [
+            ReminderDelivery(installment=installment, kind=installment.reminder_kind, reminder_date=reminder_date)
+            for installment in installments
+        ],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from django.db.models import Case, CharField, IntegerField, Q, QuerySet, Value, When
+
+from installment.models import Installment
+from notification.constants import REMINDER_OFFSETS
+from notification.models import ReminderDelivery
+from notification.services.reminder_ledger import exclude_delivered
+
+# Relations read by the reminder template, joined in so rendering issues no queries
+REMINDER_RELATED_FIELDS = ('installment_plan__customer', 'installment_plan__plan')
+
+
+def reminder_kind(offset: int) -> str:
+    """Return the ReminderDelivery.Kind of a reminder sent `offset` days before the due date."""
+    if offset > 0:
+        return ReminderDelivery.Kind.UPCOMING
+    if offset == 0:
+        return ReminderDelivery.Kind.DUE_TODAY
+    return ReminderDelivery.Kind.OVERDUE
+
+
+def get_due_reminders(run_date: date, offsets: Optional[Iterable[int]] = None) -> QuerySet:
+    """Return every installment with a reminder due on `run_date` that was not sent yet.
+
+    All offsets are evaluated in one query: a single ``due_date IN (...)``
+    condition selects the installments, and CASE expressions tag each row with
+    its `reminder_offset` and `reminder_kind`. Reminders before and on the due
+    date are only sent for pending installments; overdue reminders are also
+    sent for installments already marked late.
+
+    Args:
+        run_date (date): Date of the reminder run.
+        offsets (Optional[Iterable[int]]): Days before the due date when reminders
+            are sent, negative for days after it. Defaults to REMINDER_OFFSETS.
+
+    Returns:
+        QuerySet: Annotated installments with their customer and template plan joined in.
+    """
+    due_dates = {run_date + timedelta(days=offset): offset for offset in offsets or REMINDER_OFFSETS}
+    overdue_dates = [due_date for due_date, offset in due_dates.items() if offset < 0]
+
+    due = Installment.objects.filter(
+        Q(status=Installment.Status.PENDING)
+        | Q(status=Installment.Status.LATE, due_date__in=overdue_dates),
+        due_date__in=list(due_dates),
+    ).annotate(
+        reminder_offset=Case(
+            *[When(due_date=due_date, then=Value(offset)) for due_date, offset in due_dates.items()],
+            output_field=IntegerField(),
+        ),
+        reminder_kind=Case(
+            *[When(due_date=due_date, then=Value(reminder_kind(offset))) for due_date, offset in due_dates.items()],
+            output_field=CharField(),
+        ),
+    ).select_related(*REMINDER_RELATED_FIELDS)
+
+    return exclude_delivered(due, run_date)
@@ -1,27 +1,94 @@
-from celery import shared_task
-from datetime import date, timedelta
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from dataclasses import asdict
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, List
+
+from celery import group, shared_task
+
+from core.logging.logger import get_logger
 from installment.models import Installment
+from notification.constants import REMINDER_BATCH_SIZE, REMINDER_FAN_OUT_CHUNK_SIZE
+from notification.services.reminder_dispatcher import ReminderDispatcher
+from notification.services.reminder_ledger import record_deliveries
+from notification.services.reminder_schedule import get_due_reminders
+
+logger = get_logger(__name__)
+
+
+def _ledger_dispatcher(run_date: date) -> ReminderDispatcher:
+    """Build a dispatcher that records every sent batch in the delivery ledger."""
+    return ReminderDispatcher(on_sent=lambda installments: record_deliveries(installments, run_date))
 
 
 @shared_task
-def send_payment_reminders() -> None:
+def send_payment_reminders(fan_out: bool = False) -> Dict[str, Any]:
+    """
+    Send email reminders for every configured reminder offset.
+
+    This task collects, in one query, the installments due exactly
+    REMINDER_OFFSETS days from today (negative offsets are overdue
+    reminders) and sends a reminder email to the corresponding customer.
+    Emails are sent in batches, each over a single mail connection.
+
+    With `fan_out`, the task only reads the due installment ids and
+    dispatches them in chunks to `send_payment_reminder_chunk` as a
+    Celery group, so the emails are sent by all workers in parallel.
+
+    Sent reminders are recorded in the ReminderDelivery ledger, and
+    reminders already recorded today are skipped, so the task can be
+    retried or rerun after a crash without sending duplicates.
+
+    Args:
+        fan_out (bool): Distribute the reminders across workers.
+
+    Returns:
+        Dict[str, Any]: Counts and timing of the dispatch, or the number of
+            dispatched chunks in fan-out mode; stored as the task result.
     """
-    Send email reminders for installments due in 3 days.
+    run_date = date.today()
+    due = get_due_reminders(run_date)
 
-    This task queries all pending installments with a due date
-    exactly 3 days from today and sends a reminder email to the
-    corresponding customer.
+    if not fan_out:
+        result = _ledger_dispatcher(run_date).dispatch(due.iterator(chunk_size=REMINDER_BATCH_SIZE))
+        return asdict(result)
+
+    ids = due.order_by('id').values_list('id', flat=True).iterator(chunk_size=REMINDER_FAN_OUT_CHUNK_SIZE)
+    chunks: List[List[int]] = []
+    while chunk := list(islice(ids, REMINDER_FAN_OUT_CHUNK_SIZE)):
+        chunks.append(chunk)
+
+    if chunks:
+        group(send_payment_reminder_chunk.s(chunk, run_date.isoformat()) for chunk in chunks).apply_async()
+
+    logger.info(
+        "payment_reminders_fanned_out",
+        operation="send_payment_reminders",
+        chunks=len(chunks),
+        installments=sum(len(chunk) for chunk in chunks),
+    )
+    return {'chunks': len(chunks), 'installments': sum(len(chunk) for chunk in chunks)}
+
+
+@shared_task
+def send_payment_reminder_chunk(installment_ids: List[int], run_date: str) -> Dict[str, Any]:
     """
-    reminder_date: date = date.today() + timedelta(days=3)
-    upcoming = Installment.objects.filter(
-        due_date=reminder_date,
-        status=Installment.Status.PENDING
-    ).select_related('installment_plan__customer')
+    Send reminders for one chunk of installments dispatched by `send_payment_reminders`.
+
+    The chunk is loaded with its customers and template plans in a single
+    query and tagged with the same offsets as the coordinator's run.
+    Installments paid since the chunk was dispatched, and reminders already
+    recorded in the ledger, are skipped.
+
+    Args:
+        installment_ids (List[int]): IDs of the installments to remind.
+        run_date (str): ISO date of the reminder run that dispatched the chunk.
 
-    for installment in upcoming:
-        send_installment_reminder(installment)
+    Returns:
+        Dict[str, Any]: Counts and timing of the dispatch, stored as the task result.
+    """
+    run_date = date.fromisoformat(run_date)
+    installments = get_due_reminders(run_date).filter(id__in=installment_ids)
+    return asdict(_ledger_dispatcher(run_date).dispatch(installments))
 
 
 def send_installment_reminder(installment: Installment) -> None:
@@ -31,18 +98,4 @@ def send_installment_reminder(installment: Installment) -> None:
     Args:
         installment (Installment): The installment for which to send a reminder.
     """
-    subject: str = f"Upcoming payment reminder: Due on {installment.due_date}"
-    message: str = render_to_string('payment_reminder.txt', {
-        'customer': installment.installment_plan.customer,
-        'amount': installment.amount,
-        'due_date': installment.due_date,
-        'plan': installment.installment_plan.plan.name,
-    })
-
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email='notifications@bnpl.com',
-        recipient_list=[installment.installment_plan.customer.email],
-        fail_silently=False
-    )
+    ReminderDispatcher().build_message(installment).send(fail_silently=False)
@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+
+import factory
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from installment.models import Installment
+from installment.tests.factories import InstallmentFactory, InstallmentPlanFactory
+from installment.utils.signal_control import disable_installment_creation_signal
+from notification.services.reminder_dispatcher import ReminderDispatcher
+
+
+class FlakyEmailBackend(EmailBackend):
+    """Locmem backend that counts connections and drops the connection once."""
+
+    opened = 0
+    fail_on_message = None  # Overall message number whose first send attempt fails
+    refused_subject = None  # Subject of a message that is refused on every attempt
+    _attempts = 0
+
+    def open(self):
+        FlakyEmailBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        FlakyEmailBackend._attempts += 1
+        if FlakyEmailBackend._attempts == FlakyEmailBackend.fail_on_message:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        if any(message.subject == FlakyEmailBackend.refused_subject for message in messages):
+            raise SMTPRecipientsRefused({message.to[0]: (550, b"Mailbox unavailable") for message in messages})
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='notification.tests.test_reminder_dispatcher.FlakyEmailBackend')
+class ReminderDispatcherTests(TestCase):
+    """Tests for batched reminder sending over pooled connections."""
+
+    def setUp(self):
+        FlakyEmailBackend.opened = 0
+        FlakyEmailBackend.fail_on_message = None
+        FlakyEmailBackend.refused_subject = None
+        FlakyEmailBackend._attempts = 0
+
+        with disable_installment_creation_signal():
+            installment_plan = InstallmentPlanFactory()
+        due_date = date.today() + timedelta(days=3)
+        InstallmentFactory.create_batch(
+            5,
+            installment_plan=installment_plan,
+            due_date=factory.Sequence(lambda n: due_date + timedelta(days=n)),
+        )
+        self.installments = list(
+            Installment.objects.select_related('installment_plan__customer', 'installment_plan__plan')
+        )
+
+    def test_one_connection_per_batch(self):
+        """Each batch is sent over a single connection."""
+        result = ReminderDispatcher(batch_size=2).dispatch(self.installments)
+
+        self.assertEqual(result.sent, 5)
+        self.assertEqual(result.batches, 3)
+        self.assertEqual(FlakyEmailBackend.opened, 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertIn(self.installments[0].installment_plan.plan.name, mail.outbox[0].body)
+
+    def test_failed_batch_is_retried_without_resending_sent_messages(self):
+        """After a dropped connection only the unsent messages of the batch are sent again."""
+        FlakyEmailBackend.fail_on_message = 2
+        delays = []
+
+        result = ReminderDispatcher(batch_size=3, sleep=delays.append).dispatch(self.installments)
+
+        self.assertEqual(result.sent, 5)
+        self.assertEqual(result.failed, 0)
+        self.assertEqual(result.retries, 1)
+        self.assertEqual(len(delays), 1)
+        self.assertListEqual(
+            [message.subject for message in mail.outbox],
+            [f"Upcoming payment reminder: Due on {inst.due_date}" for inst in self.installments],
+        )
+
+    def test_message_is_skipped_after_max_retries(self):
+        """A message that keeps failing is reported as failed and the rest of the batch is sent."""
+        FlakyEmailBackend.fail_on_message = 3
+        reminded = []
+
+        result = ReminderDispatcher(
+            batch_size=5, max_retries=0, sleep=lambda _: None, on_sent=reminded.extend,
+        ).dispatch(self.installments)
+
+        self.assertEqual(result.sent, 4)
+        self.assertEqual(result.failed, 1)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(reminded, self.installments[:2] + self.installments[3:])
+
+    def test_refused_recipient_does_not_block_the_batch(self):
+        """A permanently refused message in the middle of a batch is skipped after its retries."""
+        refused = self.installments[2]
+        FlakyEmailBackend.refused_subject = f"Upcoming payment reminder: Due on {refused.due_date}"
+        reminded = []
+
+        result = ReminderDispatcher(
+            batch_size=5, max_retries=2, sleep=lambda _: None, on_sent=reminded.extend,
+        ).dispatch(self.installments)
+
+        self.assertEqual((result.sent, result.failed, result.retries), (4, 1, 2))
+        # One connection for the first attempt, one per retry, one to resume after skipping
+        self.assertEqual(FlakyEmailBackend.opened, 4)
+        self.assertNotIn(refused, reminded)
+        self.assertEqual(len(reminded), 4)
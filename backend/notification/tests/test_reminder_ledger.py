@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+
+from installment.tests.factories import InstallmentFactory, InstallmentPlanFactory
+from installment.utils.signal_control import disable_installment_creation_signal
+from notification.models import ReminderDelivery
+from notification.services.reminder_dispatcher import ReminderDispatcher
+from notification.tasks import send_payment_reminders
+
+
+class ReminderDeliveryLedgerTests(TestCase):
+    """Tests for idempotent reminder runs backed by the ReminderDelivery ledger."""
+
+    def setUp(self):
+        due_date = date.today() + timedelta(days=3)
+        self.installments = []
+        for _ in range(3):
+            with disable_installment_creation_signal():
+                installment_plan = InstallmentPlanFactory()
+            self.installments.append(InstallmentFactory(installment_plan=installment_plan, due_date=due_date))
+
+    def test_sent_reminders_are_recorded_and_not_resent(self):
+        """A second run on the same day sends nothing."""
+        self.assertEqual(send_payment_reminders()['sent'], 3)
+        self.assertEqual(
+            ReminderDelivery.objects.filter(
+                kind=ReminderDelivery.Kind.UPCOMING,
+                reminder_date=date.today(),
+            ).count(),
+            3,
+        )
+
+        self.assertEqual(send_payment_reminders()['sent'], 0)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_run_resumed_after_crash_only_sends_missing_reminders(self):
+        """Reminders recorded before a crash are skipped by the retried run."""
+        original_dispatch = ReminderDispatcher.dispatch
+
+        def crash_after_first_batch(dispatcher, installments):
+            dispatcher.batch_size = 1
+            installments = iter(installments)
+            first = next(installments)
+            original_dispatch(dispatcher, [first])
+            raise RuntimeError("worker lost")
+
+        with mock.patch.object(ReminderDispatcher, "dispatch", crash_after_first_batch):
+            with self.assertRaises(RuntimeError):
+                send_payment_reminders()
+        self.assertEqual(len(mail.outbox), 1)
+
+        result = send_payment_reminders()
+
+        self.assertEqual(result['sent'], 2)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            sorted(inst.installment_plan.customer.email for inst in self.installments),
+        )
+
+    def test_delivered_keys_are_skipped_with_one_query(self):
+        """Skipping delivered reminders does not add a query per installment."""
+        ReminderDelivery.objects.create(
+            installment=self.installments[0],
+            kind=ReminderDelivery.Kind.UPCOMING,
+            reminder_date=date.today(),
+        )
+
+        # One SELECT with the anti-join and one bulk INSERT into the ledger
+        with self.assertNumQueries(2):
+            result = send_payment_reminders()
+
+        self.assertEqual(result['sent'], 2)
@@ -1,21 +1,26 @@
 from datetime import datetime, timedelta
+from unittest import mock
+
 from django.test import TestCase
 from django.core import mail
 from customer.tests.factories import CustomerUserFactory
 from installment.models import Installment
 from plan.tests.factories import PlanFactory
 from installment.tests.factories import InstallmentPlanFactory, InstallmentFactory
-from notification.tasks import send_payment_reminders
+from installment.utils.signal_control import disable_installment_creation_signal
+from notification.tasks import send_payment_reminder_chunk, send_payment_reminders
 
 
 class PaymentReminderTests(TestCase):
     def setUp(self):
         self.customer = CustomerUserFactory()
         self.plan = PlanFactory()
-        self.installment_plan = InstallmentPlanFactory(
-            plan=self.plan,
-            customer=self.customer
-        )
+        # Skip generated installments: the first one is due today and gets a reminder of its own
+        with disable_installment_creation_signal():
+            self.installment_plan = InstallmentPlanFactory(
+                plan=self.plan,
+                customer=self.customer
+            )
 
     def test_reminder_for_upcoming_payment(self):
         """Test reminder is sent for installments due in 3 days"""
@@ -42,3 +47,73 @@ class PaymentReminderTests(TestCase):
 
         send_payment_reminders()
         self.assertEqual(len(mail.outbox), 0)
+
+    def test_reminder_queries_do_not_grow_with_volume(self):
+        """Reminders of a chunk are loaded with their plan and customer in one query."""
+        due_date = datetime.now().date() + timedelta(days=3)
+        with disable_installment_creation_signal():
+            installment_plans = InstallmentPlanFactory.create_batch(4, plan=self.plan)
+        installments = [
+            InstallmentFactory(installment_plan=installment_plan, due_date=due_date)
+            for installment_plan in installment_plans
+        ]
+
+        # One SELECT for the chunk and one bulk INSERT into the delivery ledger
+        with self.assertNumQueries(2):
+            result = send_payment_reminder_chunk(
+                [installment.id for installment in installments], datetime.now().date().isoformat()
+            )
+
+        self.assertEqual(result['sent'], 4)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertIn(self.plan.name, mail.outbox[0].body)
+
+    def test_fan_out_dispatches_id_chunks_as_group(self):
+        """In fan-out mode the coordinator only sends installment ids to worker tasks."""
+        due_date = datetime.now().date() + timedelta(days=3)
+        with disable_installment_creation_signal():
+            installment_plans = InstallmentPlanFactory.create_batch(3, plan=self.plan)
+        installments = [
+            InstallmentFactory(installment_plan=installment_plan, due_date=due_date)
+            for installment_plan in installment_plans
+        ]
+
+        with mock.patch("notification.tasks.REMINDER_FAN_OUT_CHUNK_SIZE", 2), \
+                mock.patch("notification.tasks.group") as group_mock:
+            result = send_payment_reminders(fan_out=True)
+
+        self.assertEqual(result, {'chunks': 2, 'installments': 3})
+        signatures = list(group_mock.call_args.args[0])
+        self.assertListEqual(
+            [signature.args[0] for signature in signatures],
+            [[installments[0].id, installments[1].id], [installments[2].id]],
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_all_offsets_are_collected_in_one_query(self):
+        """Reminders for every offset come from a single query, tagged by offset."""
+        today = datetime.now().date()
+        with disable_installment_creation_signal():
+            installment_plans = InstallmentPlanFactory.create_batch(4, plan=self.plan)
+        InstallmentFactory(installment_plan=installment_plans[0], due_date=today + timedelta(days=7))
+        InstallmentFactory(installment_plan=installment_plans[1], due_date=today)
+        InstallmentFactory(
+            installment_plan=installment_plans[2],
+            due_date=today - timedelta(days=1),
+            status=Installment.Status.LATE,
+        )
+        # Not a configured offset
+        InstallmentFactory(installment_plan=installment_plans[3], due_date=today + timedelta(days=2))
+
+        # One SELECT for all offsets and one bulk INSERT into the delivery ledger
+        with self.assertNumQueries(2):
+            result = send_payment_reminders()
+
+        self.assertEqual(result['sent'], 3)
+        subjects = sorted(message.subject.split(':')[0] for message in mail.outbox)
+        self.assertListEqual(
+            subjects,
+            ['Overdue payment reminder', 'Payment due today', 'Upcoming payment reminder'],
+        )
+        overdue = next(message for message in mail.outbox if message.subject.startswith('Overdue'))
+        self.assertIn('1 day overdue', overdue.body)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.urls import reverse
 from django.utils.html import format_html
-from plan.models import Plan
+from plan.models import EnrollmentChunk, EnrollmentJob, Plan
 
 
 @admin.register(Plan)
@@ -30,3 +30,23 @@ class PlanAdmin(admin.ModelAdmin):
             return '-'
         url = reverse('admin:account_user_change', args=[obj.merchant.id])
         return format_html('<a href="{}">{}</a>', url, obj.merchant.email)
+
+
+class EnrollmentChunkInline(admin.TabularInline):
+    """Inline admin interface for EnrollmentChunk within EnrollmentJob."""
+    model = EnrollmentChunk
+    extra = 0
+    can_delete = False
+    fields = ('index', 'status', 'enrolled_count', 'skipped_count', 'rejected_count', 'attempts', 'error')
+    readonly_fields = fields
+
+
+@admin.register(EnrollmentJob)
+class EnrollmentJobAdmin(admin.ModelAdmin):
+    """Admin interface configuration for EnrollmentJob model."""
+
+    list_display = ('id', 'plan', 'merchant', 'status', 'total_customers', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('plan__name', 'merchant__email')
+    readonly_fields = ('created_at', 'updated_at', 'finished_at')
+    inlines = [EnrollmentChunkInline]
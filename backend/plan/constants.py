@@ -4,3 +4,13 @@ MAX_INSTALLMENT_COUNT = 36
 MIN_INSTALLMENT_COUNT = 1
 MIN_PLAN_AMOUNT = 1.00
 
+
+# Asynchronous enrollment jobs
+ENROLLMENT_CHUNK_SIZE = 1000  # Customers processed by one worker task
+ENROLLMENT_MAX_CUSTOMERS = 100_000  # Upper bound of customer_ids per job
+ENROLLMENT_CHUNK_MAX_RETRIES = 3
+ENROLLMENT_CHUNK_RETRY_DELAY = 30  # Seconds between retries of a failed chunk
+
+# Streaming export of a merchant's installment book
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched from the server-side cursor and written per chunk
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plan', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrollmentJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Timestamp when this record was created.', verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when this record was last updated.', verbose_name='updated at')),
+                ('start_date', models.DateField(help_text='Date when the first installment of every enrolled plan is due.', verbose_name='start date')),
+                ('total_customers', models.PositiveIntegerField(help_text='Number of distinct customers submitted with the job.', verbose_name='total customers')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', help_text='Current lifecycle status of the enrollment job.', max_length=10, verbose_name='status')),
+                ('finished_at', models.DateTimeField(blank=True, help_text='Timestamp when the last chunk finished.', null=True, verbose_name='finished at')),
+                ('merchant', models.ForeignKey(help_text='The merchant user who requested the enrollment.', limit_choices_to={'user_type': 'merchant'}, on_delete=django.db.models.deletion.CASCADE, related_name='enrollment_jobs', to=settings.AUTH_USER_MODEL)),
+                ('plan', models.ForeignKey(help_text='The plan template customers are enrolled into.', on_delete=django.db.models.deletion.PROTECT, related_name='enrollment_jobs', to='plan.plan')),
+            ],
+            options={
+                'verbose_name': 'enrollment job',
+                'verbose_name_plural': 'enrollment jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EnrollmentChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Timestamp when this record was created.', verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when this record was last updated.', verbose_name='updated at')),
+                ('index', models.PositiveIntegerField(help_text='Position of this chunk within the job.', verbose_name='index')),
+                ('customer_ids', models.JSONField(help_text='IDs of the customers to enroll in this chunk.', verbose_name='customer IDs')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', help_text='Current processing status of the chunk.', max_length=10, verbose_name='status')),
+                ('enrolled_count', models.PositiveIntegerField(default=0, help_text='Customers enrolled by this chunk.', verbose_name='enrolled count')),
+                ('skipped_count', models.PositiveIntegerField(default=0, help_text='Customers that already had an installment plan for the template.', verbose_name='skipped count')),
+                ('rejected_count', models.PositiveIntegerField(default=0, help_text='Customers that were not eligible for enrollment.', verbose_name='rejected count')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Number of failed processing attempts.', verbose_name='attempts')),
+                ('error', models.TextField(blank=True, default='', help_text='Last processing error, if any.', verbose_name='error')),
+                ('job', models.ForeignKey(help_text='The enrollment job this chunk belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='plan.enrollmentjob')),
+            ],
+            options={
+                'verbose_name': 'enrollment chunk',
+                'verbose_name_plural': 'enrollment chunks',
+                'ordering': ['index'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'index'), name='unique_chunk_index_per_job')],
+            },
+        ),
+    ]
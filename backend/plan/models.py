@@ -78,3 +78,135 @@ class Plan(AbstractTimestampedModel):
         verbose_name = _('plan')
         verbose_name_plural = _('plans')
         ordering = ['-created_at']
+
+
+class EnrollmentJob(AbstractTimestampedModel):
+    """An asynchronous enrollment of many customers into one plan template.
+
+    The customer list is split into EnrollmentChunk rows that are processed
+    independently by Celery workers.
+    """
+
+    class Status(models.TextChoices):
+        """Enumeration of possible enrollment job statuses."""
+        PENDING = 'pending', _('Pending')        # Accepted, not dispatched yet
+        RUNNING = 'running', _('Running')        # Chunks are being processed
+        COMPLETED = 'completed', _('Completed')  # Every chunk completed
+        FAILED = 'failed', _('Failed')           # One or more chunks failed after all retries
+
+    merchant = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='enrollment_jobs',
+        limit_choices_to={'user_type': User.UserType.MERCHANT},
+        help_text=_('The merchant user who requested the enrollment.'),
+    )
+    plan = models.ForeignKey(
+        Plan,
+        on_delete=models.PROTECT,
+        related_name='enrollment_jobs',
+        help_text=_('The plan template customers are enrolled into.'),
+    )
+    start_date = models.DateField(
+        _('start date'),
+        help_text=_('Date when the first installment of every enrolled plan is due.'),
+    )
+    total_customers = models.PositiveIntegerField(
+        _('total customers'),
+        help_text=_('Number of distinct customers submitted with the job.'),
+    )
+    status = models.CharField(
+        _('status'),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text=_('Current lifecycle status of the enrollment job.'),
+    )
+    finished_at = models.DateTimeField(
+        _('finished at'),
+        null=True,
+        blank=True,
+        help_text=_('Timestamp when the last chunk finished.'),
+    )
+
+    def __str__(self) -> str:
+        """Return a readable identifier for the enrollment job."""
+        return f"Enrollment Job #{self.id}"
+
+    class Meta:
+        verbose_name = _('enrollment job')
+        verbose_name_plural = _('enrollment jobs')
+        ordering = ['-created_at']
+
+
+class EnrollmentChunk(AbstractTimestampedModel):
+    """A slice of an enrollment job's customer list, processed in one transaction."""
+
+    class Status(models.TextChoices):
+        """Enumeration of possible enrollment chunk statuses."""
+        PENDING = 'pending', _('Pending')
+        COMPLETED = 'completed', _('Completed')
+        FAILED = 'failed', _('Failed')
+
+    job = models.ForeignKey(
+        EnrollmentJob,
+        on_delete=models.CASCADE,
+        related_name='chunks',
+        help_text=_('The enrollment job this chunk belongs to.'),
+    )
+    index = models.PositiveIntegerField(
+        _('index'),
+        help_text=_('Position of this chunk within the job.'),
+    )
+    customer_ids = models.JSONField(
+        _('customer IDs'),
+        help_text=_('IDs of the customers to enroll in this chunk.'),
+    )
+    status = models.CharField(
+        _('status'),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text=_('Current processing status of the chunk.'),
+    )
+    enrolled_count = models.PositiveIntegerField(
+        _('enrolled count'),
+        default=0,
+        help_text=_('Customers enrolled by this chunk.'),
+    )
+    skipped_count = models.PositiveIntegerField(
+        _('skipped count'),
+        default=0,
+        help_text=_('Customers that already had an installment plan for the template.'),
+    )
+    rejected_count = models.PositiveIntegerField(
+        _('rejected count'),
+        default=0,
+        help_text=_('Customers that were not eligible for enrollment.'),
+    )
+    attempts = models.PositiveSmallIntegerField(
+        _('attempts'),
+        default=0,
+        help_text=_('Number of failed processing attempts.'),
+    )
+    error = models.TextField(
+        _('error'),
+        blank=True,
+        default='',
+        help_text=_('Last processing error, if any.'),
+    )
+
+    def __str__(self) -> str:
+        """Return a readable identifier for the enrollment chunk."""
+        return f"Enrollment Chunk #{self.index} of Job #{self.job_id}"
+
+    class Meta:
+        verbose_name = _('enrollment chunk')
+        verbose_name_plural = _('enrollment chunks')
+        ordering = ['index']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'index'],
+                name='unique_chunk_index_per_job',
+            ),
+        ]
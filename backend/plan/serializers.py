@@ -7,10 +7,18 @@ from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 
-from plan.constants import DEFAULT_INSTALLMENT_PERIOD, MAX_INSTALLMENT_COUNT, MIN_INSTALLMENT_COUNT, MIN_PLAN_AMOUNT
+from plan.constants import (
+    DEFAULT_INSTALLMENT_PERIOD,
+    ENROLLMENT_MAX_CUSTOMERS,
+    EXPORT_FORMATS,
+    MAX_INSTALLMENT_COUNT,
+    MIN_INSTALLMENT_COUNT,
+    MIN_PLAN_AMOUNT,
+)
 from installment.models import InstallmentPlan
 from installment.serializers import BaseInstallmentSerializer
-from plan.models import Plan
+from plan.models import EnrollmentJob, Plan
+from plan.services.enrollment import EnrollmentJobService
 from plan.services.plan_creator import PlanCreatorService
 from plan.validators import PlanValidator
 
@@ -20,10 +28,14 @@ User = get_user_model()
 class ProgressSerializer(serializers.Serializer):
     """Serializer for calculating and representing payment progress metrics.
 
+    Metrics are read from the progress fields denormalized onto the
+    InstallmentPlan, so serializing a plan issues no query.
+
     Attributes:
         paid: Number of installments already paid.
         total: Total number of installments in the plan.
         percentage: Payment completion percentage (0-100).
+        outstanding_amount: Amount still to be paid.
         next_due_date: Date of the next upcoming installment.
         days_remaining: Days remaining until next payment is due.
     """
@@ -33,6 +45,11 @@ class ProgressSerializer(serializers.Serializer):
     percentage = serializers.FloatField(
         help_text="Percentage of installments paid (0-100)"
     )
+    outstanding_amount = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        help_text="Amount of the unpaid installments"
+    )
     next_due_date = serializers.DateField(
         help_text="Next upcoming due date",
         required=False
@@ -53,27 +70,27 @@ class ProgressSerializer(serializers.Serializer):
                 - paid: Count of paid installments
                 - total: Total installments
                 - percentage: Completion percentage
+                - outstanding_amount: Amount still to be paid
                 - next_due_date: Next due date (if pending installments exist)
                 - days_remaining: Days until next payment (if applicable)
         """
-        paid = instance.installments.filter(status='paid').count()
-        total = instance.installments.count()
+        paid = instance.paid_count
+        total = instance.total_count
         percentage = (paid / total * 100) if total else 0
 
-        next_installment = instance.installments.filter(
-            status='pending'
-        ).order_by('due_date').first()
-
         representation = {
             'paid': paid,
             'total': total,
             'percentage': percentage,
+            'outstanding_amount': self.fields['outstanding_amount'].to_representation(
+                instance.outstanding_amount
+            ),
         }
 
-        if next_installment:
+        if instance.next_due_date:
             representation.update({
-                'next_due_date': next_installment.due_date,
-                'days_remaining': (next_installment.due_date - timezone.now().date()).days
+                'next_due_date': instance.next_due_date,
+                'days_remaining': (instance.next_due_date - timezone.now().date()).days
             })
 
         return representation
@@ -285,4 +302,123 @@ class InstallmentPlanDetailSerializer(serializers.ModelSerializer):
         if representation['customer_email'] is None:
             representation.pop('customer_email', None)
 
-        return representation
\ No newline at end of file
+        return representation
+
+
+class EnrollmentJobCreateSerializer(serializers.Serializer):
+    """Serializer for enrolling many customers into a new plan asynchronously (merchant only).
+
+    Customer eligibility is checked by the workers for each chunk, so large
+    lists are accepted without querying every customer during the request.
+    """
+
+    name = serializers.CharField(
+        max_length=128
+    )
+    total_amount = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        validators=[
+            MinValueValidator(
+                MIN_PLAN_AMOUNT,
+                message=_('Amount must be ≥ {min} USD.').format(min=MIN_PLAN_AMOUNT)
+            )
+        ]
+    )
+    installment_count = serializers.IntegerField(
+        help_text="Number of installments. Example: 4",
+        max_value=MAX_INSTALLMENT_COUNT,
+        min_value=MIN_INSTALLMENT_COUNT,
+        error_messages={
+            'max_value': _('Maximum number of installments is {max}.').format(max=MAX_INSTALLMENT_COUNT),
+            'min_value': _('Minimum number of installments is {min}.').format(min=MIN_INSTALLMENT_COUNT)
+        }
+    )
+    installment_period = serializers.IntegerField(
+        required=False,
+        default=DEFAULT_INSTALLMENT_PERIOD,
+        help_text="Installment interval in days. Example: 30"
+    )
+    customer_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=ENROLLMENT_MAX_CUSTOMERS,
+        help_text="IDs of the customers to enroll."
+    )
+    start_date = serializers.DateField(
+        required=False,
+        default=date.today,
+        help_text="Start date for the installment plans (defaults to today).Use this format: YYYY-MM-DD"
+    )
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate plan template data.
+
+        Args:
+            data: Input data for the enrollment job.
+
+        Returns:
+            Validated data dictionary
+
+        Raises:
+            ValidationError: If the start date, amount or installment count is invalid.
+        """
+        request = self.context['request']
+        for validator in PlanValidator().validators:
+            data = validator.validate(data, request)
+        return data
+
+    def create(self, validated_data: Dict[str, Any]) -> EnrollmentJob:
+        """
+        Creates the Plan template and an EnrollmentJob that enrolls the customers.
+
+        Args:
+            validated_data (Dict[str, Any]): The validated data for the job.
+
+        Returns:
+            EnrollmentJob: The newly accepted job.
+        """
+        return EnrollmentJobService.create_job(
+            merchant=self.context['request'].user,
+            **validated_data,
+        )
+
+
+class EnrollmentJobSerializer(serializers.ModelSerializer):
+    """Serializer for the status and progress of an enrollment job."""
+
+    plan_id = serializers.IntegerField(read_only=True)
+    progress = serializers.SerializerMethodField(
+        help_text="Chunk counts by status and customer counts by outcome"
+    )
+
+    class Meta:
+        """Metadata options for EnrollmentJobSerializer."""
+
+        model = EnrollmentJob
+        fields = [
+            'id',
+            'plan_id',
+            'status',
+            'start_date',
+            'total_customers',
+            'progress',
+            'created_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj: EnrollmentJob) -> Dict[str, int]:
+        """Return the aggregated progress of the job's chunks."""
+        return EnrollmentJobService.get_progress(obj.id)
+
+
+class InstallmentBookExportQuerySerializer(serializers.Serializer):
+    """Serializer for validating installment book export query parameters."""
+
+    # Not named `format`, which DRF reserves for selecting a renderer
+    export_format = serializers.ChoiceField(
+        choices=EXPORT_FORMATS,
+        default='csv',
+        help_text=_("File format of the export: csv or ndjson"),
+    )
@@ -0,0 +1,272 @@
+from datetime import date
+from typing import Any, Dict, List
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from core.logging.logger import get_logger
+from customer.models import CustomerProfile
+from installment.models import InstallmentPlan
+from installment.utils.bulk_load import bulk_load_installment_plans
+from plan.constants import ENROLLMENT_CHUNK_SIZE
+from plan.models import EnrollmentChunk, EnrollmentJob, Plan
+
+User = get_user_model()
+logger = get_logger(__name__)
+
+
+class EnrollmentJobService:
+    """Service for asynchronous enrollment of many customers into one plan template.
+
+    A job is accepted in one short transaction: the Plan template, the job and its
+    chunks are stored and the job is dispatched to Celery after commit. Every chunk
+    is then processed in its own transaction, so a crashed chunk rolls back
+    completely and can be retried. Customers that already have an installment
+    plan for the template are skipped, which keeps retries idempotent.
+    """
+
+    @staticmethod
+    def create_job(
+        *,
+        merchant: User,
+        name: str,
+        total_amount: float,
+        installment_count: int,
+        installment_period: int,
+        customer_ids: List[int],
+        start_date: date,
+        chunk_size: int = ENROLLMENT_CHUNK_SIZE,
+    ) -> EnrollmentJob:
+        """Create the plan template and an enrollment job split into chunks.
+
+        Args:
+            merchant: Merchant creating the plan.
+            name: Plan name.
+            total_amount: Total amount.
+            installment_count: Number of installments.
+            installment_period: Days between installments.
+            customer_ids: IDs of the customers to enroll; duplicates are ignored.
+            start_date: When installments begin.
+            chunk_size: Number of customers per chunk.
+
+        Returns:
+            EnrollmentJob: The pending job; processing starts once the transaction commits.
+        """
+        # Keep the submitted order while dropping duplicates
+        unique_ids = list(dict.fromkeys(customer_ids))
+
+        with transaction.atomic():
+            plan = Plan.objects.create(
+                merchant=merchant,
+                name=name,
+                total_amount=total_amount,
+                installment_count=installment_count,
+                installment_period=installment_period,
+                status=Plan.Status.ACTIVE,
+            )
+            job = EnrollmentJob.objects.create(
+                merchant=merchant,
+                plan=plan,
+                start_date=start_date,
+                total_customers=len(unique_ids),
+            )
+            EnrollmentChunk.objects.bulk_create([
+                EnrollmentChunk(job=job, index=index, customer_ids=unique_ids[offset:offset + chunk_size])
+                for index, offset in enumerate(range(0, len(unique_ids), chunk_size))
+            ])
+
+            transaction.on_commit(lambda: EnrollmentJobService.dispatch(job.id))
+
+        logger.info(
+            "enrollment_job_created",
+            operation="enrollment_job_create",
+            user_id=merchant.id,
+            plan_id=plan.id,
+            enrollment_job_id=job.id,
+            total_customers=job.total_customers,
+        )
+        return job
+
+    @staticmethod
+    def dispatch(job_id: int) -> None:
+        """Queue the Celery task that fans out the job's unfinished chunks."""
+        # Imported here because plan.tasks imports this module
+        from plan.tasks import run_enrollment_job
+
+        run_enrollment_job.delay(job_id)
+
+    @staticmethod
+    def resume(job: EnrollmentJob) -> EnrollmentJob:
+        """Reset failed chunks of an unfinished job and dispatch it again.
+
+        Besides failed jobs, this recovers pending or running jobs whose
+        dispatch was lost (broker outage, worker killed before processing):
+        every pending chunk is queued again. Completed chunks are never
+        reprocessed, a chunk delivered twice is processed once under its row
+        lock, and chunks retried after a partial crash skip customers that
+        were already enrolled.
+
+        Args:
+            job: The job to resume.
+
+        Returns:
+            EnrollmentJob: The job, back in the pending status.
+        """
+        with transaction.atomic():
+            EnrollmentChunk.objects.filter(job=job, status=EnrollmentChunk.Status.FAILED).update(
+                status=EnrollmentChunk.Status.PENDING,
+                error='',
+                updated_at=timezone.now(),
+            )
+            EnrollmentJob.objects.filter(pk=job.pk).update(
+                status=EnrollmentJob.Status.PENDING,
+                finished_at=None,
+                updated_at=timezone.now(),
+            )
+            transaction.on_commit(lambda: EnrollmentJobService.dispatch(job.id))
+
+        job.refresh_from_db()
+        return job
+
+    @staticmethod
+    def process_chunk(chunk_id: int) -> EnrollmentChunk:
+        """Enroll the customers of one chunk in a single transaction.
+
+        The chunk row is locked first, so two deliveries of the same task run one
+        after the other and the second one finds the chunk completed.
+
+        Args:
+            chunk_id: ID of the chunk to process.
+
+        Returns:
+            EnrollmentChunk: The processed chunk.
+
+        Raises:
+            BusinessException: If the plan template produces an invalid schedule.
+        """
+        with transaction.atomic():
+            chunk = (
+                EnrollmentChunk.objects
+                .select_for_update(of=('self',))
+                .select_related('job__plan')
+                .get(pk=chunk_id)
+            )
+            if chunk.status == EnrollmentChunk.Status.COMPLETED:
+                return chunk
+
+            plan = chunk.job.plan
+            customer_ids = chunk.customer_ids
+
+            eligible_ids = set(
+                User.objects.filter(
+                    id__in=customer_ids,
+                    user_type=User.UserType.CUSTOMER,
+                    customer_profile__score_status=CustomerProfile.ScoreStatus.APPROVED,
+                    customer_profile__is_active=True,
+                ).values_list('id', flat=True)
+            )
+            # Anti-join: customers enrolled by an earlier, partially committed attempt
+            enrolled_ids = set(
+                InstallmentPlan.objects.filter(
+                    plan=plan,
+                    customer_id__in=eligible_ids,
+                ).values_list('customer_id', flat=True)
+            )
+            pending_ids = [
+                customer_id for customer_id in customer_ids
+                if customer_id in eligible_ids and customer_id not in enrolled_ids
+            ]
+
+            enrolled = bulk_load_installment_plans(
+                plan=plan,
+                customers=(User(pk=customer_id) for customer_id in pending_ids),
+                start_date=chunk.job.start_date,
+            )
+
+            chunk.status = EnrollmentChunk.Status.COMPLETED
+            chunk.enrolled_count = enrolled
+            chunk.skipped_count = len(enrolled_ids)
+            chunk.rejected_count = len(customer_ids) - len(eligible_ids)
+            chunk.error = ''
+            chunk.save(update_fields=[
+                'status', 'enrolled_count', 'skipped_count', 'rejected_count', 'error', 'updated_at',
+            ])
+
+        logger.info(
+            "enrollment_chunk_completed",
+            operation="enrollment_chunk_process",
+            enrollment_job_id=chunk.job_id,
+            enrollment_chunk_id=chunk.id,
+            enrolled=chunk.enrolled_count,
+            skipped=chunk.skipped_count,
+            rejected=chunk.rejected_count,
+        )
+        return chunk
+
+    @staticmethod
+    def record_chunk_failure(chunk_id: int, error: str, final: bool) -> EnrollmentChunk:
+        """Record a failed processing attempt of a chunk.
+
+        Args:
+            chunk_id: ID of the chunk that failed.
+            error: Description of the failure.
+            final: Whether the chunk will not be retried anymore.
+
+        Returns:
+            EnrollmentChunk: The updated chunk.
+        """
+        chunk = EnrollmentChunk.objects.get(pk=chunk_id)
+        chunk.attempts += 1
+        chunk.error = error
+        update_fields = ['attempts', 'error', 'updated_at']
+        if final:
+            chunk.status = EnrollmentChunk.Status.FAILED
+            update_fields.append('status')
+        chunk.save(update_fields=update_fields)
+        return chunk
+
+    @staticmethod
+    def refresh_job_status(job_id: int) -> None:
+        """Move a job to its final status once none of its chunks are pending."""
+        progress = EnrollmentJobService.get_progress(job_id)
+        if progress['pending_chunks']:
+            return
+
+        final_status = EnrollmentJob.Status.FAILED if progress['failed_chunks'] else EnrollmentJob.Status.COMPLETED
+        updated = EnrollmentJob.objects.filter(
+            pk=job_id,
+            status__in=[EnrollmentJob.Status.PENDING, EnrollmentJob.Status.RUNNING],
+        ).update(status=final_status, finished_at=timezone.now(), updated_at=timezone.now())
+
+        if updated:
+            logger.info(
+                "enrollment_job_finished",
+                operation="enrollment_job_refresh_status",
+                enrollment_job_id=job_id,
+                status=final_status,
+                **progress,
+            )
+
+    @staticmethod
+    def get_progress(job_id: int) -> Dict[str, Any]:
+        """Aggregate chunk progress of a job in a single query.
+
+        Args:
+            job_id: ID of the job.
+
+        Returns:
+            Dict[str, Any]: Chunk counts by status and customer counts by outcome.
+        """
+        totals = EnrollmentChunk.objects.filter(job_id=job_id).aggregate(
+            total_chunks=Count('id'),
+            pending_chunks=Count('id', filter=Q(status=EnrollmentChunk.Status.PENDING)),
+            completed_chunks=Count('id', filter=Q(status=EnrollmentChunk.Status.COMPLETED)),
+            failed_chunks=Count('id', filter=Q(status=EnrollmentChunk.Status.FAILED)),
+            enrolled_customers=Sum('enrolled_count'),
+            skipped_customers=Sum('skipped_count'),
+            rejected_customers=Sum('rejected_count'),
+        )
+        # Sum() is None for jobs without chunks
+        return {key: value or 0 for key, value in totals.items()}
@@ -0,0 +1,97 @@
+"""Streaming export of a merchant's installment book.
+
+Every installment of the merchant is written as one row together with its
+installment plan, as CSV or NDJSON (one JSON object per line). Rows are
+read from a server-side cursor EXPORT_CHUNK_SIZE at a time and written
+as soon as a chunk is complete, so memory use does not depend on the size
+of the book.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List
+
+from django.contrib.auth import get_user_model
+
+from installment.models import Installment
+from plan.constants import EXPORT_CHUNK_SIZE
+
+User = get_user_model()
+
+# Exported column -> Installment lookup, in output order
+EXPORT_COLUMNS = {
+    'installment_plan_id': 'installment_plan_id',
+    'plan_id': 'installment_plan__plan_id',
+    'plan_name': 'installment_plan__plan__name',
+    'customer_email': 'installment_plan__customer__email',
+    'installment_plan_status': 'installment_plan__status',
+    'start_date': 'installment_plan__start_date',
+    'installment_id': 'id',
+    'sequence_number': 'sequence_number',
+    'amount': 'amount',
+    'due_date': 'due_date',
+    'status': 'status',
+    'paid_at': 'paid_at',
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def export_installment_book(merchant: User, export_format: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield the merchant's installment book as chunks of CSV or NDJSON text.
+
+    Args:
+        merchant: The merchant whose installment plans are exported.
+        export_format: 'csv' (with a header row) or 'ndjson'.
+        chunk_size: Rows fetched per round trip and written per yielded chunk.
+
+    Yields:
+        str: Consecutive chunks of the export, each holding up to `chunk_size` rows.
+    """
+    write_rows = _csv_rows if export_format == 'csv' else _ndjson_rows
+    if export_format == 'csv':
+        yield _csv_lines([list(EXPORT_COLUMNS)])
+
+    rows = (
+        Installment.objects
+        .filter(installment_plan__plan__merchant=merchant)
+        .order_by('installment_plan_id', 'sequence_number')
+        .values_list(*EXPORT_COLUMNS.values())
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append({column: _format(value) for column, value in zip(EXPORT_COLUMNS, row)})
+        if len(chunk) == chunk_size:
+            yield write_rows(chunk)
+            chunk = []
+    if chunk:
+        yield write_rows(chunk)
+
+
+def _csv_rows(rows: List[Dict[str, Any]]) -> str:
+    return _csv_lines(['' if value is None else value for value in row.values()] for row in rows)
+
+
+def _csv_lines(lines: Iterable[List[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(lines)
+    return buffer.getvalue()
+
+
+def _ndjson_rows(rows: List[Dict[str, Any]]) -> str:
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def _format(value: Any) -> Any:
+    """Write amounts as exact decimal strings and dates in ISO 8601."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
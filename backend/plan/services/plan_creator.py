@@ -8,6 +8,7 @@ from plan.constants import DEFAULT_INSTALLMENT_PERIOD
 from installment.models import InstallmentPlan
 from installment.signals import skip_installment_creation, enable_installment_creation
 from installment.utils.bulk_create import bulk_create_installments
+from installment.utils.bulk_load import bulk_load_installment_plans
 from plan.models import Plan
 
 User = get_user_model()
@@ -49,7 +50,8 @@ class PlanCreatorService:
         installment_period: int,
         customers: List[User],
         start_date: date = ...,
-        plan_status: str = ...
+        plan_status: str = ...,
+        use_copy: Optional[bool] = ...
     ) -> None:
         """bulk-version: returns Plan."""
 
@@ -89,7 +91,8 @@ class PlanCreatorService:
         customer: Optional[User] = None,
         customers: Optional[List[User]] = None,
         start_date: date = date.today(),
-        plan_status: str = Plan.Status.ACTIVE
+        plan_status: str = Plan.Status.ACTIVE,
+        use_copy: Optional[bool] = None
     ) -> None:
         """
         Args:
@@ -102,6 +105,8 @@ class PlanCreatorService:
             customers: Multiple customers (bulk-version).
             start_date: When installments begin.
             plan_status: Initial plan status.
+            use_copy: Load bulk-version rows with PostgreSQL COPY instead of ORM INSERTs.
+                Defaults to the ``INSTALLMENT_BULK_LOAD_USE_COPY`` setting.
         """
         if bool(customer) == bool(customers):
             logger.critical(
@@ -120,6 +125,7 @@ class PlanCreatorService:
         self.customers = customers
         self.start_date = start_date
         self.plan_status = plan_status
+        self.use_copy = use_copy
 
     def execute(self) -> Union[InstallmentPlan, Plan]:
         """Create the Plan and associated installment plan(s).
@@ -174,6 +180,8 @@ class PlanCreatorService:
 
                 # Create installments for the plans
                 bulk_create_installments([installment_plan])
+                # Progress fields were computed in the database by bulk_create_installments()
+                installment_plan.refresh_from_db(fields=InstallmentPlan.PROGRESS_FIELDS)
 
                 ordered = list(installment_plan.installments.order_by('due_date'))
                 setattr(installment_plan, 'ordered_installments', ordered)
@@ -181,23 +189,13 @@ class PlanCreatorService:
                 return installment_plan
 
             # Multi-customer flow
-            installment_plans = [
-                InstallmentPlan(
-                    plan=plan,
-                    customer=customer,
-                    start_date=self.start_date
-                )
-                for customer in self.customers
-            ]
-
-            # Disable signal temporarily to prevent auto-installment creation
-            skip_installment_creation()
-            InstallmentPlan.objects.bulk_create(installment_plans)
-
-            # Re-enable signal to allow future installment creation
-            enable_installment_creation()
-
-            # Create installments for the plans
-            bulk_create_installments(installment_plans)
+            # Plans and installments are streamed in chunks; bulk inserts bypass
+            # post_save, so installments are generated by the loader itself.
+            bulk_load_installment_plans(
+                plan=plan,
+                customers=self.customers,
+                start_date=self.start_date,
+                use_copy=self.use_copy,
+            )
 
             return plan
@@ -0,0 +1,73 @@
+from celery import group, shared_task
+
+from core.exceptions import BusinessException
+from core.logging.logger import get_logger
+from plan.constants import ENROLLMENT_CHUNK_MAX_RETRIES, ENROLLMENT_CHUNK_RETRY_DELAY
+from plan.models import EnrollmentChunk, EnrollmentJob
+from plan.services.enrollment import EnrollmentJobService
+
+logger = get_logger(__name__)
+
+
+@shared_task
+def run_enrollment_job(job_id: int) -> None:
+    """Fan out every unfinished chunk of an enrollment job to the workers.
+
+    Completed chunks are left alone, so running the task again resumes the job.
+
+    Args:
+        job_id (int): ID of the enrollment job.
+
+    Returns:
+        None
+    """
+    chunk_ids = list(
+        EnrollmentChunk.objects
+        .filter(job_id=job_id, status=EnrollmentChunk.Status.PENDING)
+        .values_list('id', flat=True)
+    )
+    EnrollmentJob.objects.filter(pk=job_id, status=EnrollmentJob.Status.PENDING).update(
+        status=EnrollmentJob.Status.RUNNING
+    )
+
+    if not chunk_ids:
+        EnrollmentJobService.refresh_job_status(job_id)
+        return
+
+    group(process_enrollment_chunk.s(chunk_id) for chunk_id in chunk_ids).apply_async()
+
+
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True, max_retries=ENROLLMENT_CHUNK_MAX_RETRIES)
+def process_enrollment_chunk(self, chunk_id: int) -> None:
+    """Enroll the customers of one chunk, retrying transient failures.
+
+    The task is acknowledged only after it finishes, so a chunk whose worker
+    crashed is redelivered; its transaction was rolled back, and customers
+    enrolled by any earlier attempt are skipped.
+
+    Args:
+        chunk_id (int): ID of the enrollment chunk.
+
+    Returns:
+        None
+    """
+    try:
+        chunk = EnrollmentJobService.process_chunk(chunk_id)
+    except BusinessException as exc:
+        # An invalid plan template fails the same way on every attempt
+        chunk = EnrollmentJobService.record_chunk_failure(chunk_id, error=str(exc.detail), final=True)
+    except Exception as exc:
+        final = self.request.retries >= self.max_retries
+        logger.error(
+            "enrollment_chunk_failed",
+            operation="enrollment_chunk_process",
+            exc_info=True,
+            enrollment_chunk_id=chunk_id,
+            attempt=self.request.retries + 1,
+            final=final,
+        )
+        chunk = EnrollmentJobService.record_chunk_failure(chunk_id, error=str(exc), final=final)
+        if not final:
+            raise self.retry(exc=exc, countdown=ENROLLMENT_CHUNK_RETRY_DELAY)
+
+    EnrollmentJobService.refresh_job_status(chunk.job_id)
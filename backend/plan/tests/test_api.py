@@ -1,5 +1,6 @@
 from datetime import date, timedelta
 
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -154,3 +155,73 @@ class PlanCreationAPITest(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
             self.assertIn('total_amount',
                           [error['field'] for error in response.data['errors']])
+
+
+class PlanCreationIdempotencyTest(APITestCase):
+    """Test suite for Idempotency-Key handling of plan creation."""
+
+    def setUp(self):
+        cache.clear()
+        self.merchant = MerchantUserFactory()
+        self.merchant.merchant_profile.is_verified = True
+        self.merchant.merchant_profile.save()
+
+        self.customer = CustomerUserFactory()
+        self.customer.customer_profile.score_status = CustomerProfile.ScoreStatus.APPROVED
+        self.customer.customer_profile.save()
+
+        self.client.force_authenticate(user=self.merchant)
+        self.url = reverse('installment_plan_list_create_api')
+        self.data = {
+            'name': '4-Payment Plan',
+            'total_amount': 1000.00,
+            'installment_count': 4,
+            'installment_period': 30,
+            'customer_email': self.customer.email,
+        }
+
+    def test_retry_replays_first_response_without_duplicate(self):
+        """A retried creation returns the first response and creates a single plan."""
+        first = self.client.post(self.url, self.data, HTTP_IDEMPOTENCY_KEY='create-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            retry = self.client.post(self.url, self.data, HTTP_IDEMPOTENCY_KEY='create-1')
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(InstallmentPlan.objects.count(), 1)
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        """The same key with a different body is rejected instead of replayed."""
+        self.client.post(self.url, self.data, HTTP_IDEMPOTENCY_KEY='create-1')
+        response = self.client.post(
+            self.url, {**self.data, 'installment_count': 6}, HTTP_IDEMPOTENCY_KEY='create-1',
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(InstallmentPlan.objects.count(), 1)
+
+    def test_failed_request_does_not_hold_the_key(self):
+        """A rejected request can be corrected and retried with the same key."""
+        invalid = self.client.post(
+            self.url, {**self.data, 'customer_email': ''}, HTTP_IDEMPOTENCY_KEY='create-1',
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, self.data, HTTP_IDEMPOTENCY_KEY='create-1')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_keys_are_scoped_to_the_user(self):
+        """Another merchant using the same key gets its own plan."""
+        self.client.post(self.url, self.data, HTTP_IDEMPOTENCY_KEY='create-1')
+
+        other = MerchantUserFactory()
+        other.merchant_profile.is_verified = True
+        other.merchant_profile.save()
+        self.client.force_authenticate(user=other)
+        response = self.client.post(self.url, self.data, HTTP_IDEMPOTENCY_KEY='create-1')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(InstallmentPlan.objects.count(), 2)
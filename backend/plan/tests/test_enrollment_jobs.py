@@ -0,0 +1,182 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from customer.models import CustomerProfile
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment, InstallmentPlan
+from installment.utils.signal_control import disable_installment_creation_signal
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import EnrollmentChunk, EnrollmentJob
+from plan.services.enrollment import EnrollmentJobService
+from plan.tasks import process_enrollment_chunk, run_enrollment_job
+
+
+class EnrollmentJobTests(APITestCase):
+    """Tests for asynchronous, chunked enrollment jobs."""
+
+    def setUp(self) -> None:
+        self.merchant = MerchantUserFactory()
+        self.merchant.merchant_profile.is_verified = True
+        self.merchant.merchant_profile.save()
+
+        self.customers = CustomerUserFactory.create_batch(5)
+        for customer in self.customers:
+            customer.customer_profile.score_status = CustomerProfile.ScoreStatus.APPROVED
+            customer.customer_profile.save()
+        self.customer_ids = [customer.id for customer in self.customers]
+
+        self.client.force_authenticate(user=self.merchant)
+
+    def _create_job(self, customer_ids=None, chunk_size: int = 2) -> EnrollmentJob:
+        with mock.patch("plan.tasks.run_enrollment_job.delay"):
+            return EnrollmentJobService.create_job(
+                merchant=self.merchant,
+                name="Bulk Plan",
+                total_amount=Decimal("90.00"),
+                installment_count=3,
+                installment_period=30,
+                customer_ids=customer_ids or self.customer_ids,
+                start_date=date.today(),
+                chunk_size=chunk_size,
+            )
+
+    def test_create_endpoint_accepts_job_and_dispatches_after_commit(self) -> None:
+        """The API stores the job and its chunks and queues it without enrolling anyone."""
+        data = {
+            'name': 'Bulk Plan',
+            'total_amount': 90.00,
+            'installment_count': 3,
+            'customer_ids': self.customer_ids + self.customer_ids[:1],
+        }
+        with mock.patch("plan.tasks.run_enrollment_job.delay") as delay_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('enrollment_job_create_api'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = EnrollmentJob.objects.get(pk=response.data['data']['id'])
+        delay_mock.assert_called_once_with(job.id)
+        self.assertEqual(job.total_customers, 5)
+        self.assertEqual(job.status, EnrollmentJob.Status.PENDING)
+        self.assertEqual(InstallmentPlan.objects.filter(plan=job.plan).count(), 0)
+        self.assertEqual(response.data['data']['progress']['pending_chunks'], 1)
+
+    def test_run_job_fans_out_pending_chunks_only(self) -> None:
+        """Completed chunks are not dispatched again when a job is re-run."""
+        job = self._create_job()
+        first_chunk = job.chunks.get(index=0)
+        EnrollmentJobService.process_chunk(first_chunk.id)
+
+        with mock.patch("plan.tasks.group") as group_mock:
+            run_enrollment_job(job.id)
+
+        signatures = list(group_mock.call_args.args[0])
+        self.assertListEqual(
+            sorted(signature.args[0] for signature in signatures),
+            list(job.chunks.exclude(pk=first_chunk.pk).values_list('id', flat=True).order_by('id')),
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, EnrollmentJob.Status.RUNNING)
+
+    def test_chunks_enroll_customers_and_complete_job(self) -> None:
+        """Processing every chunk enrolls each eligible customer once and finishes the job."""
+        ineligible = CustomerUserFactory()
+        job = self._create_job(customer_ids=self.customer_ids + [ineligible.id])
+
+        for chunk in job.chunks.all():
+            process_enrollment_chunk.apply(args=[chunk.id])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, EnrollmentJob.Status.COMPLETED)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(InstallmentPlan.objects.filter(plan=job.plan).count(), 5)
+        self.assertEqual(Installment.objects.filter(installment_plan__plan=job.plan).count(), 15)
+
+        progress = EnrollmentJobService.get_progress(job.id)
+        self.assertEqual(progress['completed_chunks'], 3)
+        self.assertEqual(progress['enrolled_customers'], 5)
+        self.assertEqual(progress['rejected_customers'], 1)
+
+    def test_retried_chunk_skips_customers_already_enrolled(self) -> None:
+        """A chunk retried after a partial enrollment creates no duplicate installment plans."""
+        job = self._create_job()
+        chunk = job.chunks.get(index=0)
+        with disable_installment_creation_signal():
+            InstallmentPlan.objects.create(plan=job.plan, customer_id=chunk.customer_ids[0])
+
+        EnrollmentJobService.process_chunk(chunk.id)
+        # A duplicate delivery of the same task is a no-op
+        EnrollmentJobService.process_chunk(chunk.id)
+
+        chunk.refresh_from_db()
+        self.assertEqual(chunk.enrolled_count, 1)
+        self.assertEqual(chunk.skipped_count, 1)
+        for customer_id in chunk.customer_ids:
+            self.assertEqual(
+                InstallmentPlan.objects.filter(plan=job.plan, customer_id=customer_id).count(), 1
+            )
+
+    def test_failed_chunk_fails_job_and_can_be_resumed(self) -> None:
+        """A chunk failing permanently marks the job failed; resuming re-queues only that chunk."""
+        job = self._create_job(chunk_size=5)
+        chunk = job.chunks.get()
+        job.plan.total_amount = Decimal("0.01")  # 3 installments would round to zero
+        job.plan.save()
+
+        process_enrollment_chunk.apply(args=[chunk.id])
+
+        job.refresh_from_db()
+        chunk.refresh_from_db()
+        self.assertEqual(job.status, EnrollmentJob.Status.FAILED)
+        self.assertEqual(chunk.status, EnrollmentChunk.Status.FAILED)
+        self.assertEqual(chunk.attempts, 1)
+
+        url = reverse('enrollment_job_resume_api', args=[job.id])
+        with mock.patch("plan.tasks.run_enrollment_job.delay") as delay_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        delay_mock.assert_called_once_with(job.id)
+        self.assertEqual(response.data['data']['status'], EnrollmentJob.Status.PENDING)
+        self.assertEqual(response.data['data']['progress']['pending_chunks'], 1)
+
+    def test_job_with_lost_dispatch_can_be_resumed(self) -> None:
+        """A job stuck running with pending chunks is re-dispatched; completed jobs are not."""
+        job = self._create_job(chunk_size=2)
+        EnrollmentJob.objects.filter(pk=job.pk).update(status=EnrollmentJob.Status.RUNNING)
+        process_enrollment_chunk.apply(args=[job.chunks.order_by('id').first().id])
+        url = reverse('enrollment_job_resume_api', args=[job.id])
+
+        with mock.patch("plan.tasks.run_enrollment_job.delay", side_effect=run_enrollment_job), \
+                mock.patch("plan.tasks.group") as group_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        pending_ids = list(job.chunks.filter(status=EnrollmentChunk.Status.PENDING).values_list('id', flat=True))
+        self.assertEqual(len(pending_ids), 2)
+        self.assertEqual(sorted(signature.args[0] for signature in group_mock.call_args.args[0]), sorted(pending_ids))
+
+        for chunk_id in pending_ids:
+            process_enrollment_chunk.apply(args=[chunk_id])
+        job.refresh_from_db()
+        self.assertEqual(job.status, EnrollmentJob.Status.COMPLETED)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_409_CONFLICT)
+
+    def test_status_endpoint_is_limited_to_job_owner(self) -> None:
+        """Merchants can read their own jobs only."""
+        job = self._create_job()
+        url = reverse('enrollment_job_detail_api', args=[job.id])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['progress']['total_chunks'], 3)
+
+        self.client.force_authenticate(user=MerchantUserFactory())
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
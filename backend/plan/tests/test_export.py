@@ -0,0 +1,89 @@
+"""Tests for the streaming export of a merchant's installment book."""
+import csv
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from customer.tests.factories import CustomerUserFactory
+from installment.models import Installment
+from installment.tests.factories import InstallmentPlanFactory
+from installment.utils.schedule import schedule_cache
+from merchant.tests.factories import MerchantUserFactory
+from plan.models import Plan
+from plan.services.export import EXPORT_COLUMNS, export_installment_book
+from plan.tests.factories import PlanFactory
+
+
+class InstallmentBookExportTest(APITestCase):
+    """Test suite for GET /api/plans/export/."""
+
+    def setUp(self) -> None:
+        schedule_cache.clear()
+        self.merchant = MerchantUserFactory()
+        self.customer = CustomerUserFactory()
+        plan = PlanFactory(merchant=self.merchant, installment_count=3, status=Plan.Status.ACTIVE)
+        self.installment_plans = [
+            InstallmentPlanFactory(plan=plan, customer=self.customer) for _ in range(2)
+        ]
+        self.paid_at = datetime(2026, 3, 1, 10, 30, tzinfo=dt_timezone.utc)
+        Installment.objects.filter(installment_plan=self.installment_plans[0], sequence_number=1).update(
+            status=Installment.Status.PAID, paid_at=self.paid_at,
+        )
+        InstallmentPlanFactory(plan=PlanFactory(merchant=MerchantUserFactory(), status=Plan.Status.ACTIVE))
+        self.url = reverse('installment_book_export_api')
+        self.client.force_authenticate(user=self.merchant)
+
+    def _content(self, response) -> str:
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_lists_every_installment_with_its_plan(self) -> None:
+        """The CSV has a header and one row per installment of the merchant, plan by plan."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('installment-book.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual(list(rows[0]), list(EXPORT_COLUMNS))
+        self.assertEqual(
+            [(int(row['installment_plan_id']), int(row['sequence_number'])) for row in rows],
+            [(installment_plan.pk, sequence) for installment_plan in self.installment_plans for sequence in (1, 2, 3)],
+        )
+        self.assertEqual(rows[0]['customer_email'], self.customer.email)
+        self.assertEqual(rows[0]['paid_at'], self.paid_at.isoformat())
+        self.assertEqual(rows[1]['paid_at'], '')
+
+    def test_ndjson_export_writes_one_object_per_line(self) -> None:
+        """NDJSON rows keep exact amounts as strings and unpaid installments as null."""
+        response = self.client.get(self.url, {'export_format': 'ndjson'}, HTTP_ACCEPT='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual(len(rows), 6)
+        installment = Installment.objects.get(installment_plan=self.installment_plans[0], sequence_number=2)
+        self.assertEqual(rows[1]['installment_id'], installment.pk)
+        self.assertEqual(rows[1]['amount'], str(installment.amount))
+        self.assertEqual(rows[1]['due_date'], installment.due_date.isoformat())
+        self.assertIsNone(rows[1]['paid_at'])
+
+    def test_rows_are_written_per_chunk(self) -> None:
+        """Each yielded chunk holds at most `chunk_size` rows."""
+        chunks = list(export_installment_book(self.merchant, 'ndjson', chunk_size=4))
+
+        self.assertEqual([chunk.count('\n') for chunk in chunks], [4, 2])
+
+    def test_invalid_format_and_non_merchants_are_rejected(self) -> None:
+        """Unknown formats are a validation error; customers cannot export."""
+        self.assertEqual(
+            self.client.get(self.url, {'export_format': 'xlsx'}, HTTP_ACCEPT='text/csv').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
@@ -1,3 +1,5 @@
+from datetime import datetime, timezone as dt_timezone
+
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from customer.tests.factories import CustomerUserFactory
@@ -129,3 +131,45 @@ class PlanListingAPITest(APITestCase):
         # Check installments are in order
         due_dates = [i['due_date'] for i in first_plan['installments']]
         self.assertEqual(due_dates, sorted(due_dates))
+
+    def test_cursor_pagination(self):
+        """Cursor pages list every plan once, newest first, without a COUNT query."""
+        self.client.force_authenticate(user=self.customer)
+        expected = [item['id'] for item in self.client.get(f"{self.url}?page_size=10").data['data']]
+
+        walked = []
+        url = f"{self.url}?pagination=cursor&page_size=2"
+        while url:
+            with self.assertNumQueries(2):  # Installment plans page, prefetched installments
+                response = self.client.get(url)
+            self.assertNotIn('total_items', response.data['pagination'])
+            walked.extend(item['id'] for item in response.data['data'])
+            url = response.data['pagination']['next']
+
+        self.assertEqual(walked, expected)
+
+    def test_cursor_pagination_keeps_microseconds(self):
+        """Plans created within the same millisecond, as by a bulk load, are all listed."""
+        InstallmentPlan.objects.update(created_at=datetime(2026, 3, 1, 10, 30, 0, 123456, tzinfo=dt_timezone.utc))
+        self.client.force_authenticate(user=self.customer)
+
+        walked = []
+        url = f"{self.url}?pagination=cursor&page_size=2"
+        while url:
+            response = self.client.get(url)
+            walked.extend(item['id'] for item in response.data['data'])
+            url = response.data['pagination']['next']
+
+        self.assertEqual(sorted(walked), sorted(InstallmentPlan.objects.values_list('id', flat=True)))
+        self.assertEqual(len(walked), 5)
+
+    def test_progress_adds_no_queries_per_plan(self):
+        """Progress is read from the installment plan, so a page costs the same queries at any size."""
+        self.client.force_authenticate(user=self.customer)
+
+        # Count, installment plans with their template, prefetched installments
+        with self.assertNumQueries(3):
+            response = self.client.get(f"{self.url}?page_size=5")
+
+        self.assertEqual(len(response.data['data']), 5)
+        self.assertEqual(response.data['data'][0]['progress']['outstanding_amount'], '1000.00')
@@ -1,7 +1,18 @@
 from django.urls import path
-from plan.views import InstallmentPlanListCreateAPIView, InstallmentPlanDetailAPIView
+from plan.views import (
+    EnrollmentJobCreateAPIView,
+    EnrollmentJobDetailAPIView,
+    EnrollmentJobResumeAPIView,
+    InstallmentBookExportAPIView,
+    InstallmentPlanDetailAPIView,
+    InstallmentPlanListCreateAPIView,
+)
 
 urlpatterns = [
     path('', InstallmentPlanListCreateAPIView.as_view(), name='installment_plan_list_create_api'),
     path('<int:pk>/', InstallmentPlanDetailAPIView.as_view(), name='installment_plan_detail_api'),
+    path('export/', InstallmentBookExportAPIView.as_view(), name='installment_book_export_api'),
+    path('enrollments/', EnrollmentJobCreateAPIView.as_view(), name='enrollment_job_create_api'),
+    path('enrollments/<int:pk>/', EnrollmentJobDetailAPIView.as_view(), name='enrollment_job_detail_api'),
+    path('enrollments/<int:pk>/resume/', EnrollmentJobResumeAPIView.as_view(), name='enrollment_job_resume_api'),
 ]
@@ -1,33 +1,46 @@
 from typing import Any
 
 from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.utils.translation import gettext_lazy as _
 from rest_framework import generics, permissions, status
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.request import Request
 from rest_framework.response import Response
-from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.utils import no_body, swagger_auto_schema
 from drf_yasg import openapi
 
 from django.contrib.auth import get_user_model
 
 from core.exceptions import BusinessException
-from core.pagination import DrfPagination
-from core.permissions import IsMerchantForPostOnly, IsVerifiedMerchantForPostOnly, IsCustomerOrMerchant
+from core.pagination import CursorPaginationMixin, DrfPagination
+from core.permissions import IsMerchant, IsMerchantForPostOnly, IsVerifiedMerchantForPostOnly, IsCustomerOrMerchant
+from core.utils.idempotency import idempotency_key_parameter, idempotent
 from core.utils.response_schemas import api_error_schema, build_success_response_schema, build_error_schema
 from core.utils.standard_api_response_mixin import StandardApiResponseMixin
 from core.views import CheckObjectPermissionAPIView
 from installment.models import InstallmentPlan, Installment
+from plan.models import EnrollmentJob
 from plan.permissions import HasInstallmentPlanPermission
-from plan.serializers import InstallmentPlanDetailSerializer, InstallmentPlanCreateSerializer
+from plan.serializers import (
+    EnrollmentJobCreateSerializer,
+    EnrollmentJobSerializer,
+    InstallmentBookExportQuerySerializer,
+    InstallmentPlanCreateSerializer,
+    InstallmentPlanDetailSerializer,
+)
+from plan.constants import EXPORT_FORMATS
+from plan.services.enrollment import EnrollmentJobService
+from plan.services.export import CONTENT_TYPES, export_installment_book
 from plan.services.plan_queryset import InstallmentPlanQueryService
 
 User = get_user_model()
 
 
-class InstallmentPlanListCreateAPIView(StandardApiResponseMixin, generics.ListCreateAPIView):
+class InstallmentPlanListCreateAPIView(StandardApiResponseMixin, CursorPaginationMixin, generics.ListCreateAPIView):
     """API endpoint to list and create Installment Plans.
 
-    - GET: Accessible by both merchants and customers.
+    - GET: Accessible by both merchants and customers; ?pagination=cursor opts into cursor pagination.
     - POST: Allowed only for merchants.
     """
 
@@ -51,6 +64,7 @@ class InstallmentPlanListCreateAPIView(StandardApiResponseMixin, generics.ListCr
         tags=["Plans"],
         operation_description=str(_("Create a new installment plan (Merchant only)")),
         request_body=InstallmentPlanCreateSerializer,
+        manual_parameters=[idempotency_key_parameter],
         responses={
             status.HTTP_201_CREATED: openapi.Response(
                 description=str(_("Installment plan created successfully")),
@@ -71,6 +85,7 @@ class InstallmentPlanListCreateAPIView(StandardApiResponseMixin, generics.ListCr
             ),
         },
     )
+    @idempotent
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -107,6 +122,21 @@ class InstallmentPlanListCreateAPIView(StandardApiResponseMixin, generics.ListCr
                 required=False,
                 default=5,
             ),
+            openapi.Parameter(
+                name='pagination',
+                in_=openapi.IN_QUERY,
+                description=str(_("Set to 'cursor' for cursor pagination: no totals, constant cost on deep pages")),
+                type=openapi.TYPE_STRING,
+                enum=['cursor'],
+                required=False,
+            ),
+            openapi.Parameter(
+                name='cursor',
+                in_=openapi.IN_QUERY,
+                description=str(_('Opaque cursor from the next/previous link of a cursor-paginated response')),
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
         responses={
             status.HTTP_200_OK: openapi.Response(
@@ -216,3 +246,221 @@ class InstallmentPlanDetailAPIView(
             message=str(_("Successfully retrieved installment plan details.")),
             data=serializer.data,
         )
+
+
+class EnrollmentJobCreateAPIView(StandardApiResponseMixin, generics.GenericAPIView):
+    """API endpoint to enroll a large list of customers into a new plan asynchronously.
+
+    The job is stored and queued; the response is returned before any
+    installment plan is created.
+    """
+
+    serializer_class = EnrollmentJobCreateSerializer
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsMerchant,
+        IsVerifiedMerchantForPostOnly
+    ]
+
+    @swagger_auto_schema(
+        tags=["Plans"],
+        operation_description=str(_("Enroll many customers into a new installment plan asynchronously (Merchant only)")),
+        request_body=EnrollmentJobCreateSerializer,
+        responses={
+            status.HTTP_202_ACCEPTED: openapi.Response(
+                description=str(_("Enrollment job accepted")),
+                schema=build_success_response_schema(serializer_class=EnrollmentJobSerializer),
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Response(
+                description=str(_("Validation error")),
+                schema=api_error_schema,
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("Permission denied")),
+                schema=build_error_schema(
+                    messages=[
+                        str(_("User account is not a Merchant.")),
+                        str(_("Merchant is not verified.")),
+                    ]
+                ),
+            ),
+        },
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+
+        return self.success_response(
+            message=str(_("Enrollment job accepted")),
+            data=EnrollmentJobSerializer(job).data,
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+
+class EnrollmentJobDetailAPIView(
+    StandardApiResponseMixin, CheckObjectPermissionAPIView, generics.GenericAPIView
+):
+    """API endpoint to report the progress of an enrollment job."""
+
+    serializer_class = EnrollmentJobSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchant]
+    custom_not_found_message = str(_("Enrollment job not found"))  # used in CheckObjectPermissionAPIView
+
+    def get_queryset(self):
+        # Merchants only see their own jobs; others get 404 instead of 403
+        return EnrollmentJob.objects.filter(merchant=self.request.user)
+
+    @swagger_auto_schema(
+        tags=["Plans"],
+        operation_description=str(_("Retrieve the status and progress of an enrollment job.")),
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description=str(_("Successfully retrieved enrollment job status.")),
+                schema=build_success_response_schema(serializer_class=EnrollmentJobSerializer),
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("Permission denied")),
+                schema=build_error_schema(messages=[str(_("User account is not a Merchant."))]),
+            ),
+            status.HTTP_404_NOT_FOUND: openapi.Response(
+                description=str(_("Not found")),
+                schema=build_error_schema(messages=[str(_("Enrollment job not found"))]),
+            ),
+        },
+    )
+    def get(self, request: Request, pk: int, *args: Any, **kwargs: Any) -> Response:
+        job = self.get_object_with_permissions(pk=pk)
+        return self.success_response(
+            message=str(_("Successfully retrieved enrollment job status.")),
+            data=self.get_serializer(job).data,
+        )
+
+
+class EnrollmentJobResumeAPIView(
+    StandardApiResponseMixin, CheckObjectPermissionAPIView, generics.GenericAPIView
+):
+    """API endpoint to re-dispatch the unfinished chunks of an enrollment job."""
+
+    serializer_class = EnrollmentJobSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchant]
+    custom_not_found_message = str(_("Enrollment job not found"))  # used in CheckObjectPermissionAPIView
+
+    def get_queryset(self):
+        return EnrollmentJob.objects.filter(merchant=self.request.user)
+
+    @swagger_auto_schema(
+        tags=["Plans"],
+        operation_description=str(_(
+            "Re-dispatch the pending and failed chunks of an unfinished enrollment job, "
+            "e.g. after a failure or a lost dispatch."
+        )),
+        request_body=no_body,
+        responses={
+            status.HTTP_202_ACCEPTED: openapi.Response(
+                description=str(_("Enrollment job resumed")),
+                schema=build_success_response_schema(serializer_class=EnrollmentJobSerializer),
+            ),
+            status.HTTP_404_NOT_FOUND: openapi.Response(
+                description=str(_("Not found")),
+                schema=build_error_schema(messages=[str(_("Enrollment job not found"))]),
+            ),
+            status.HTTP_409_CONFLICT: openapi.Response(
+                description=str(_("Conflict")),
+                schema=build_error_schema(messages=[str(_("Completed enrollment jobs cannot be resumed."))]),
+            ),
+        },
+    )
+    def post(self, request: Request, pk: int, *args: Any, **kwargs: Any) -> Response:
+        job = self.get_object_with_permissions(pk=pk)
+        if job.status == EnrollmentJob.Status.COMPLETED:
+            raise BusinessException(
+                message=str(_("Completed enrollment jobs cannot be resumed.")),
+                status_code=status.HTTP_409_CONFLICT
+            )
+
+        job = EnrollmentJobService.resume(job)
+        return self.success_response(
+            message=str(_("Enrollment job resumed")),
+            data=self.get_serializer(job).data,
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Render errors with the first renderer whatever the Accept header asks for.
+
+    Export clients send `Accept: text/csv`, for which no renderer exists; the
+    export itself is written by the view, so only error responses are rendered.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class InstallmentBookExportAPIView(generics.GenericAPIView):
+    """API endpoint to download every installment plan and installment of the authenticated merchant."""
+
+    permission_classes = [permissions.IsAuthenticated, IsMerchant]
+    content_negotiation_class = IgnoreClientContentNegotiation
+    pagination_class = None
+
+    @swagger_auto_schema(
+        tags=["Plans"],
+        operation_description=str(_(
+            "Stream the merchant's installment book as CSV or NDJSON: one row per installment, "
+            "with the fields of its installment plan."
+        )),
+        manual_parameters=[
+            openapi.Parameter(
+                name="export_format",
+                in_=openapi.IN_QUERY,
+                description=str(_("File format of the export")),
+                type=openapi.TYPE_STRING,
+                enum=list(EXPORT_FORMATS),
+                required=False,
+            ),
+        ],
+        produces=list(CONTENT_TYPES.values()),
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                description=str(_("Installment book streamed as a file attachment.")),
+                schema=openapi.Schema(type=openapi.TYPE_FILE),
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Response(
+                description=str(_("Validation error")),
+                schema=api_error_schema,
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Response(
+                description=str(_("Permission denied")),
+                schema=build_error_schema(messages=[str(_("User account is not a Merchant."))]),
+            ),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        """Handle GET request to stream the merchant's installment book.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            StreamingHttpResponse: The export, written while the installments are read.
+
+        Raises:
+            ValidationError: If the export format is not supported.
+        """
+        query_serializer = InstallmentBookExportQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        export_format = query_serializer.validated_data['export_format']
+
+        response = StreamingHttpResponse(
+            export_installment_book(request.user, export_format),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="installment-book.{export_format}"'
+        return response